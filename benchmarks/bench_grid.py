@@ -0,0 +1,223 @@
+"""
+Benchmarks for grid construction, formatting and rendering.
+
+Each benchmark is parametrized by stack depth (rows of an ``XGrid``,
+columns of a ``YGrid``), main axis column count and twin count, and is
+tracked for wall time (``time_*``) and peak memory (``peakmem_*``).
+
+Run with ``asv run`` from the repository root, or ``asv dev`` for a quick
+check against the working tree.
+
+"""
+import io
+
+import numpy as np
+
+import trendvis
+from trendvis.testing import DuckFrame
+
+
+DEPTHS = [4, 16, 48]
+COLUMNS = [1, 4]
+TWINS = [0, 2]
+
+
+def _build(depth, columns, twins, gridclass=trendvis.XGrid):
+    grid = gridclass([1] * depth, [1] * columns, figsize=(8, 12),
+                     use_pyplot=False)
+    if twins:
+        grid.make_twins(list(range(twins)))
+
+    return grid
+
+
+def _plotdata(grid, points=2000):
+    x = np.linspace(0, 100, points)
+    rng = np.random.RandomState(0)
+
+    return [[(x, rng.rand(points), 'C%d' % (i % 10))]
+            for i in range(grid.total_stackdim)]
+
+
+class _GridBenchmark(object):
+    params = (DEPTHS, COLUMNS, TWINS)
+    param_names = ['depth', 'columns', 'twins']
+
+    # Most benchmarks change the grid, so give each sample a fresh one
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, depth, columns, twins):
+        self.grid = _build(depth, columns, twins)
+
+    def teardown(self, depth, columns, twins):
+        self.grid.close()
+
+
+class GridInit(object):
+    params = (['XGrid', 'YGrid'], DEPTHS, COLUMNS)
+    param_names = ['gridclass', 'depth', 'columns']
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def teardown(self, gridclass, depth, columns):
+        self.grid.close()
+
+    def time_init(self, gridclass, depth, columns):
+        self.grid = getattr(trendvis, gridclass)([1] * depth, [1] * columns,
+                                                 use_pyplot=False)
+
+    def peakmem_init(self, gridclass, depth, columns):
+        self.grid = getattr(trendvis, gridclass)([1] * depth, [1] * columns,
+                                                 use_pyplot=False)
+
+
+class MakeTwins(_GridBenchmark):
+    params = (DEPTHS, COLUMNS, [1, 4])
+
+    def setup(self, depth, columns, twins):
+        self.grid = _build(depth, columns, 0)
+
+    def time_make_twins(self, depth, columns, twins):
+        self.grid.make_twins(list(range(twins)))
+
+
+class AxisLookup(_GridBenchmark):
+
+    def time_get_twins(self, depth, columns, twins):
+        for row in range(twins):
+            for col in range(columns):
+                self.grid.get_axis(row, col, is_twin=True)
+
+    def time_select(self, depth, columns, twins):
+        self.grid.select(rows=range(0, depth, 2), twins=True)
+
+
+class Formatting(_GridBenchmark):
+
+    def time_cleanup_grid(self, depth, columns, twins):
+        self.grid.cleanup_grid()
+
+    def peakmem_cleanup_grid(self, depth, columns, twins):
+        self.grid.cleanup_grid()
+
+    def time_set_all_ticknums(self, depth, columns, twins):
+        self.grid.set_all_ticknums([(20, 5)] * columns,
+                                   [(0.2, 0.1)] * (depth + twins))
+
+    def time_draw_cutout(self, depth, columns, twins):
+        self.grid.draw_cutout()
+
+    def time_draw_frame(self, depth, columns, twins):
+        self.grid.draw_frame()
+
+    def time_draw_bar(self, depth, columns, twins):
+        ll_axis = self.grid.axes[depth - 1][0]
+        ur_axis = self.grid.axes[0][0]
+        for start in np.linspace(0, 0.9, 20):
+            self.grid.draw_bar(ll_axis, ur_axis, (start, start + 0.02))
+
+    def time_set_xlim(self, depth, columns, twins):
+        self.grid.set_xlim([(c, 0, 50) for c in range(columns)])
+
+
+class PlotData(_GridBenchmark):
+
+    def setup(self, depth, columns, twins):
+        _GridBenchmark.setup(self, depth, columns, twins)
+        self.plotdata = _plotdata(self.grid)
+
+    def time_plot_data(self, depth, columns, twins):
+        trendvis.plot_data(self.grid, self.plotdata, marker=None)
+
+    def peakmem_plot_data(self, depth, columns, twins):
+        trendvis.plot_data(self.grid, self.plotdata, marker=None)
+
+
+class PlotFrame(_GridBenchmark):
+
+    def setup(self, depth, columns, twins):
+        _GridBenchmark.setup(self, depth, columns, twins)
+        plotdata = _plotdata(self.grid)
+        self.frame = DuckFrame(plotdata[0][0][0],
+                            dict((i, subgrid[0][1])
+                                 for i, subgrid in enumerate(plotdata)))
+        self.rows = dict((i, i) for i in range(self.grid.total_stackdim))
+
+    def time_plot_frame(self, depth, columns, twins):
+        trendvis.plot_frame(self.grid, self.frame, rows=self.rows,
+                            marker=None)
+
+    def peakmem_plot_frame(self, depth, columns, twins):
+        trendvis.plot_frame(self.grid, self.frame, rows=self.rows,
+                            marker=None)
+
+
+class Savefig(_GridBenchmark):
+    params = (DEPTHS, COLUMNS, TWINS, ['png', 'pdf', 'svg'])
+    param_names = ['depth', 'columns', 'twins', 'format']
+
+    def setup(self, depth, columns, twins, fmt):
+        self.grid = _build(depth, columns, twins)
+        trendvis.plot_data(self.grid, _plotdata(self.grid), marker=None)
+        self.grid.cleanup_grid()
+        self.grid.draw_frame()
+
+    def teardown(self, depth, columns, twins, fmt):
+        self.grid.close()
+
+    def time_savefig(self, depth, columns, twins, fmt):
+        self.grid.fig.savefig(io.BytesIO(), format=fmt)
+
+    def peakmem_savefig(self, depth, columns, twins, fmt):
+        self.grid.fig.savefig(io.BytesIO(), format=fmt)
+
+
+class Streaming(object):
+    params = ([1, 3], [0, 3])
+    param_names = ['columns', 'twins']
+
+    def setup(self, columns, twins):
+        self.grid = _build(12, columns, twins)
+        self.grid.cleanup_grid()
+        self.stream = trendvis.GridStream(self.grid, 100, capacity=2000)
+        self.values = np.random.RandomState(0).rand(
+            self.grid.total_stackdim)
+        self.stream.append(0, self.values)
+        self.stream.update()
+        self.count = 0
+
+    def teardown(self, columns, twins):
+        self.grid.close()
+
+    def time_update(self, columns, twins):
+        # Stays within the window, so this is the blitted path
+        self.count += 1
+        self.stream.append(self.count * 1e-6, self.values)
+        self.stream.update()
+
+
+class ExportPDF(object):
+    params = [10, 50]
+    param_names = ['pages']
+    number = 1
+    repeat = 3
+    warmup_time = 0
+
+    def setup(self, pages):
+        self.spec = {'main_axis': 'x', 'stack_ratios': [1] * 8,
+                     'figsize': (8, 11), 'stack_ticks': [(0.5, 0.1)] * 8}
+        with _build(8, 1, 0) as grid:
+            self.plotdata = _plotdata(grid)
+
+    def _pages(self, pages):
+        return ((self.spec, self.plotdata, {'marker': None})
+                for _ in range(pages))
+
+    def time_export_pdf(self, pages):
+        trendvis.export_pdf(io.BytesIO(), self._pages(pages))
+
+    def peakmem_export_pdf(self, pages):
+        trendvis.export_pdf(io.BytesIO(), self._pages(pages))
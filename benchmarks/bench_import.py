@@ -0,0 +1,22 @@
+"""
+Import time benchmarks.  Each runs in a fresh interpreter.
+
+``import trendvis`` should stay far cheaper than importing matplotlib;
+grid classes and pyplot are loaded on first use.  The budget itself is
+enforced by ``test_import_budget`` in the test suite, which fails if
+``import trendvis`` loads matplotlib or numpy or takes over 50 ms.
+
+"""
+
+
+def timeraw_import_trendvis():
+    return "import trendvis"
+
+
+def timeraw_import_xgrid():
+    return "from trendvis import XGrid"
+
+
+def timeraw_import_matplotlib_pyplot():
+    # Reference point for the two above
+    return "import matplotlib.pyplot"
@@ -0,0 +1,58 @@
+"""
+Benchmarks comparing the per-dataset ``Line2D`` path of
+``trendvis.plot_data`` with the ``batch=True`` ``LineCollection`` path.
+
+Run with ``asv run`` from the repository root, or ``asv dev`` for a quick
+check against the working tree.
+
+"""
+import io
+
+import numpy as np
+
+import trendvis
+
+
+def _plotdata(traces, rows, points=500):
+    x = np.linspace(0, 100, points)
+    rng = np.random.RandomState(0)
+    colors = ['C%d' % (i % 10) for i in range(traces)]
+
+    return [[(x, rng.rand(points) + i, c) for i, c in enumerate(colors)]
+            for _ in range(rows)]
+
+
+class PlotData(object):
+    params = ([10, 100, 400], ['lines', 'batch'])
+    param_names = ['traces', 'mode']
+
+    def setup(self, traces, mode):
+        self.plotdata = _plotdata(traces, rows=4)
+        self.grid = trendvis.XGrid([1] * 4, xratios=[1, 1], use_pyplot=False)
+
+    def teardown(self, traces, mode):
+        self.grid.close()
+
+    def time_plot_data(self, traces, mode):
+        trendvis.plot_data(self.grid, self.plotdata, auto_spinecolor=False,
+                           marker=None, batch=mode == 'batch')
+
+
+class DrawPlotData(object):
+    params = ([10, 100, 400], ['lines', 'batch'])
+    param_names = ['traces', 'mode']
+
+    def setup(self, traces, mode):
+        self.grid = trendvis.XGrid([1] * 4, xratios=[1, 1], use_pyplot=False)
+        trendvis.plot_data(self.grid, _plotdata(traces, rows=4),
+                           auto_spinecolor=False, marker=None,
+                           batch=mode == 'batch')
+
+    def teardown(self, traces, mode):
+        self.grid.close()
+
+    def time_draw(self, traces, mode):
+        self.grid.fig.canvas.draw()
+
+    def time_savefig_svg(self, traces, mode):
+        self.grid.fig.savefig(io.BytesIO(), format='svg')
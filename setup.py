@@ -25,7 +25,7 @@ MAINTAINER_EMAIL    = 'mellissa.cross@gmail.com'
 LICENSE             = 'Modified BSD'
 DOWNLOAD_URL        = ''
 VERSION             = '0.2.2'
-PYTHON_VERSION      = (2, 6)
+PYTHON_VERSION      = (3, 8)
 DEPENDENCIES        = {'matplotlib': (1, 2)}
 
 
@@ -93,6 +93,7 @@ if __name__ == '__main__':
         license=LICENSE,
         download_url=DOWNLOAD_URL,
         version=VERSION,
+        python_requires='>=%d.%d' % PYTHON_VERSION,
 
         classifiers=[
             'Development Status :: 4 - Beta',
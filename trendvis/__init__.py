@@ -15,10 +15,58 @@ or highlight various columns, bars, or rectangles of interest.
 __all__ = ['XGrid',
            'YGrid',
            'make_grid',
-           'plot_data']
+           'plot_data',
+           'plot_frame',
+           'GridCache',
+           'Renderer',
+           'render_many',
+           'GridStream',
+           'build_grid',
+           'export_spec',
+           'spec_hash',
+           'validate_spec',
+           'RenderCache',
+           'export_pdf']
 
-from .xgrid_ystack import XGrid
+import importlib
 
-from .ygrid_xstack import YGrid
+try:
+    # Written by setup.py
+    from .version import version as __version__
+except ImportError:
+    __version__ = 'unknown'
 
-from .gridwrapper import make_grid, plot_data
+# Public names and the submodules defining them.  Submodules, and with them
+# matplotlib, are only imported on first access, so ``import trendvis``
+# stays cheap.  pyplot is only imported when a grid is built with it.
+_submodules = {'XGrid': 'xgrid_ystack',
+               'YGrid': 'ygrid_xstack',
+               'make_grid': 'gridwrapper',
+               'plot_data': 'gridwrapper',
+               'plot_frame': 'gridwrapper',
+               'GridCache': 'skeleton',
+               'Renderer': 'render',
+               'render_many': 'render',
+               'GridStream': 'streaming',
+               'build_grid': 'spec',
+               'export_spec': 'spec',
+               'spec_hash': 'spec',
+               'validate_spec': 'spec',
+               'RenderCache': 'rendercache',
+               'export_pdf': 'render'}
+
+
+def __getattr__(name):
+    if name not in _submodules:
+        raise AttributeError("module 'trendvis' has no attribute " +
+                             repr(name))
+
+    module = importlib.import_module('.' + _submodules[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
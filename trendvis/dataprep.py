@@ -0,0 +1,218 @@
+from __future__ import division, print_function, absolute_import
+import os
+import numpy as np
+
+
+def minmax_indices(main, other, nbins, limits=None):
+    """
+    Indices of the points to keep when drawing ``other`` against ``main``
+    at a resolution of ``nbins`` bins (pixels) along ``main``.
+
+    For every bin the first, last, minimum and maximum points are kept, so
+    the rasterized line, including single-point peaks, looks the same as the
+    full-resolution line.
+
+    Parameters
+    ----------
+    main : 1D array
+        Main axis data.  Must be monotonic; if not, nothing is dropped.
+    other : 1D array
+        Stacked axis data, same length as ``main``.
+    nbins : int
+        The number of bins, usually the pixel length of the main axis.
+    limits : tuple of floats
+        Default ``None``, the range of ``main``.  The main axis range the
+        bins cover, usually the axis limits.  Points outside it fall into
+        the first or last bin.
+
+    Returns
+    -------
+    indices : 1D array of ints
+        Sorted indices into ``main`` and ``other``.
+
+    """
+
+    main = np.asarray(main)
+    other = np.asarray(other)
+    npts = main.size
+    nbins = int(nbins)
+
+    if nbins < 1 or npts <= 4 * nbins:
+        return np.arange(npts)
+
+    if limits is None:
+        limits = (main[0], main[-1])
+    lo, hi = min(limits), max(limits)
+
+    steps = np.diff(main)
+    if np.all(steps >= 0):
+        pass
+    elif np.all(steps <= 0):
+        main = -main
+        lo, hi = -hi, -lo
+    else:
+        return np.arange(npts)
+
+    edges = np.linspace(lo, hi, nbins + 1)
+    bin_ids = np.searchsorted(edges[1:-1], main, side='right')
+
+    starts = np.flatnonzero(np.r_[True, bin_ids[1:] != bin_ids[:-1]])
+    counts = np.diff(np.r_[starts, npts])
+    segments = np.repeat(np.arange(starts.size), counts)
+
+    def first_match(values):
+        # First point of each bin equal to that bin's value
+        hits = np.flatnonzero(other == np.repeat(values, counts))
+        if hits.size == 0:
+            # All-NaN data
+            return hits
+        hit_segments = segments[hits]
+        return hits[np.r_[True, hit_segments[1:] != hit_segments[:-1]]]
+
+    with np.errstate(invalid='ignore'):
+        mins = np.fmin.reduceat(other, starts)
+        maxs = np.fmax.reduceat(other, starts)
+
+    return np.unique(np.concatenate((starts, starts + counts - 1,
+                                     first_match(mins), first_match(maxs))))
+
+
+def decimate_xy(x, y, nbins, main_is_x=True, limits=None):
+    """
+    Reduce ``x``, ``y`` to at most 4 points per bin along the main axis
+    with ``minmax_indices()``.
+
+    Parameters
+    ----------
+    x, y : 1D arrays
+        The data to reduce.
+    nbins : int
+        The number of bins, usually the pixel length of the main axis.
+    main_is_x : Boolean
+        Default ``True``.  Whether ``x`` (``XGrid``) or ``y`` (``YGrid``)
+        is the main axis data.
+    limits : tuple of floats
+        Default ``None``, the range of the main axis data.  The main axis
+        range the bins cover.
+
+    Returns
+    -------
+    x, y : 1D arrays
+        The reduced data.  Returned unchanged if nothing was dropped.
+
+    """
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    if main_is_x:
+        keep = minmax_indices(x, y, nbins, limits)
+    else:
+        keep = minmax_indices(y, x, nbins, limits)
+
+    if keep.size == x.size:
+        return x, y
+
+    return x[keep], y[keep]
+
+
+def load_array(source):
+    """
+    Open ``source`` for plotting without reading it into memory.
+
+    Parameters
+    ----------
+    source : string, path-like or array-like
+        A path to a ``.npy`` file, which is opened as a read-only
+        ``np.memmap``, or an array, which is returned as is.
+
+    Returns
+    -------
+    array : array-like
+        ``source`` itself, or the memory-mapped contents of the file.
+
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        return np.load(source, mmap_mode='r')
+
+    return source
+
+
+def is_monotonic(main, chunksize=2**20):
+    """
+    Check if ``main`` is sorted in ascending or descending order.
+
+    ``main`` is read ``chunksize`` points at a time, so memory-mapped data
+    is never loaded whole.
+
+    Parameters
+    ----------
+    main : 1D array
+        Main axis data.
+    chunksize : int
+        Default 2**20.  The number of points read at a time.
+
+    Returns
+    -------
+    monotonic : Boolean
+
+    """
+
+    npts = len(main)
+
+    if npts < 2:
+        return True
+
+    ascending = main[0] <= main[-1]
+
+    for start in range(0, npts - 1, chunksize):
+        # Chunks overlap by one point so no step is skipped
+        steps = np.diff(np.asarray(main[start:start + chunksize + 1]))
+        if ascending:
+            sorted_chunk = np.all(steps >= 0)
+        else:
+            sorted_chunk = np.all(steps <= 0)
+        if not sorted_chunk:
+            return False
+
+    return True
+
+
+def window_slice(main, lo, hi):
+    """
+    The slice of ``main`` covering the interval [``lo``, ``hi``], plus one
+    point on either side so lines run to the edges of the axes.
+
+    Only O(log n) points of ``main`` are read, so this is cheap on
+    memory-mapped data.
+
+    Parameters
+    ----------
+    main : 1D array
+        Main axis data, sorted in ascending or descending order.
+    lo, hi : int or float
+        The window limits, in either order.
+
+    Returns
+    -------
+    window : slice
+
+    """
+
+    npts = len(main)
+    lo, hi = min(lo, hi), max(lo, hi)
+
+    if npts == 0:
+        return slice(0, 0)
+
+    if main[0] <= main[-1]:
+        start = np.searchsorted(main, lo, side='left')
+        stop = np.searchsorted(main, hi, side='right')
+    else:
+        # Descending; search the reversed view
+        reverse = main[::-1]
+        start = npts - np.searchsorted(reverse, hi, side='right')
+        stop = npts - np.searchsorted(reverse, lo, side='left')
+
+    return slice(max(start - 1, 0), min(stop + 1, npts))
@@ -1,7 +1,25 @@
 from __future__ import division, print_function, absolute_import
-from matplotlib.ticker import MultipleLocator
-import matplotlib.pyplot as plt
+import functools
+import os
+import time
+from contextlib import contextmanager
+import numpy as np
+import matplotlib
+from matplotlib.ticker import FixedLocator, NullFormatter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.gridspec import GridSpec
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.patches import Rectangle
+from matplotlib.transforms import blended_transform_factory
 import matplotlib.lines as lines
+from .layout import GridLayout
+from .transforms import DataCornerTransform
+from .ticks import CappedMultipleLocator, plan_ticks
+
+
+# Formats where the figure dpi only affects rasterized artists
+VECTOR_FORMATS = ('pdf', 'svg', 'svgz', 'ps', 'eps')
 
 
 class Grid(object):
@@ -10,7 +28,8 @@ class Grid(object):
 
     """
 
-    def __init__(self, xratios, yratios, mainax_x, figsize, **kwargs):
+    def __init__(self, xratios, yratios, mainax_x, figsize, use_pyplot=True,
+                 **kwargs):
         """
         Initialize grid attributes.  Should only be called through
         ``XGrid`` or ``YGrid`` subclasses.
@@ -29,27 +48,83 @@ class Grid(object):
         figsize : tuple of ints or floats
             The figure dimensions in inches. If None, defaults to matplotlib
             rc figure.figsize.
+        use_pyplot : Boolean
+            Default ``True``.  If ``True``, the figure is created with
+            ``plt.figure()`` and is managed by pyplot.  If ``False``, a bare
+            ``matplotlib.figure.Figure`` is attached to an Agg canvas and is
+            never registered with pyplot, which is safe outside the main
+            thread.  Release it with ``self.close()``.
         **kwargs
             Any plt.figure arguments
 
         """
-        figsize = figsize or plt.rcParams['figure.figsize']
-        self.fig = plt.figure(figsize=figsize)
+        figsize = figsize or matplotlib.rcParams['figure.figsize']
+        self.use_pyplot = use_pyplot
+
+        if use_pyplot:
+            # Imported here so headless use never loads pyplot or a backend
+            import matplotlib.pyplot as plt
+            self.fig = plt.figure(figsize=figsize, **kwargs)
+        else:
+            self.fig = Figure(figsize=figsize, **kwargs)
+            FigureCanvasAgg(self.fig)
 
-        self.gridrows, self.yratios = self._ratios_arelists(yratios)
-        self.gridcols, self.xratios = self._ratios_arelists(xratios)
+        self.layout = GridLayout(xratios, yratios)
+
+        self.gridrows = self.layout.gridrows
+        self.gridcols = self.layout.gridcols
+        self.yratios = self.layout.yratios.tolist()
+        self.xratios = self.layout.xratios.tolist()
 
         self.numrows = len(self.yratios)
         self.numcols = len(self.xratios)
 
         self.axes = []
 
+        # Axes keyed by (stacked position, main position, twin instance),
+        # with twin instance ``None`` for original axes
+        self.axis_index = {}
+
+        # Storage indices in ``self.axes`` of the twins of each stacked
+        # position, in order of creation
+        self.twin_storage = {}
+
         self.bf_urcorners = []
         self.bf_llcorners = []
         self.bf_patchinds = []
         self.bf_uraxis = []
         self.bf_llaxis = []
 
+        self.bar_collections = []
+        self.cutout_lines = []
+
+        # Arguments of drawing calls, for ``trendvis.export_spec()``
+        self.bar_specs = []
+        self.bar_collection_specs = []
+        self.frame_specs = []
+        self.cutout_specs = []
+
+        # Plotted data following main axis limits, see ``plot_data()``
+        self.data_clips = []
+
+        # Thresholds set by ``self.set_rasterization_policy()``
+        self.raster_policy = None
+        self.rasterized_artists = []
+
+        # (major, minor) multiples keyed by (axes, 'x'|'y')
+        self.tick_multiples = {}
+
+        # Most ticks per pixel placed by ``self.set_all_ticknums()``
+        self.max_tick_density = 0.2
+
+        # Limit callbacks keeping frozen ticks up to date, keyed like
+        # ``self.tick_multiples``; see ``self.freeze_ticks()``
+        self._freeze_cids = {}
+        self._freeze_density = None
+
+        # First plotted color keyed by axes, for ``self.autocolor_spines()``
+        self.axcolors = {}
+
         self.relative_shifts = None
         self.stack_shifts = None
 
@@ -60,6 +135,14 @@ class Grid(object):
 
         self.grid_isclean = False
 
+        # Changes held back by ``self.batch()``
+        self._batch_depth = 0
+        self._pending = {}
+
+        # Per-method [calls, seconds], ``None`` unless profiling
+        self._profile = None
+        self._profile_hook = None
+
         self.spinelist = ['top', 'bottom', 'left', 'right']
         self.spinewidth = 1
 
@@ -73,10 +156,10 @@ class Grid(object):
 
             self.startpos = 'top'
 
-            self.mainax_ticks = {'top'   : ('on', 'off'),
-                                 'both'  : ('on', 'on'),
-                                 'bottom': ('off', 'on'),
-                                 'none'  : ('off', 'off')}
+            self.mainax_ticks = {'top'   : (True, False),
+                                 'both'  : (True, True),
+                                 'bottom': (False, True),
+                                 'none'  : (False, False)}
 
             self.alt_sides = {'left' : 'right',
                               'right': 'left'}
@@ -109,10 +192,10 @@ class Grid(object):
 
             self.startpos = 'left'
 
-            self.mainax_ticks = {'left' : ('on', 'off'),
-                                 'both' : ('on', 'on'),
-                                 'right': ('off', 'on'),
-                                 'none' : ('off', 'off')}
+            self.mainax_ticks = {'left' : (True, False),
+                                 'both' : (True, True),
+                                 'right': (False, True),
+                                 'none' : (False, False)}
 
             self.alt_sides = {'top'   : 'bottom',
                               'bottom': 'top'}
@@ -139,6 +222,447 @@ class Grid(object):
 
         self._update_total_stackdim()
 
+        # One GridSpec for all cells, equivalent to ``plt.subplot2grid``
+        # but without going through pyplot's current figure
+        self.gridspec = GridSpec(self.gridrows, self.gridcols,
+                                 figure=self.fig)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Profiling wrappers and hooks don't pickle; clones start unprofiled
+        if state['_profile'] is not None:
+            for name in state['_profile']:
+                state.pop(name, None)
+            state['_profile'] = None
+            state['_profile_hook'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # Unpickled figures get a bare canvas; restore the Agg canvas
+        if self.fig is not None and not self.use_pyplot:
+            FigureCanvasAgg(self.fig)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def enable_profiling(self, hook=None):
+        """
+        Start timing every public method of this grid.
+
+        Each call's wall time is added to the method's total, including time
+        spent in other grid methods it calls.  Methods are wrapped on this
+        instance only; other grids, and this one once
+        ``self.disable_profiling()`` is called, run unwrapped.
+
+        Parameters
+        ----------
+        hook : function
+            Default ``None``.  Called as ``hook(name, seconds)`` after every
+            profiled call, e.g. to forward timings to a metrics system.
+
+        """
+
+        if self._profile is not None:
+            self._profile_hook = hook
+            return
+
+        self._profile = {}
+        self._profile_hook = hook
+
+        skip = ('enable_profiling', 'disable_profiling', 'profile_report',
+                'batch')
+
+        for name in dir(type(self)):
+            if name.startswith('_') or name in skip:
+                continue
+
+            method = getattr(self, name)
+            if callable(method):
+                self._profile[name] = [0, 0.0]
+                setattr(self, name, self._profiled(name, method))
+
+    def disable_profiling(self):
+        """
+        Stop timing grid methods and discard the collected timings.
+
+        """
+
+        if self._profile is None:
+            return
+
+        for name in self._profile:
+            self.__dict__.pop(name, None)
+
+        self._profile = None
+        self._profile_hook = None
+
+    def profile_report(self, reset=False):
+        """
+        Timings collected since ``self.enable_profiling()``.
+
+        Parameters
+        ----------
+        reset : Boolean
+            Default ``False``.  If ``True``, zero the counts afterwards.
+
+        Returns
+        -------
+        report : list of tuples
+            (method name, calls, total seconds) for every method called at
+            least once, slowest first.  Empty if profiling is off.
+
+        """
+
+        if self._profile is None:
+            return []
+
+        report = [(name, calls, seconds)
+                  for name, (calls, seconds) in self._profile.items()
+                  if calls > 0]
+        report.sort(key=lambda item: item[2], reverse=True)
+
+        if reset:
+            for record in self._profile.values():
+                record[0] = 0
+                record[1] = 0.0
+
+        return report
+
+    def _profiled(self, name, method):
+        """
+        Wrap bound ``method`` to add its calls and run time to the profile.
+
+        """
+
+        record = self._profile[name]
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                record[0] += 1
+                record[1] += seconds
+                if self._profile_hook is not None:
+                    self._profile_hook(name, seconds)
+
+        return wrapper
+
+    def close(self):
+        """
+        Close the figure and release the axes, patches, and bar and frame
+        bookkeeping held by the grid.  The grid cannot be used afterwards.
+
+        Grids may also be used as context managers, which call
+        ``self.close()`` on exit.
+
+        """
+
+        if self.fig is None:
+            return
+
+        if self.use_pyplot:
+            import matplotlib.pyplot as plt
+            plt.close(self.fig)
+
+        self.fig.clear()
+        self.fig = None
+
+        self.axes = []
+        self.axis_index = {}
+        self.twin_storage = {}
+
+        self.bf_urcorners = []
+        self.bf_llcorners = []
+        self.bf_patchinds = []
+        self.bf_uraxis = []
+        self.bf_llaxis = []
+
+        self.bar_collections = []
+        self.cutout_lines = []
+        self.bar_specs = []
+        self.bar_collection_specs = []
+        self.frame_specs = []
+        self.cutout_specs = []
+        self.data_clips = []
+        self.rasterized_artists = []
+        self.tick_multiples = {}
+        self._freeze_cids = {}
+        self.axcolors = {}
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that defers grid formatting until the block exits.
+
+        Inside the block, limit changes and axis reversals
+        (``set_xlim``, ``set_ylim``, ``reverse_xaxis``, ``reverse_yaxis``),
+        spacing changes, ``set_all_ticknums``, ``set_ticks``,
+        ``set_spinewidth``, spine shifts, ``cleanup_grid`` and bar and frame
+        realignment are collected.  On exit each kind is applied once, with
+        later calls overriding earlier ones, in a fixed order: limits,
+        spacing, tick numbers, tick parameters, spine width, spine shifts,
+        ``cleanup_grid``, ``freeze_ticks``, then bar and frame realignment.
+        Batches may be nested; changes are applied when the outermost block
+        exits.  If any block raises, all pending changes are discarded
+        instead.
+
+        Calls whose result depends on the pending state, i.e.
+        ``reveal_spines``, ``set_ax_visibility``, ``draw_frame``,
+        ``draw_bar`` and ``draw_bars``, raise a ``RuntimeError`` inside the
+        block; make them after it exits.
+
+        Examples
+        --------
+        >>> with grid.batch():
+        ...     grid.set_xlim([(0, 0, 10), (1, 20, 30)])
+        ...     grid.set_ylim((0, -1, 1))
+        ...     grid.move_spines(axis_shift=0.1)
+        ...     grid.cleanup_grid()
+
+        """
+
+        self._batch_depth += 1
+
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            # Never apply a half-built batch
+            self._pending = {}
+            raise
+
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._flush_batch()
+
+    def _defer(self, kind, value=True):
+        """
+        If inside ``self.batch()``, record ``value`` as the pending change of
+        ``kind`` and return ``True``; otherwise return ``False``.
+
+        """
+
+        if self._batch_depth == 0:
+            return False
+
+        self._pending[kind] = value
+
+        return True
+
+    def _check_unbatched(self, name):
+        """
+        Raise a ``RuntimeError`` if inside ``self.batch()``, where ``name``
+        would act on the pre-batch state.
+
+        """
+
+        if self._batch_depth > 0:
+            raise RuntimeError(name + '() reads pending grid formatting; '
+                               'call it after the batch() block exits')
+
+    def _flush_batch(self):
+        """
+        Apply the changes collected by ``self.batch()``, one kind at a time.
+
+        """
+
+        pending, self._pending = self._pending, {}
+
+        for (xy, ind), change in pending.get('limits', {}).items():
+            if change is None:
+                self._invert_axis(xy, ind)
+            else:
+                self._apply_limit(xy, ind, *change)
+
+        if 'spacing' in pending:
+            self.fig.subplots_adjust(**pending['spacing'])
+
+        if 'ticknums' in pending:
+            self.set_all_ticknums(*pending['ticknums'])
+
+        for (ax, xy_axis, which), params in pending.get('ticks', {}).items():
+            ax.tick_params(axis=xy_axis, which=which, **params)
+
+        if 'spinewidth' in pending:
+            self.set_spinewidth(pending['spinewidth'])
+
+        if 'spineshift' in pending:
+            self.excecute_spineshift()
+
+        if 'cleanup' in pending:
+            self.cleanup_grid()
+
+        if 'freeze_ticks' in pending:
+            self.freeze_ticks(pending['freeze_ticks'])
+
+        if 'bar_frame' in pending:
+            self.adjust_bar_frame()
+
+    def _build_axes(self):
+        """
+        Create every original axes from the precomputed ``self.layout``
+        spans and store them in ``self.axes``, one subgrid per stacked row
+        (``XGrid``) or column (``YGrid``).
+
+        Axes in a subgrid share the stacked axis with the first axes of the
+        subgrid; axes in the same main axis position share the main axis
+        with the axes in the first subgrid.
+
+        """
+
+        spans = self.layout.spans()
+
+        if self.mainax_id == 'x':
+            share_main, share_stack = 'sharex', 'sharey'
+        else:
+            # Subgrids are columns
+            spans = spans.transpose(1, 0, 2)
+            share_main, share_stack = 'sharey', 'sharex'
+
+        gs = self.gridspec
+
+        for s, subgrid_spans in enumerate(spans.tolist()):
+            subgrid = []
+
+            for m, (r0, r1, c0, c1) in enumerate(subgrid_spans):
+                share = {}
+                if m > 0:
+                    share[share_stack] = subgrid[0]
+                if s > 0:
+                    share[share_main] = self.axes[0][m]
+
+                ax = self.fig.add_subplot(gs[r0:r1, c0:c1], **share)
+                ax.patch.set_visible(False)
+
+                subgrid.append(ax)
+
+            self.axes.append(subgrid)
+            self._index_subgrid(s)
+
+    def _index_subgrid(self, storage_ind):
+        """
+        Add the axes of ``self.axes[storage_ind]`` to ``self.axis_index``,
+        and twins to ``self.twin_storage``.
+
+        """
+
+        if storage_ind < self.stackdim:
+            stackpos, twinstance = storage_ind, None
+        else:
+            stackpos = self.twinds[storage_ind - self.stackdim]
+            storage = self.twin_storage.setdefault(stackpos, [])
+            twinstance = len(storage)
+            storage.append(storage_ind)
+
+        for mainpos, ax in enumerate(self.axes[storage_ind]):
+            self.axis_index[(stackpos, mainpos, twinstance)] = ax
+
+    def _lookup(self, stackpos, mainpos, twinstance=None):
+        """
+        Get the axes at physical stacked and main axis positions from
+        ``self.axis_index``.  Negative positions count from the end.
+
+        """
+
+        if stackpos < 0:
+            stackpos += self.stackdim
+        if mainpos < 0:
+            mainpos += self.mainax_dim
+        if twinstance is not None and twinstance < 0:
+            twinstance += len(self.twin_storage.get(stackpos, []))
+
+        try:
+            return self.axis_index[(stackpos, mainpos, twinstance)]
+        except KeyError:
+            raise IndexError('No axes at stacked position ' + str(stackpos) +
+                             ', main position ' + str(mainpos) +
+                             ', twin instance ' + str(twinstance))
+
+    def select(self, rows=None, cols=None, twins=False):
+        """
+        Get the axes at the given physical rows and columns, e.g. to apply
+        the same settings to all of them.
+
+        Parameters
+        ----------
+        rows, cols : int or list of ints
+            Default ``None``, all rows or columns.  Physical positions:
+            for ``XGrid``, ``rows`` are stacked and ``cols`` are main axis
+            positions, and vice versa for ``YGrid``.  Twins take the
+            position of the row (column) they twin; twins of twin rows
+            (columns) that of the original.
+
+        Keyword Arguments
+        -----------------
+        twins : Boolean or string
+            Default ``False``.  [True|False|'only'].  Whether to include
+            twins of the selected rows (columns) with the original axes,
+            or to select only twins.
+
+        Returns
+        -------
+        axes : list of ``Axes`` instances
+            Ordered by stacked position, then main axis position, then
+            original axes before twins in order of creation.
+
+        """
+
+        if self.mainax_id == 'x':
+            stackpos, mainpos = rows, cols
+        else:
+            stackpos, mainpos = cols, rows
+
+        stackpos = _positions(stackpos, self.stackdim)
+        mainpos = _positions(mainpos, self.mainax_dim)
+
+        physical = [self._stackpos_of(ind) for ind in range(len(self.axes))]
+
+        selected = []
+
+        for s in stackpos:
+            if s < 0:
+                s += self.stackdim
+
+            storage_inds = []
+            if twins != 'only':
+                storage_inds.append(s)
+            if twins:
+                # Twins are stored after the originals, in order of creation
+                storage_inds.extend(ind for ind in
+                                    range(self.stackdim, len(self.axes))
+                                    if physical[ind] == s)
+
+            for m in mainpos:
+                # Raises IndexError for positions outside the grid
+                self._lookup(s, m)
+                for ind in storage_inds:
+                    selected.append(self.axes[ind][m])
+
+        return selected
+
+    def _stackpos_of(self, storage_ind):
+        """
+        The physical stacked position of ``self.axes[storage_ind]``.  Twins,
+        including twins of twin rows (columns), share the position of the
+        original row (column) they descend from.
+
+        """
+
+        while storage_ind >= self.stackdim:
+            storage_ind = self.twinds[storage_ind - self.stackdim]
+
+        return storage_ind
+
     def set_dataside(self, startside, alternate_sides):
         """
         Set the ``dataside_list`` that indicates which stacked ax spine will be
@@ -297,6 +821,9 @@ class Grid(object):
 
         """
 
+        if self._defer('spineshift'):
+            return
+
         if self.stack_shifts is not None:
 
             for subgrid, ds, sh in zip(self.axes, self.dataside_list,
@@ -369,10 +896,14 @@ class Grid(object):
 
         """
 
+        self._check_unbatched('reveal_spines')
+
         for subgrid in self.axes:
             for ax in subgrid:
                 for sp in self.spinelist:
                     ax.spines[sp].set_visible(True)
+                ax.xaxis.set_visible(True)
+                ax.yaxis.set_visible(True)
 
         self.grid_isclean = False
 
@@ -394,6 +925,8 @@ class Grid(object):
 
         """
 
+        self._check_unbatched('set_ax_visibility')
+
         ax.spines[which].set_visible(visible)
 
         if which == 'left' or which == 'right':
@@ -420,10 +953,10 @@ class Grid(object):
                               'default': {'left' : 'right',
                                           'right': 'left'}}
             # Key is new tick pos, value is labelright, labelleft
-            ylabeldict = {'left' : ['off', 'on'],
-                          'right': ['on', 'off'],
-                          'both' : ['on', 'on'],
-                          'none' : ['off', 'off']}
+            ylabeldict = {'left' : [False, True],
+                          'right': [True, False],
+                          'both' : [True, True],
+                          'none' : [False, False]}
 
             old_tickpos = ax.yaxis.get_ticks_position()
             new_tickpos = ytick_dict[old_tickpos][which]
@@ -456,9 +989,10 @@ class Grid(object):
                               'default': {'top'   : 'bottom',
                                           'bottom': 'top'}}
             # Key is new tick pos, value is labeltop, labelbottom
-            xlabeldict = {'bottom': ['off', 'on'],
-                          'top'   : ['on', 'off'],
-                          'none'  : ['off', 'off']}
+            xlabeldict = {'bottom': [False, True],
+                          'top'   : [True, False],
+                          'both'  : [True, True],
+                          'none'  : [False, False]}
 
             old_tickpos = ax.xaxis.get_ticks_position()
             new_tickpos = xtick_dict[old_tickpos][which]
@@ -467,6 +1001,8 @@ class Grid(object):
             ax.xaxis.set_tick_params(labeltop=t, labelbottom=b)
             self.grid_isclean = False
 
+        self._update_axis_visibility(ax)
+
     def set_spinewidth(self, spinewidth):
         """
         Edit the linewidth of the axis spines. ``self.spinewidth`` used as
@@ -479,6 +1015,10 @@ class Grid(object):
 
         """
 
+        if self._defer('spinewidth', spinewidth):
+            self.spinewidth = spinewidth
+            return
+
         for subgrid in self.axes:
             for ax in subgrid:
                 for sp in self.spinelist:
@@ -492,9 +1032,27 @@ class Grid(object):
 
         """
 
+        twins = set(id(ax) for subgrid in self.axes[self.stackdim:]
+                    for ax in subgrid)
+
+        for clip in self.data_clips:
+            if id(clip.ax) in twins:
+                clip.disconnect()
+        self.data_clips = [clip for clip in self.data_clips
+                           if id(clip.ax) not in twins]
+
         for subgrid in self.axes[self.stackdim:]:
             for ax in subgrid:
                 self.fig.delaxes(ax)
+                self.tick_multiples.pop((ax, 'x'), None)
+                self.tick_multiples.pop((ax, 'y'), None)
+                self._unfreeze_ticks(ax, 'x')
+                self._unfreeze_ticks(ax, 'y')
+                self.axcolors.pop(ax, None)
+
+        self.axis_index = dict((key, ax) for key, ax
+                               in self.axis_index.items() if key[2] is None)
+        self.twin_storage = {}
 
         self.twinds = None
         self.twin_dim = 0
@@ -509,6 +1067,8 @@ class Grid(object):
     def set_xaxis_ticknum(self, axis, xticks, scale='linear'):
         """
         Set x tick scale and, if linear, major and minor tick locators.
+        Locators never place more than ``self.max_tick_density`` ticks per
+        pixel; see ``trendvis.ticks.CappedMultipleLocator``.
 
         Parameters
         ----------
@@ -522,20 +1082,28 @@ class Grid(object):
 
         """
 
-        if scale == 'linear':
+        self._unfreeze_ticks(axis, 'x')
 
-            xmajor_loc = MultipleLocator(xticks[0])
-            xminor_loc = MultipleLocator(xticks[1])
+        if scale == 'linear':
+            xmajor_loc = CappedMultipleLocator(xticks[0],
+                                               self.max_tick_density)
+            xminor_loc = CappedMultipleLocator(xticks[1],
+                                               self.max_tick_density)
 
             axis.xaxis.set_major_locator(xmajor_loc)
             axis.xaxis.set_minor_locator(xminor_loc)
 
+            self.tick_multiples[(axis, 'x')] = tuple(xticks)
+
         else:
             axis.set_xscale(scale)
+            self.tick_multiples.pop((axis, 'x'), None)
 
     def set_yaxis_ticknum(self, axis, yticks, scale='linear'):
         """
         Set y tick scale and, if linear, major and minor tick locators.
+        Locators never place more than ``self.max_tick_density`` ticks per
+        pixel; see ``trendvis.ticks.CappedMultipleLocator``.
 
         Parameters
         ----------
@@ -549,23 +1117,31 @@ class Grid(object):
 
         """
 
+        self._unfreeze_ticks(axis, 'y')
+
         if scale == 'linear':
-            ymajor_loc = MultipleLocator(yticks[0])
-            yminor_loc = MultipleLocator(yticks[1])
+            ymajor_loc = CappedMultipleLocator(yticks[0],
+                                               self.max_tick_density)
+            yminor_loc = CappedMultipleLocator(yticks[1],
+                                               self.max_tick_density)
 
             axis.yaxis.set_major_locator(ymajor_loc)
             axis.yaxis.set_minor_locator(yminor_loc)
 
+            self.tick_multiples[(axis, 'y')] = tuple(yticks)
+
         else:
             axis.set_yscale(scale)
+            self.tick_multiples.pop((axis, 'y'), None)
 
     def autocolor_spines(self, ticks_only=False):
         """
         Set the axis stacked ax spine and/or tick color based on the color of
         the first line on the axis.
 
-        If no line is found on an axis, then ``autocolor_spines()`` will
-        default to the color of the first item in the list of axis children.
+        Colors recorded with ``self.register_axcolor()`` (as ``plot_data()``
+        does) are used directly.  For other axes, the first line among the
+        axis children is used, or if there is no line, the first child.
 
         Parameters
         ----------
@@ -577,26 +1153,33 @@ class Grid(object):
 
         for subgrid in self.axes:
             for ax in subgrid:
-                # Default is first child, unless the first line is found
-                # later among the children. Should account for difference
-                # among recent versions of matplotlib
-                child = ax.get_children()[0]
-                for kid in ax.get_children():
-                    if isinstance(kid, lines.Line2D):
-                        child = kid
-                        break
-                try:
-                    color = child.get_color()
-                except AttributeError:
-                    color = child.get_facecolor()
-                    if len(color) < 3:
-                        color = color[0]
+                color = self.axcolors.get(ax)
+                if color is None:
+                    color = self._first_child_color(ax)
 
                 try:
                     self.set_axcolor(ax, color, ticks_only=ticks_only)
-                except:
+                except ValueError:
+                    # Not a single color, e.g. a multicolored collection
                     pass
 
+    def register_axcolor(self, ax, color):
+        """
+        Record the color of something plotted on ``ax`` for
+        ``self.autocolor_spines()``.  Only the first color registered for
+        an axis is kept.
+
+        Parameters
+        ----------
+        ax : ``matplotlib Axes`` instance
+            Can get with ``self.get_axis()``
+        color : string, tuple of floats
+            Any color accepted by ``matplotlib``.
+
+        """
+
+        self.axcolors.setdefault(ax, color)
+
     def set_axcolor(self, ax, color, ticks_only=False, spines_only=False):
         """
         Set the stacked ax spine and tick color of the given Axes.
@@ -652,13 +1235,18 @@ class Grid(object):
             Default 'none'.  The background color.  Any ``matplotlib``-accepted
             color.
         **kwargs
-            Passed to ``plt.Rectangle``; any valid
+            Passed to ``matplotlib.patches.Rectangle``; any valid
             ``matplotlib.patches.Patch`` kwargs
 
         """
 
+        self._check_unbatched('draw_frame')
+
+        self.frame_specs.append(dict(lw=lw, zorder=zorder,
+                                     edgecolor=edgecolor,
+                                     facecolor=facecolor, **kwargs))
+
         last_instack = self.stackdim - 1
-        patchlist = self.fig.patches
 
         if lw == 'default':
             lw = self.spinewidth
@@ -677,23 +1265,10 @@ class Grid(object):
             urdx = ur_axis.get_xlim()[1]
             urdy = ur_axis.get_ylim()[1]
 
-            self.bf_llcorners.append((lldx, lldy))
-            self.bf_urcorners.append((urdx, urdy))
-            self.bf_llaxis.append(ll_axis)
-            self.bf_uraxis.append(ur_axis)
-
-            ll_corner = self._convert_coords(ll_axis, (lldx, lldy))
-            ur_corner = self._convert_coords(ur_axis, (urdx, urdy))
-
-            width, height = self._rect_dim(ur_corner, ll_corner)
-
-            patchlist.append(plt.Rectangle(ll_corner, width, height,
-                                           zorder=zorder, facecolor=facecolor,
-                                           edgecolor=edgecolor, lw=lw,
-                                           transform=self.fig.transFigure,
-                                           **kwargs))
-
-            self.bf_patchinds.append(len(patchlist) - 1)
+            self._draw_anchored_rect(ll_axis, (lldx, lldy), ur_axis,
+                                     (urdx, urdy), zorder=zorder,
+                                     facecolor=facecolor, edgecolor=edgecolor,
+                                     lw=lw, **kwargs)
 
     def draw_bar(self, ll_axis, ur_axis, bar_limits, orientation='vertical',
                  zorder=-1, **kwargs):
@@ -701,9 +1276,9 @@ class Grid(object):
         Draws vertical or horizontal bars across the ENTIRE plot space,
         anchoring them on opposite axes.
 
-        If horizontal (vertical) bars are drawn on ``XGrid`` (``YGrid``), then
-        adjusting plot spacing afterwards will appear to displace bar, because
-        they are drawn on the figure and not the axes.
+        Bars are figure patches whose corners are anchored to the data
+        coordinates of ``ll_axis`` and ``ur_axis`` at draw time, so they stay
+        aligned when limits or spacing change afterwards.
 
         Parameters
         ----------
@@ -719,11 +1294,18 @@ class Grid(object):
         zorder : int
             Default -1.  Zorder of the bar.
         **kwargs
-            Passed to ``plt.Rectangle``; any valid
+            Passed to ``matplotlib.patches.Rectangle``; any valid
             ``matplotlib.patches.Patch`` kwargs
 
         """
 
+        self._check_unbatched('draw_bar')
+
+        self.bar_specs.append(dict(ll_axis=ll_axis, ur_axis=ur_axis,
+                                   bar_limits=tuple(bar_limits),
+                                   orientation=orientation, zorder=zorder,
+                                   kwargs=kwargs))
+
         if orientation == 'vertical':
             lldx, urdx = bar_limits
             lldy = ll_axis.get_ylim()[0]
@@ -733,52 +1315,658 @@ class Grid(object):
             lldx = ll_axis.get_xlim()[0]
             urdx = ur_axis.get_xlim()[1]
 
-        self.bf_llcorners.append((lldx, lldy))
-        self.bf_urcorners.append((urdx, urdy))
+        patch = self._draw_anchored_rect(ll_axis, (lldx, lldy), ur_axis,
+                                         (urdx, urdy), zorder=zorder,
+                                         **kwargs)
+        self.bar_specs[-1]['patch'] = patch
+
+    def draw_bars(self, ll_axis, ur_axis, bar_limits=None, event_lines=None,
+                  orientation='vertical', zorder=-1, event_kwargs=None,
+                  **kwargs):
+        """
+        Draw many bars and/or full-length event lines across the ENTIRE plot
+        space at once, anchored on opposite axes like ``self.draw_bar()``.
+
+        All bars become a single ``PolyCollection`` and all event lines a
+        single ``LineCollection``.  Both are positioned at draw time, so they
+        stay aligned when limits or spacing change afterwards.
+
+        Parameters
+        ----------
+        ll_axis : ``matplotlib Axes`` instance
+            The axis that will contain the lower left corner of the bars
+        ur_axis : ``matplotlib Axes`` instance
+            The axis that will contain the upper right corner of the bars
+        bar_limits : (N, 2) array-like of ints or floats
+            Default ``None``.  The lower, upper data limits of each bar, in
+            ``ll_axis`` data coordinates.
+        event_lines : 1D array-like of ints or floats
+            Default ``None``.  The data positions of lines spanning the same
+            extent as the bars, in ``ll_axis`` data coordinates.
+        orientation : string
+            Default 'vertical'.  Indicates the orientation of the long
+            axis of the bars and lines
+        zorder : int
+            Default -1.  Zorder of the bars and lines.
+        event_kwargs : dict
+            Default ``None``.  Passed to ``LineCollection``.  Line color
+            defaults to black.
+        **kwargs
+            Passed to ``PolyCollection``; any valid
+            ``matplotlib.collections.Collection`` kwargs
+
+        Returns
+        -------
+        collections : list
+            The ``PolyCollection`` and/or ``LineCollection`` created, which
+            are also stored in ``self.bar_collections``.
+
+        """
+
+        self._check_unbatched('draw_bars')
+
+        if orientation == 'vertical':
+            span = DataCornerTransform(ll_axis, (0, ll_axis.get_ylim()[0]),
+                                       ur_axis, (0, ur_axis.get_ylim()[1]))
+            trans = blended_transform_factory(ll_axis.transData, span)
+            # Column order for (position, span) vertices
+            order = [0, 1]
+        else:
+            span = DataCornerTransform(ll_axis, (ll_axis.get_xlim()[0], 0),
+                                       ur_axis, (ur_axis.get_xlim()[1], 0))
+            trans = blended_transform_factory(span, ll_axis.transData)
+            order = [1, 0]
+
+        self.bar_collection_specs.append(
+            dict(ll_axis=ll_axis, ur_axis=ur_axis, bar_limits=bar_limits,
+                 event_lines=event_lines, orientation=orientation,
+                 zorder=zorder, event_kwargs=dict(event_kwargs or {}),
+                 kwargs=kwargs))
+
+        collections = []
+
+        if bar_limits is not None:
+            bar_limits = np.asarray(bar_limits, dtype=float).reshape(-1, 2)
+
+            verts = np.empty((len(bar_limits), 4, 2))
+            verts[:, :, order[0]] = bar_limits[:, [0, 1, 1, 0]]
+            verts[:, :, order[1]] = [0, 0, 1, 1]
+
+            collections.append(PolyCollection(verts, transform=trans,
+                                              zorder=zorder, **kwargs))
+
+        if event_lines is not None:
+            event_lines = np.asarray(event_lines, dtype=float).ravel()
+
+            segments = np.empty((len(event_lines), 2, 2))
+            segments[:, :, order[0]] = event_lines[:, None]
+            segments[:, :, order[1]] = [0, 1]
+
+            event_kwargs = dict(event_kwargs or {})
+            event_kwargs.setdefault('colors', 'black')
+
+            collections.append(LineCollection(segments, transform=trans,
+                                              zorder=zorder, **event_kwargs))
+
+        for collection in collections:
+            self.fig.add_artist(collection)
+
+        self.bar_collections.extend(collections)
+
+        return collections
+
+    def mainax_pixels(self, main_ind=0):
+        """
+        Length in pixels of the main axis of a column (``XGrid``) or row
+        (``YGrid``) at the current figure size, dpi and subplot spacing.
+
+        Parameters
+        ----------
+        main_ind : int
+            Default 0.  The index of the main axis column (row).
+
+        Returns
+        -------
+        pixels : float
+            The width (height) of the cells at ``main_ind``, in pixels.
+
+        """
+
+        rects = self.layout.figure_rects(self.fig)
+        width, height = self.fig.get_size_inches() * self.fig.dpi
+
+        if self.mainax_id == 'x':
+            pixels = rects[0, main_ind, 2] * width
+        else:
+            pixels = rects[main_ind, 0, 3] * height
+
+        return pixels
+
+    def freeze_ticks(self, max_density=0.2):
+        """
+        Replace the locators installed by ``self.set_all_ticknums()`` with
+        ``FixedLocator``s at the current axis limits, so ticks are not
+        located again on every draw.
+
+        Tick positions for all axes are planned in one pass.  If the
+        requested multiples would put more than ``max_density`` major or
+        minor ticks per pixel on an axis, that axis gets every nth tick
+        instead.  Hidden and log-scaled axes are skipped.
+
+        Frozen ticks are planned again whenever the limits of their axis
+        change.  ``self.set_xaxis_ticknum()``, ``self.set_yaxis_ticknum()``
+        and ``self.set_all_ticknums()`` unfreeze ticks.
+
+        Parameters
+        ----------
+        max_density : float
+            Default 0.2, i.e. at most one tick every 5 pixels.  The maximum
+            number of ticks per pixel.
+
+        """
+
+        if self._defer('freeze_ticks', max_density):
+            return
+
+        self._freeze_density = max_density
+
+        keys = []
+        for subgrid in self.axes:
+            for ax in subgrid:
+                for xy, axis in (('x', ax.xaxis), ('y', ax.yaxis)):
+                    if ((ax, xy) in self.tick_multiples and
+                            axis.get_visible()):
+                        keys.append((ax, xy))
+
+        self._plan_frozen_ticks(keys)
+
+        for ax, xy in keys:
+            if (ax, xy) not in self._freeze_cids:
+                self._freeze_cids[(ax, xy)] = ax.callbacks.connect(
+                    xy + 'lim_changed',
+                    functools.partial(self._refreeze_ticks, xy))
+
+    def _refreeze_ticks(self, xy, ax):
+        """
+        Plan the frozen ticks of ``ax`` again after a limit change.
+
+        """
+
+        if (ax, xy) in self._freeze_cids:
+            self._plan_frozen_ticks([(ax, xy)])
+
+    def _unfreeze_ticks(self, ax, xy):
+        """
+        Stop planning the frozen ticks of one axis of ``ax`` again.
+
+        """
+
+        cid = self._freeze_cids.pop((ax, xy), None)
+        if cid is not None:
+            ax.callbacks.disconnect(cid)
+
+    def _plan_frozen_ticks(self, keys):
+        """
+        Install ``FixedLocator``s for (axes, 'x'|'y') ``keys`` at the
+        current limits, with at most ``self._freeze_density`` ticks per
+        pixel.  Log-scaled axes are skipped.
+
+        """
+
+        axis_list = []
+        lims = []
+        multiples = []
+        pixels = []
+
+        for ax, xy in keys:
+            if xy == 'x':
+                axis, lim, length = ax.xaxis, ax.get_xlim(), ax.bbox.width
+            else:
+                axis, lim, length = ax.yaxis, ax.get_ylim(), ax.bbox.height
+
+            mult = self.tick_multiples.get((ax, xy))
+
+            if mult is None or axis.get_scale() != 'linear':
+                continue
+
+            axis_list.append(axis)
+            lims.append(lim)
+            multiples.append(mult)
+            pixels.append(length)
+
+        if not axis_list:
+            return
+
+        lims = np.array(lims)
+        multiples = np.array(multiples, dtype=float)
+
+        majors = plan_ticks(lims[:, 0], lims[:, 1], multiples[:, 0], pixels,
+                            self._freeze_density)
+        minors = plan_ticks(lims[:, 0], lims[:, 1], multiples[:, 1], pixels,
+                            self._freeze_density)
+
+        for axis, major, minor in zip(axis_list, majors, minors):
+            axis.set_major_locator(FixedLocator(major))
+            axis.set_minor_locator(FixedLocator(minor))
+
+    def clear_data(self):
+        """
+        Remove plotted data so the formatted grid can be reused.
+
+        Removes all lines (except cutouts), collections, patches and images
+        from the axes, the bars from ``self.draw_bar()`` and the collections
+        from ``self.draw_bars()``.  Axes, twins, shared axes, spines, ticks,
+        labels, frames, cutouts and ``self.grid_isclean`` are untouched.
+        Autoscaling axes are rescaled to what remains.
+
+        Lines of a ``GridStream`` on the grid are removed too, so close the
+        stream first.
+
+        """
+
+        for clip in self.data_clips:
+            clip.disconnect()
+        self.data_clips = []
+
+        cutouts = set(id(line) for line in self.cutout_lines)
+
+        for subgrid in self.axes:
+            for ax in subgrid:
+                data = [line for line in ax.lines if id(line) not in cutouts]
+                data.extend(ax.collections)
+                data.extend(ax.patches)
+                data.extend(ax.images)
+
+                for artist in data:
+                    artist.remove()
+
+                ax.relim()
+                ax.autoscale_view()
+
+        for collection in self.bar_collections:
+            collection.remove()
+        self.bar_collections = []
+        self.bar_collection_specs = []
+
+        # Drop the bars from the figure and the bar and frame lists
+        bars = set(id(bar['patch']) for bar in self.bar_specs)
+        kept = [(ll, ur, llax, urax, self.fig.patches[ind])
+                for ll, ur, llax, urax, ind in zip(self.bf_llcorners,
+                                                   self.bf_urcorners,
+                                                   self.bf_llaxis,
+                                                   self.bf_uraxis,
+                                                   self.bf_patchinds)
+                if id(self.fig.patches[ind]) not in bars]
+
+        self.fig.patches[:] = [patch for patch in self.fig.patches
+                               if id(patch) not in bars]
+        patch_inds = dict((id(patch), i)
+                          for i, patch in enumerate(self.fig.patches))
+
+        self.bf_llcorners = [item[0] for item in kept]
+        self.bf_urcorners = [item[1] for item in kept]
+        self.bf_llaxis = [item[2] for item in kept]
+        self.bf_uraxis = [item[3] for item in kept]
+        self.bf_patchinds = [patch_inds[id(item[4])] for item in kept]
+        self.bar_specs = []
+
+        self.axcolors = {}
+        self.rasterized_artists = []
+
+        self.fig.stale = True
+
+    def set_rasterization_policy(self, line_points=5000,
+                                 collection_points=20000, dpi=300):
+        """
+        Rasterize dense data in vector (pdf, svg, eps) output.
+
+        Once set, ``self.apply_rasterization()``, which ``self.savefig()``
+        calls, rasterizes every line and collection on the grid's axes with
+        at least the given number of points.  Everything else- spines,
+        ticks, labels, cutouts, and the frames and bars trendvis draws on
+        the figure- stays vector.
+
+        Parameters
+        ----------
+        line_points : int
+            Default 5000.  Lines with this many points or more are
+            rasterized.  ``None`` to never rasterize lines.
+        collection_points : int
+            Default 20000.  Collections with this many points (vertices of
+            line collections, offsets of scatter plots) or more are
+            rasterized.  ``None`` to never rasterize collections.
+        dpi : int
+            Default 300.  Resolution of the rasterized artists, used by
+            ``self.savefig()`` for vector formats unless it is given a
+            ``dpi``.
+
+        """
+
+        self.raster_policy = {'line_points': line_points,
+                              'collection_points': collection_points,
+                              'dpi': dpi}
+
+    def clear_rasterization_policy(self):
+        """
+        Remove the rasterization policy and return the artists it
+        rasterized to vector drawing.
+
+        """
+
+        for artist in self.rasterized_artists:
+            artist.set_rasterized(False)
+
+        self.raster_policy = None
+        self.rasterized_artists = []
+
+    def apply_rasterization(self):
+        """
+        Rasterize the lines and collections on the grid's axes that exceed
+        the thresholds of ``self.set_rasterization_policy()``.  Does nothing
+        if no policy is set.
+
+        Returns
+        -------
+        rasterized : list of artists
+            The artists rasterized by the policy so far.
+
+        """
+
+        if self.raster_policy is None:
+            return self.rasterized_artists
+
+        line_points = self.raster_policy['line_points']
+        collection_points = self.raster_policy['collection_points']
+        cutouts = set(id(line) for line in self.cutout_lines)
+
+        for subgrid in self.axes:
+            for ax in subgrid:
+                dense = []
+
+                if line_points is not None:
+                    dense.extend(line for line in ax.lines
+                                 if id(line) not in cutouts and
+                                 len(line.get_xdata()) >= line_points)
+
+                if collection_points is not None:
+                    dense.extend(c for c in ax.collections
+                                 if _count_points(c) >= collection_points)
+
+                for artist in dense:
+                    if not artist.get_rasterized():
+                        artist.set_rasterized(True)
+                        self.rasterized_artists.append(artist)
+
+        return self.rasterized_artists
+
+    def savefig(self, fname, **kwargs):
+        """
+        Save the figure, first applying the rasterization policy, if any.
+
+        Parameters
+        ----------
+        fname : string, path or file-like
+            Passed to ``fig.savefig()``.
+        **kwargs
+            Passed to ``fig.savefig()``.  If no ``dpi`` is given and the
+            format is a vector format (pdf, svg, ps, eps), the policy dpi is
+            used.  Raster formats keep the figure dpi.
+
+        """
+
+        fmt = kwargs.get('format')
+        if fmt is None and isinstance(fname, (str, os.PathLike)):
+            fmt = os.path.splitext(os.fspath(fname))[1][1:]
+
+        kwargs = self._prepare_savefig(fmt, kwargs)
+
+        self.fig.savefig(fname, **kwargs)
+
+    def _prepare_savefig(self, fmt, kwargs):
+        """
+        Apply the rasterization policy, if any, and return a copy of the
+        savefig ``kwargs`` with the policy dpi added for vector ``fmt``.
+
+        """
+
+        kwargs = dict(kwargs)
+
+        if self.raster_policy is not None:
+            self.apply_rasterization()
+
+            fmt = (fmt or matplotlib.rcParams['savefig.format']).lower()
+            if fmt in VECTOR_FORMATS:
+                kwargs.setdefault('dpi', self.raster_policy['dpi'])
+
+        return kwargs
+
+    def adjust_bar_frame(self):
+        """
+        Re-anchor bars and frames made via ``self.draw_frame()`` and
+        ``self.draw_bar()`` to the data coordinates and axes stored in
+        ``self.bf_llcorners``, ``self.bf_urcorners``, ``self.bf_llaxis`` and
+        ``self.bf_uraxis``.
+
+        Bars and frames are positioned at draw time, so they already follow
+        axis limit and subplot spacing changes.  This is only needed after
+        editing the stored corners or axes directly.
+
+        """
+
+        for ll, ur, llax, urax, ind in zip(self.bf_llcorners,
+                                           self.bf_urcorners,
+                                           self.bf_llaxis,
+                                           self.bf_uraxis,
+                                           self.bf_patchinds):
+            trans = self.fig.patches[ind].get_data_transform()
+
+            trans.ll_axis = llax
+            trans.ll_corner = ll
+            trans.ur_axis = urax
+            trans.ur_corner = ur
+            trans.invalidate()
+
+    def _set_limits(self, xy, lims, dim, adjust_bar_frame):
+        """
+        Set ``xy`` axis limits from a ``set_xlim``/``set_ylim`` style
+        ``lims`` argument.
+
+        Parameters
+        ----------
+        xy : string
+            ['x'|'y'].  The axis the limits are for.
+        lims : tuple or list of tuples
+            (min, max) if ``dim`` is 1, else (index, min, max) or list of them
+        dim : int
+            The number of ``xy`` axes.
+        adjust_bar_frame : Boolean
+            Realign bars and frames afterwards.
+
+        """
+
+        if dim == 1:
+            try:
+                lims.extend([])
+            except AttributeError:
+                pass
+            else:
+                lims = lims[0]
+
+            limits = [(0, lims[-2], lims[-1])]
+
+        else:
+            try:
+                lims.extend([])
+            except AttributeError:
+                lims = [lims]
+
+            limits = [(lim[0], lim[1], lim[2]) for lim in lims]
+
+        if self._batch_depth > 0:
+            pending = self._pending.setdefault('limits', {})
+            for ind, lo, hi in limits:
+                # Drop any earlier change so the latest is applied last
+                pending.pop((xy, ind), None)
+                pending[(xy, ind)] = (lo, hi)
+        else:
+            for ind, lo, hi in limits:
+                self._apply_limit(xy, ind, lo, hi)
+
+        if adjust_bar_frame:
+            self._adjust_bar_frame()
+
+    def _reverse_axes(self, xy, inds, adjust_bar_frame):
+        """
+        Invert the ``xy`` axes at ``inds``.
+
+        """
+
+        if self._batch_depth > 0:
+            pending = self._pending.setdefault('limits', {})
+            for ind in inds:
+                change = pending.pop((xy, ind), False)
+                if change is False:
+                    # Invert at flush time
+                    pending[(xy, ind)] = None
+                elif change is not None:
+                    # Reverse the pending limits; two inversions cancel
+                    pending[(xy, ind)] = change[::-1]
+        else:
+            for ind in inds:
+                self._invert_axis(xy, ind)
+
+        if adjust_bar_frame:
+            self._adjust_bar_frame()
+
+    def _apply_limit(self, xy, ind, lo, hi):
+        """
+        Set the limits of every ``xy`` axis at index ``ind``.
+
+        """
+
+        if xy == self.mainax_id:
+            for subgrid in self.axes:
+                getattr(subgrid[ind], 'set_' + xy + 'lim')(lo, hi)
+        else:
+            for ax in self.axes[ind]:
+                getattr(ax, 'set_' + xy + 'lim')(lo, hi)
+
+    def _invert_axis(self, xy, ind):
+        """
+        Invert the ``xy`` axis at index ``ind``.  Shared axes follow.
+
+        """
+
+        if xy == self.mainax_id:
+            ax = self.axes[0][ind]
+        else:
+            ax = self.axes[ind][0]
+
+        getattr(ax, 'invert_' + xy + 'axis')()
+
+    def _adjust_spacing(self, adjust_bar_frame, **spacing):
+        """
+        Adjust figure subplot spacing, or defer it if inside ``self.batch()``.
+
+        """
+
+        if self._batch_depth > 0:
+            self._pending.setdefault('spacing', {}).update(spacing)
+        else:
+            self.fig.subplots_adjust(**spacing)
+
+        if adjust_bar_frame:
+            self._adjust_bar_frame()
+
+    def _adjust_bar_frame(self):
+        """
+        Realign bars and frames, or defer it if inside ``self.batch()``.
+
+        """
+
+        if not self._defer('bar_frame'):
+            self.adjust_bar_frame()
+
+    def _draw_anchored_rect(self, ll_axis, ll_corner, ur_axis, ur_corner,
+                            **kwargs):
+        """
+        Add a figure patch spanning from ``ll_corner`` in ``ll_axis`` data
+        coordinates to ``ur_corner`` in ``ur_axis`` data coordinates, and
+        record it in the bar and frame lists.
+
+        """
+
+        self.bf_llcorners.append(ll_corner)
+        self.bf_urcorners.append(ur_corner)
         self.bf_llaxis.append(ll_axis)
         self.bf_uraxis.append(ur_axis)
 
-        ll_corner = self._convert_coords(ll_axis, (lldx, lldy))
-        ur_corner = self._convert_coords(ur_axis, (urdx, urdy))
+        trans = DataCornerTransform(ll_axis, ll_corner, ur_axis, ur_corner)
+        self.fig.patches.append(Rectangle((0, 0), 1, 1, transform=trans,
+                                          **kwargs))
 
-        width, height = self._rect_dim(ur_corner, ll_corner)
+        self.bf_patchinds.append(len(self.fig.patches) - 1)
 
-        self.fig.patches.append(plt.Rectangle(ll_corner, width, height,
-                                              zorder=zorder,
-                                              transform=self.fig.transFigure,
-                                              **kwargs))
+        return self.fig.patches[-1]
 
-        self.bf_patchinds.append(len(self.fig.patches) - 1)
+    def _hide_idle_axes(self):
+        """
+        Hide every x and y axis that has no tick marks, tick labels or axis
+        label to draw, so its ticks are never located or formatted.
+
+        """
+
+        for subgrid in self.axes:
+            for ax in subgrid:
+                self._update_axis_visibility(ax)
+
+    def _update_axis_visibility(self, ax):
+        """
+        Show the x and y axes of ``ax`` if they have anything to draw
+        (tick marks, tick labels, gridlines or a label), otherwise hide
+        them.
 
-    def adjust_bar_frame(self):
         """
-        Bars and frames made via ``self.draw_frame()`` and ``self.draw_bar()``
-        are drawn on figure coordinates, so these patches and the axes
-        move relative to each other when axis limits or subplot spacings are
-        changed.
 
-        This function realigns existing bars and frames with the original data
-        coordinates.
+        for axis in (ax.xaxis, ax.yaxis):
+            major = axis.get_major_ticks(1)[0]
+            minor = axis.get_minor_ticks(1)[0]
 
+            drawn = [major.tick1line, major.tick2line, major.label1,
+                     major.label2, major.gridline, minor.tick1line,
+                     minor.tick2line, minor.gridline]
+
+            # Minor tick labels are usually blank
+            if not isinstance(axis.get_minor_formatter(), NullFormatter):
+                drawn.extend([minor.label1, minor.label2])
+
+            axis.set_visible(any(a.get_visible() for a in drawn) or
+                             bool(axis.get_label_text()))
+
+    def _first_child_color(self, ax):
         """
-        # Check that there are any items to adjust
-        if len(self.bf_llcorners) > 0:
-            for ll, ur, llax, urax, ind in zip(self.bf_llcorners,
-                                               self.bf_urcorners,
-                                               self.bf_llaxis,
-                                               self.bf_uraxis,
-                                               self.bf_patchinds):
-                # Grab rectangle
-                rect = self.fig.patches[ind]
+        Color of the first line among the children of ``ax``, or of the
+        first child if there is no line.
 
-                # Get new figure coordinates
-                new_x, new_y = self._convert_coords(llax, ll)
-                ur_corner = self._convert_coords(urax, ur)
+        """
 
-                # Get new figure dimensions
-                width, height = self._rect_dim(ur_corner, (new_x, new_y))
+        # Default is first child, unless the first line is found
+        # later among the children. Should account for difference
+        # among recent versions of matplotlib
+        children = ax.get_children()
+        child = children[0]
+        for kid in children:
+            if isinstance(kid, lines.Line2D):
+                child = kid
+                break
+        try:
+            color = child.get_color()
+        except AttributeError:
+            color = child.get_facecolor()
+            if len(color) < 3:
+                color = color[0]
 
-                rect.set_bounds(new_x, new_y, width, height)
+        return color
 
     def _update_twinsides(self):
         """
@@ -909,6 +2097,19 @@ class Grid(object):
 
         """
 
+        if self._batch_depth > 0:
+            pending = self._pending.setdefault('ticks', {})
+            params = dict(length=tick_dim[0], width=tick_dim[1],
+                          labelsize=labelsize, pad=pad, direction=direction)
+            xy_list = ['x', 'y'] if xy_axis == 'both' else [xy_axis]
+
+            for s in subgrid_inds:
+                for ax in ax_inds:
+                    for xy in xy_list:
+                        key = (self.axes[s][ax], xy, which)
+                        pending.setdefault(key, {}).update(params)
+            return
+
         for s in subgrid_inds:
             for ax in ax_inds:
                 self.axes[s][ax].tick_params(axis=xy_axis, which=which,
@@ -917,55 +2118,36 @@ class Grid(object):
                                              labelsize=labelsize, pad=pad,
                                              direction=direction)
 
-    def _convert_coords(self, axis, coordinates):
-        """
-        Convert data ``coordinates`` to axis coordinates.
-
-        Parameters
-        ----------
-        axis : ``matplotlib Axes`` instance
-            The axes instance used to convert data ``coordinates`` into axes
-            and figure coordinates
-        coordinates : tuple of floats
-            Coordinates in the data coordinate system
-
-        Returns
-        -------
-        fig_coords : tuple of floats
-            ``coordinates`` translated to the figure coordinate system
-
-        """
-
-        # Convert to axes coordinates
-        ax_coords = axis.transData.transform(coordinates)
 
-        # Convert to figure coordinates
-        fig_coords = self.fig.transFigure.inverted().transform(ax_coords)
+def _count_points(collection):
+    """
+    Number of points drawn by ``collection``: segment vertices for line
+    collections, path vertices for other collections with paths, offsets
+    for scatter-type collections.
 
-        return fig_coords
+    """
 
-    def _rect_dim(self, ur_corner, ll_corner):
-        """
-        Find w, h dimensions of rectange drawn in figure coordinates.
+    if isinstance(collection, LineCollection):
+        return sum(len(segment) for segment in collection.get_segments())
 
-        """
+    offsets = collection.get_offsets()
+    if len(offsets) > 1:
+        return len(offsets)
 
-        width, height = (ur - ll for ur, ll in zip(ur_corner, ll_corner))
+    return sum(len(path.vertices) for path in collection.get_paths())
 
-        return width, height
 
-    def _ratios_arelists(self, ratios):
-        """
-        Check if ``ratios`` are lists; rectify if not.
+def _positions(selection, dim):
+    """
+    List of positions from ``Grid.select()`` arguments: ``None`` for all
+    ``dim`` positions, an int, or a list of ints.
 
-        """
+    """
 
-        try:
-            rsum = sum(ratios)
-        except TypeError:
-            rsum = ratios
-            rlist = [ratios]
-        else:
-            rlist = ratios
+    if selection is None:
+        return range(0, dim)
 
-        return rsum, rlist
+    try:
+        return list(selection)
+    except TypeError:
+        return [selection]
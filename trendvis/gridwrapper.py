@@ -1,11 +1,15 @@
 from __future__ import division, print_function, absolute_import
+import numpy as np
+from matplotlib.collections import LineCollection
 from .xgrid_ystack import XGrid
 from .ygrid_xstack import YGrid
+from .dataprep import decimate_xy, is_monotonic, load_array, window_slice
 
 
 def make_grid(xratios, yratios, figsize, xticks, yticks, main_axis,
               plotdata=None, xlim=None, ylim=None, to_twin=None,
-              axis_shift=None, twinax_shift=None, tick_fontsize=10, **kwargs):
+              axis_shift=None, twinax_shift=None, tick_fontsize=10,
+              use_pyplot=True, freeze_ticks=None, **kwargs):
 
     """
     Build a plot with a stack of multiple y (x) axes against a main x (y) axis
@@ -35,10 +39,11 @@ def make_grid(xratios, yratios, figsize, xticks, yticks, main_axis,
     -----------------
     plotdata : list of lists of tuples
         Default ``None``.
-        Tuple format: (x, y, color, {}, [ax inds within row/col])
+        Tuple format: (x, y, color, [ax inds within row/col])
         One sublist per row or column (including twins).  To skip plotting on a
         row or column, insert empty sublist at position corresponding to
-        the index of the row or column.
+        the index of the row or column.  See ``plot_data()`` for
+        memory-mapped data, which is read only within ``xlim`` (``ylim``).
     xlim : list of tuples of ints and/or floats
         Default ``None``.  List of (column, min, max).
         If xdim is 1, then column is ignored.
@@ -57,6 +62,13 @@ def make_grid(xratios, yratios, figsize, xticks, yticks, main_axis,
         twinned axis spine relative shift.  Units are fraction of figure
     tick_fontsize : int
         Default 10.  The fontsize of tick labels.
+    use_pyplot : Boolean
+        Default ``True``.  If ``False``, the grid is built on a bare
+        ``Figure`` with an Agg canvas that pyplot does not track.
+    freeze_ticks : float
+        Default ``None``.  If given, ticks are frozen at the final limits
+        with at most this many ticks per pixel.  See
+        ``Grid.freeze_ticks()``.
 
     Other Parameters
     ----------------
@@ -70,54 +82,55 @@ def make_grid(xratios, yratios, figsize, xticks, yticks, main_axis,
 
     mainax = main_axis.lower()[0]
 
-    startside_dict = {'x': 'left',
-                      'y': 'top'}
-
-    startside = startside_dict[mainax]
-
-    if mainax == 'y':
+    if mainax == 'x':
         # Set up grid, grid formatting
-        grid = XGrid(xratios, yratios, figsize, startside=startside,
-                     alternate_sides=True, onespine_forboth=False)
+        grid = XGrid(yratios, xratios=xratios, figsize=figsize,
+                     startside='left', alternate_sides=True,
+                     onespine_forboth=False, use_pyplot=use_pyplot)
 
-    elif mainax == 'x':
-        grid = YGrid(xratios, yratios, figsize, startside=startside,
-                     alternate_sides=True, onespine_forboth=False)
+    elif mainax == 'y':
+        grid = YGrid(xratios, yratios=yratios, figsize=figsize,
+                     startside='top', alternate_sides=True,
+                     onespine_forboth=False, use_pyplot=use_pyplot)
 
     else:
         raise ValueError('main_axis arg, ' + main_axis + ' is not recognized')
 
-    if to_twin is not None:
-        grid.make_twins(to_twin)
+    # Apply all formatting at once when the block exits
+    with grid.batch():
+        if to_twin is not None:
+            grid.make_twins(to_twin)
 
-    grid.set_ticknums(xticks, yticks)
+        grid.set_all_ticknums(xticks, yticks)
 
-    grid.set_ticks(labelsize=tick_fontsize)
+        grid.set_ticks(labelsize=tick_fontsize)
 
-    if xlim is not None:
-        grid.set_xlim(xlim)
+        if xlim is not None:
+            grid.set_xlim(xlim)
 
-    if ylim is not None:
-        grid.set_ylim(ylim)
+        if ylim is not None:
+            grid.set_ylim(ylim)
 
-    if axis_shift is not None or twinax_shift is not None:
-        grid.set_relative_axshift(axis_shift=axis_shift,
-                                  twin_shift=twinax_shift)
-        grid.set_absolute_axshift()
-        grid.move_spines()
+        if axis_shift is not None or twinax_shift is not None:
+            grid.move_spines(axis_shift=axis_shift, twin_shift=twinax_shift)
 
-    grid.set_spinewidth(2)
+        grid.set_spinewidth(2)
 
-    grid.cleanup_grid()
+        grid.cleanup_grid()
 
     if plotdata is not None:
         plot_data(grid, plotdata, **kwargs)
 
+    # After plotting, so autoscaled limits are final
+    if freeze_ticks is not None:
+        grid.freeze_ticks(freeze_ticks)
+
     return grid
 
 
 def plot_data(grid, plotdata, auto_spinecolor=True, marker='o', ls='-',
-              zorder=10, lw=1, **kwargs):
+              zorder=10, lw=1, decimate=False, batch=False,
+              assume_sorted=False, **kwargs):
     """
     Easy way to plot a lot of line data at once.  Other plotting calls
     can be made by accessing individual axes in ``grid.axes``.
@@ -131,7 +144,10 @@ def plot_data(grid, plotdata, auto_spinecolor=True, marker='o', ls='-',
         Tuple format: (x, y, color, [ax inds within row/col])
         One sublist per row or column (including twins).  To skip plotting on a
         row or column, insert empty sublist at position corresponding to
-        the index of the row or column.
+        the index of the row or column.  If the ax inds are omitted or
+        ``None``, the dataset is plotted on every axis in the row/col.
+        x and y may be paths to ``.npy`` files or ``np.memmap`` arrays, see
+        Notes.
 
     Keyword Arguments
     -----------------
@@ -139,31 +155,394 @@ def plot_data(grid, plotdata, auto_spinecolor=True, marker='o', ls='-',
         If ``True``, will color each stacked axis spines and ticks with
         the color of the first plot on the axis.
     marker : string
-        Default 'o'.  Any ``matplotlib`` marker.
+        Default 'o'.  Any ``matplotlib`` marker.  Ignored if ``batch``.
     ls : string
         Default '-'. Any ``matplotlib`` linestyle.
     zorder : int
         Default 10.  The zorder of the plot.
     lw : string
         Default 1.  Linewidth in points.
+    decimate : Boolean
+        Default ``False``.  If ``True``, long datasets are reduced to the
+        first, last, minimum and maximum points per pixel of the main axis
+        before plotting, which preserves peaks.  The pixel count comes from
+        ``grid.mainax_pixels()``, so set the figure dpi to the output dpi
+        first.  Data must be sorted along the main axis to be reduced.
+        It is sliced to the main axis limits first and binned over them,
+        and reduced again when the limits change.
+    batch : Boolean
+        Default ``False``.  If ``True``, all datasets on an axis are drawn as
+        a single ``LineCollection`` with one color per dataset instead of
+        one ``Line2D`` per dataset.  Much faster for many traces, but
+        markers are not drawn.
+    assume_sorted : Boolean
+        Default ``False``.  If ``True``, data is not checked for being
+        sorted along the main axis before it is sliced to the main axis
+        limits, see Notes.  Unsorted data then loses points.
 
     Other Parameters
     ----------------
-    kwargs : passed to ``axes.plot()``
+    kwargs : passed to ``axes.plot()``, or to ``LineCollection`` if ``batch``
+
+    Notes
+    -----
+    ``.npy`` paths are opened with ``np.load(mmap_mode='r')``.  For
+    memory-mapped data sorted along the main axis, only the points inside
+    each main axis' limits (plus one on either side) are read and plotted,
+    so set the main axis limits first, e.g. ``make_grid(xlim=...)``.  If a
+    main axis is still autoscaling, the whole dataset is read.  Checking
+    that the data is sorted reads the main axis data once, in chunks;
+    pass ``assume_sorted=True`` to skip it.  Unsorted data is plotted
+    whole.
+
+    On grids with several main axes, in-memory data sorted along the main
+    axis is sliced the same way, so each column only holds its own part of
+    the data.  Sliced data follows later main axis limit changes, e.g.
+    from ``grid.set_xlim()`` or interactive zooming.
 
     """
 
+    main_is_x = grid.mainax_id == 'x'
+
+    pixels = [None] * grid.mainax_dim
+    if decimate:
+        pixels = [grid.mainax_pixels(i) for i in range(0, grid.mainax_dim)]
+
     for subgrid, subgrid_data in zip(grid.axes, plotdata):
+        subgrid_data = [(load_array(dataset[0]), load_array(dataset[1]))
+                        + tuple(dataset[2:]) for dataset in subgrid_data]
+
         for ax_ind in range(0, grid.mainax_dim):
+            ax = subgrid[ax_ind]
+            full_data = []
+            xy_data = []
+            colors = []
+
             for dataset in subgrid_data:
-                try:
-                    if ax_ind in dataset[3]:
-                        subgrid[ax_ind].plot(dataset[0], dataset[1], lw=lw,
-                                             color=dataset[2], marker=marker,
-                                             ls=ls, zorder=zorder, **kwargs)
-                except:
-                    subgrid[ax_ind].plot(dataset[0], dataset[1],
-                                         color=dataset[2], marker=marker,
-                                         zorder=zorder, lw=lw, ls=ls, **kwargs)
-        if auto_spinecolor:
-            grid.autocolor_spines(0)
+                if not _on_axis(dataset, ax_ind):
+                    continue
+
+                x, y = dataset[0], dataset[1]
+                clip = _is_clippable(grid, x, y, main_is_x, decimate,
+                                     assume_sorted)
+                full_data.append((x, y, clip))
+
+                if clip:
+                    x, y = _window(ax, x, y, main_is_x)
+
+                if decimate:
+                    x, y = decimate_xy(x, y, pixels[ax_ind],
+                                       main_is_x=main_is_x,
+                                       limits=_main_limits(ax, main_is_x))
+
+                grid.register_axcolor(ax, dataset[2])
+
+                if batch:
+                    xy_data.append(np.column_stack((x, y)))
+                    colors.append(dataset[2])
+                else:
+                    line, = ax.plot(x, y, color=dataset[2], marker=marker,
+                                    zorder=zorder, lw=lw, ls=ls, **kwargs)
+                    if clip:
+                        grid.data_clips.append(
+                            _DataClip(ax, line, full_data[-1:], main_is_x,
+                                      pixels[ax_ind]))
+
+            if xy_data:
+                collection = LineCollection(xy_data, colors=colors,
+                                            linewidths=lw, linestyles=ls,
+                                            zorder=zorder, **kwargs)
+                ax.add_collection(collection)
+                ax.autoscale_view()
+
+                if any(clip for _, _, clip in full_data):
+                    grid.data_clips.append(
+                        _DataClip(ax, collection, full_data, main_is_x,
+                                  pixels[ax_ind]))
+
+    if auto_spinecolor:
+        grid.autocolor_spines(0)
+
+
+def plot_frame(grid, frame, rows=None, twins=None, columns=None,
+               colors=None, auto_spinecolor=True, marker='o', ls='-',
+               zorder=10, lw=1, **kwargs):
+    """
+    Plot the columns of a ``pandas.DataFrame`` against its index, which is
+    the main axis data (e.g. depth or age).
+
+    Data is passed to the artists as views of the frame's arrays, not
+    copies.  On grids with several main axes, a sorted index is searched
+    once per main axis for its limits, and every frame column is sliced to
+    each main axis by view with the same windows.  As with ``plot_data()``, the slices follow
+    later main axis limit changes.
+
+    Parameters
+    ----------
+    grid : ``XGrid`` or ``YGrid`` instance
+        The Grid of axes on which to plot.
+    frame : ``pandas.DataFrame``
+        Or any object with ``index`` and ``columns`` attributes whose items
+        convert to 1D arrays with ``numpy.asarray()``.
+
+    Keyword Arguments
+    -----------------
+    rows : dict
+        Default ``None``.  Maps frame column names to the index of the
+        stacked row (``XGrid``) or column (``YGrid``) to plot them on.
+        If ``rows`` and ``twins`` are both ``None``, frame columns are
+        plotted on stacked rows (columns) 0, 1, 2, ... in order.
+    twins : dict
+        Default ``None``.  Maps frame column names to the stacked row
+        (column) whose twin to plot them on: an int for the first twin of
+        that row (column), or a (row, twinstance) tuple.
+    columns : dict
+        Default ``None``.  Maps frame column names to lists of main axis
+        indices.  Columns not listed are plotted on all main axes.
+    colors : dict
+        Default ``None``.  Maps frame column names to colors.  Columns not
+        listed take colors from the property cycle in order.
+    auto_spinecolor : Boolean
+        Default ``True``.  If ``True``, will color each stacked axis spines
+        and ticks with the color of the first plot on the axis.
+    marker, ls, zorder, lw
+        As for ``plot_data()``.
+
+    Other Parameters
+    ----------------
+    kwargs : passed to ``axes.plot()``
+
+    """
+
+    if rows is None and twins is None:
+        rows = dict((name, i) for i, name in enumerate(frame.columns))
+
+    targets = [(name, row) for name, row in (rows or {}).items()]
+    for name, twin in (twins or {}).items():
+        targets.append((name, _twin_index(grid, twin)))
+
+    colors = colors or {}
+    columns = columns or {}
+    main_is_x = grid.mainax_id == 'x'
+
+    main = np.asarray(frame.index)
+    windows, is_sorted = _main_windows(grid, main, main_is_x)
+
+    # As in ``plot_data()``, only grids with several main axes are sliced
+    clip = is_sorted and grid.mainax_dim > 1
+
+    for i, (name, row) in enumerate(targets):
+        values = np.asarray(frame[name])
+        color = colors.get(name, 'C%d' % (i % 10))
+        ax_inds = columns.get(name, range(0, grid.mainax_dim))
+
+        for ax_ind in ax_inds:
+            ax = grid.axes[row][ax_ind]
+            window = windows[ax_ind] if clip else slice(None)
+
+            if main_is_x:
+                xy = (main[window], values[window])
+            else:
+                xy = (values[window], main[window])
+
+            line, = ax.plot(xy[0], xy[1], color=color, marker=marker,
+                            zorder=zorder, lw=lw, ls=ls, **kwargs)
+            grid.register_axcolor(ax, color)
+
+            if clip:
+                if main_is_x:
+                    full = (main, values, True)
+                else:
+                    full = (values, main, True)
+                grid.data_clips.append(_DataClip(ax, line, [full],
+                                                 main_is_x))
+
+    if auto_spinecolor:
+        grid.autocolor_spines(0)
+
+
+def _main_windows(grid, main, main_is_x):
+    """
+    The slice of ``main`` inside the limits of each main axis of ``grid``,
+    from ``window_slice()``.
+
+    Returns
+    -------
+    windows : list of slices
+        One per main axis.  Autoscaling main axes, and all main axes if
+        ``main`` is unsorted, get the whole array.
+    is_sorted : Boolean
+        Whether ``main`` is sorted in ascending or descending order.
+
+    """
+
+    windows = [slice(None)] * grid.mainax_dim
+
+    if not is_monotonic(main):
+        return windows, False
+
+    for i, ax in enumerate(grid.axes[0]):
+        limits = _main_limits(ax, main_is_x)
+        if limits is not None:
+            windows[i] = window_slice(main, *limits)
+
+    return windows, True
+
+
+def _twin_index(grid, twin):
+    """
+    Storage index in ``grid.axes`` of the ``twinstance``th twin of a
+    stacked row (column).
+
+    """
+
+    try:
+        row, twinstance = twin
+    except TypeError:
+        row, twinstance = twin, 0
+
+    storage = grid.twin_storage.get(row, [])
+
+    if twinstance >= len(storage):
+        raise ValueError('No twin ' + str(twinstance) + ' of ' +
+                         str(row) + ' found')
+
+    return storage[twinstance]
+
+
+class _DataClip(object):
+    """
+    Keep a plotted line or ``LineCollection`` showing only the data inside
+    the main axis limits of its axes, re-slicing the full data whenever the
+    limits change.
+
+    """
+
+    def __init__(self, ax, artist, datasets, main_is_x, nbins=None):
+        """
+        Parameters
+        ----------
+        ax : ``matplotlib Axes`` instance
+            The axes ``artist`` is on.
+        artist : ``Line2D`` or ``LineCollection`` instance
+            The artist showing ``datasets``.
+        datasets : list of tuples
+            (x, y, clip) for each line in ``artist``, with the full data.
+            Lines with ``clip`` ``False`` are always shown whole.
+        main_is_x : Boolean
+            Whether x (``XGrid``) or y (``YGrid``) is the main axis.
+        nbins : int
+            Default ``None``.  If given, clipped data is also decimated to
+            ``nbins`` bins.
+
+        """
+
+        self.ax = ax
+        self.artist = artist
+        self.datasets = datasets
+        self.main_is_x = main_is_x
+        self.nbins = nbins
+
+        if main_is_x:
+            signal = 'xlim_changed'
+        else:
+            signal = 'ylim_changed'
+
+        self.cid = ax.callbacks.connect(signal, self.update)
+
+    def disconnect(self):
+        """
+        Stop following limit changes.
+
+        """
+
+        self.ax.callbacks.disconnect(self.cid)
+
+    def update(self, ax=None):
+        """
+        Re-slice the full data to the current main axis limits.
+
+        """
+
+        xy_data = []
+        for x, y, clip in self.datasets:
+            if clip:
+                x, y = _window(self.ax, x, y, self.main_is_x)
+                if self.nbins is not None:
+                    x, y = decimate_xy(x, y, self.nbins,
+                                       main_is_x=self.main_is_x,
+                                       limits=_main_limits(self.ax,
+                                                           self.main_is_x))
+            xy_data.append((x, y))
+
+        if isinstance(self.artist, LineCollection):
+            self.artist.set_segments([np.column_stack(xy)
+                                      for xy in xy_data])
+        else:
+            self.artist.set_data(*xy_data[0])
+
+
+def _is_clippable(grid, x, y, main_is_x, decimate=False,
+                  assume_sorted=False):
+    """
+    Check if a dataset can be sliced to main axis limits: memory-mapped
+    data always, in-memory data if the grid has several main axes or the
+    data is to be decimated.  The data must also be sorted along the main
+    axis, which is checked unless ``assume_sorted``.
+
+    """
+
+    memmapped = isinstance(x, np.memmap) or isinstance(y, np.memmap)
+
+    if not memmapped and grid.mainax_dim < 2 and not decimate:
+        return False
+
+    main = x if main_is_x else y
+    if np.ndim(main) != 1 or len(main) < 2:
+        return False
+
+    return assume_sorted or is_monotonic(main)
+
+
+def _on_axis(dataset, ax_ind):
+    """
+    Check if ``dataset`` is to be plotted on the axis at ``ax_ind``.
+
+    """
+
+    if len(dataset) < 4 or dataset[3] is None:
+        return True
+
+    return ax_ind in dataset[3]
+
+
+def _main_limits(ax, main_is_x):
+    """
+    The main axis limits of ``ax``, or ``None`` if it is autoscaling.
+
+    """
+
+    if main_is_x:
+        if ax.get_autoscalex_on():
+            return None
+        return ax.get_xlim()
+
+    if ax.get_autoscaley_on():
+        return None
+    return ax.get_ylim()
+
+
+def _window(ax, x, y, main_is_x):
+    """
+    Slice ``x``, ``y`` to the main axis limits of ``ax``, unless the main
+    axis is autoscaling.
+
+    """
+
+    limits = _main_limits(ax, main_is_x)
+    if limits is None:
+        return x, y
+
+    window = window_slice(x if main_is_x else y, *limits)
+
+    return x[window], y[window]
@@ -0,0 +1,161 @@
+from __future__ import division, print_function, absolute_import
+import numpy as np
+from matplotlib import rcParams
+
+
+class GridLayout(object):
+    """
+    Precomputed placement of the cells of an ``XGrid`` or ``YGrid``.
+
+    Every cell span and rectangle is computed in one numpy pass from the
+    ratio lists, without a ``Figure``, so layouts can be validated, compared
+    and cached before any axes are made.
+
+    """
+
+    def __init__(self, xratios, yratios):
+        """
+        Validate ratios and compute the grid edges of every row and column.
+
+        Parameters
+        ----------
+        xratios : int or list of ints
+            The relative sizes of the columns.
+        yratios : int or list of ints
+            The relative sizes of the rows.
+
+        """
+
+        self.xratios = self._ratio_array(xratios, 'xratios')
+        self.yratios = self._ratio_array(yratios, 'yratios')
+
+        self.numcols = len(self.xratios)
+        self.numrows = len(self.yratios)
+
+        # Grid-unit edges of every column (left to right) and row (top down)
+        self.xedges = np.concatenate(([0], np.cumsum(self.xratios)))
+        self.yedges = np.concatenate(([0], np.cumsum(self.yratios)))
+
+        self.gridcols = int(self.xedges[-1])
+        self.gridrows = int(self.yedges[-1])
+
+        self.key = (tuple(self.xratios.tolist()),
+                    tuple(self.yratios.tolist()))
+
+    def __eq__(self, other):
+        return isinstance(other, GridLayout) and self.key == other.key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return 'GridLayout(xratios=%s, yratios=%s)' % (list(self.key[0]),
+                                                       list(self.key[1]))
+
+    def spans(self):
+        """
+        Grid-unit spans of every cell.
+
+        Returns
+        -------
+        spans : (numrows, numcols, 4) array of ints
+            Row start, row stop, column start, column stop of each cell,
+            suitable for slicing a ``matplotlib GridSpec``.
+
+        """
+
+        spans = np.empty((self.numrows, self.numcols, 4), dtype=int)
+        spans[..., 0] = self.yedges[:-1, None]
+        spans[..., 1] = self.yedges[1:, None]
+        spans[..., 2] = self.xedges[None, :-1]
+        spans[..., 3] = self.xedges[None, 1:]
+
+        return spans
+
+    def cell_rects(self, left=None, bottom=None, right=None, top=None,
+                   wspace=None, hspace=None):
+        """
+        Figure-fraction rectangles of every cell, matching the positions
+        ``matplotlib`` gives axes made on the same grid.
+
+        Parameters
+        ----------
+        left, bottom, right, top, wspace, hspace : float
+            Default ``None``.  Subplot parameters; any not provided default
+            to the matplotlib rc ``figure.subplot.*`` values.
+
+        Returns
+        -------
+        rects : (numrows, numcols, 4) array of floats
+            The (x0, y0, width, height) of each cell in figure coordinates.
+
+        """
+
+        pars = dict(left=left, bottom=bottom, right=right, top=top,
+                    wspace=wspace, hspace=hspace)
+        for key, val in pars.items():
+            if val is None:
+                pars[key] = rcParams['figure.subplot.' + key]
+
+        # Size of one grid unit and of the gap between units
+        unit_w = ((pars['right'] - pars['left']) /
+                  (self.gridcols + pars['wspace'] * (self.gridcols - 1)))
+        unit_h = ((pars['top'] - pars['bottom']) /
+                  (self.gridrows + pars['hspace'] * (self.gridrows - 1)))
+        step_w = unit_w * (1 + pars['wspace'])
+        step_h = unit_h * (1 + pars['hspace'])
+
+        x0 = pars['left'] + self.xedges[:-1] * step_w
+        x1 = pars['left'] + (self.xedges[1:] - 1) * step_w + unit_w
+        y1 = pars['top'] - self.yedges[:-1] * step_h
+        y0 = pars['top'] - (self.yedges[1:] - 1) * step_h - unit_h
+
+        rects = np.empty((self.numrows, self.numcols, 4))
+        rects[..., 0] = x0[None, :]
+        rects[..., 1] = y0[:, None]
+        rects[..., 2] = (x1 - x0)[None, :]
+        rects[..., 3] = (y1 - y0)[:, None]
+
+        return rects
+
+    def figure_rects(self, fig):
+        """
+        Cell rectangles using the current subplot parameters of ``fig``.
+
+        Parameters
+        ----------
+        fig : ``matplotlib Figure`` instance
+
+        Returns
+        -------
+        rects : (numrows, numcols, 4) array of floats
+            See ``self.cell_rects()``.
+
+        """
+
+        sp = fig.subplotpars
+
+        return self.cell_rects(left=sp.left, bottom=sp.bottom, right=sp.right,
+                               top=sp.top, wspace=sp.wspace, hspace=sp.hspace)
+
+    def _ratio_array(self, ratios, name):
+        """
+        Turn ``ratios`` into a 1D array of positive ints.
+
+        """
+
+        rarray = np.atleast_1d(np.asarray(ratios))
+
+        if rarray.ndim != 1 or rarray.size == 0:
+            raise ValueError(name + ' must be an int or a flat list of ints')
+        if not np.issubdtype(rarray.dtype, np.integer):
+            if not np.all(np.mod(rarray, 1) == 0):
+                raise ValueError(name + ' must be whole numbers')
+            rarray = rarray.astype(int)
+        if np.any(rarray < 1):
+            raise ValueError(name + ' must all be >= 1')
+
+        return rarray
@@ -0,0 +1,310 @@
+from __future__ import division, print_function, absolute_import
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from matplotlib.backends.backend_pdf import PdfPages
+from .gridclass import Grid
+from .gridwrapper import plot_data
+from .spec import build_grid
+
+
+RenderResult = namedtuple('RenderResult', ['index', 'filename', 'seconds',
+                                           'error'])
+RenderResult.__doc__ = """
+Outcome of rendering one spec.
+
+``index`` is the position of the spec in the input, ``filename`` its output
+file, ``seconds`` the wall time spent building, plotting and saving, and
+``error`` ``None`` or the formatted traceback of the failure.
+"""
+
+# Job keys that are not grid spec keys
+_RENDER_KEYS = ('filename', 'format', 'dpi', 'savefig_kwargs', 'plotdata',
+                'plot_kwargs')
+
+
+class Renderer(object):
+    """
+    Pool of long-lived worker processes that render grid specs to image
+    files.
+
+    Each worker imports matplotlib and loads its font cache once, when the
+    pool starts, and then renders any number of figures.  Use as a context
+    manager, or call ``self.close()`` when done.
+
+    If a worker dies, e.g. is killed for running out of memory, the specs
+    it and the other workers were rendering fail with an error, and the
+    pool is restarted for the next call.
+
+    """
+
+    def __init__(self, processes=None):
+        """
+        Parameters
+        ----------
+        processes : int
+            Default ``None``, one worker per CPU.  If 0, specs are rendered
+            in the calling process without a pool.
+
+        """
+
+        self.processes = processes
+
+        if processes == 0:
+            self._pool = None
+        else:
+            self._pool = self._start_pool()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the worker processes.
+
+        """
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _start_pool(self):
+        return ProcessPoolExecutor(self.processes, initializer=_warm_worker)
+
+    def render_many(self, specs, chunksize=1):
+        """
+        Render specs across the worker pool.
+
+        Parameters
+        ----------
+        specs : iterable of dicts
+            See ``render_many()``.
+        chunksize : int
+            Default 1.  The number of specs sent to a worker at a time.
+
+        Returns
+        -------
+        results : list of ``RenderResult``
+            One per spec, in input order.  Failed specs have ``error`` set;
+            they do not stop the rest of the batch.
+
+        """
+
+        jobs = list(enumerate(specs))
+
+        if self._pool is None:
+            return [_render_spec(job) for job in jobs]
+
+        chunks = [jobs[i:i + chunksize]
+                  for i in range(0, len(jobs), chunksize)]
+
+        futures = []
+        for chunk in chunks:
+            try:
+                futures.append(self._pool.submit(_render_chunk, chunk))
+            except BrokenProcessPool:
+                futures.append(None)
+
+        results = []
+        broken = False
+
+        for chunk, future in zip(chunks, futures):
+            try:
+                if future is None:
+                    raise BrokenProcessPool('Worker pool already broken')
+                results.extend(future.result())
+            except Exception as err:
+                # The chunk never came back, e.g. a worker was killed
+                broken = broken or isinstance(err, BrokenProcessPool)
+                error = traceback.format_exc()
+                results.extend(RenderResult(index, spec.get('filename'), 0.0,
+                                            error) for index, spec in chunk)
+
+        if broken:
+            self._pool.shutdown(wait=True)
+            self._pool = self._start_pool()
+
+        return results
+
+
+def render_many(specs, processes=None, chunksize=1):
+    """
+    Render many grids to files in parallel.
+
+    Parameters
+    ----------
+    specs : iterable of dicts
+        One dict per figure.  Keys are those of a grid spec (see
+        ``validate_spec()``), built with ``build_grid()``, plus:
+
+        ``filename``
+            Required.  The output path.
+        ``plotdata``
+            Optional.  Passed to ``plot_data()``.
+        ``plot_kwargs``
+            Optional dict.  Keyword arguments for ``plot_data()``.
+        ``format``, ``dpi``
+            Optional.  Passed to ``savefig()``; the format defaults to the
+            ``filename`` extension (png, pdf, svg, ...).
+        ``savefig_kwargs``
+            Optional dict.  Any other ``savefig()`` keyword arguments.
+
+        Grids are always built without pyplot.
+    processes : int
+        Default ``None``, one worker per CPU.  If 0, render in this process.
+    chunksize : int
+        Default 1.  The number of specs sent to a worker at a time.
+
+    Returns
+    -------
+    results : list of ``RenderResult``
+        (index, filename, seconds, error) for each spec, in input order.
+        ``error`` is ``None`` on success, otherwise the traceback string.
+
+    """
+
+    with Renderer(processes) as renderer:
+        return renderer.render_many(specs, chunksize=chunksize)
+
+
+def export_pdf(path, pages, metadata=None, **kwargs):
+    """
+    Write grids to a multi-page PDF, one page at a time.
+
+    Each page is built, saved and closed before the next is built, so
+    memory use does not grow with the number of pages.
+
+    Parameters
+    ----------
+    path : string, path or file-like
+        The PDF to write.
+    pages : iterable
+        One item per page, each one of:
+
+        * a grid spec dict, built with ``build_grid()``
+        * a (spec, plotdata) or (spec, plotdata, plot_kwargs) tuple; the
+          data is drawn with ``plot_data()``
+        * a callable taking no arguments and returning a grid
+        * an ``XGrid`` or ``YGrid``
+
+        Every grid is closed once its page is written, including grids
+        passed in directly.
+    metadata : dict
+        Default ``None``.  PDF document metadata, passed to ``PdfPages``.
+    **kwargs
+        Passed to ``savefig()`` for every page.  Pages with a
+        rasterization policy default to its dpi, as with
+        ``Grid.savefig()``.
+
+    Returns
+    -------
+    count : int
+        The number of pages written.
+
+    """
+
+    count = 0
+
+    with PdfPages(path, metadata=metadata) as pdf:
+        for page in pages:
+            grid = _page_grid(page)
+            try:
+                grid.savefig(pdf, **dict(kwargs, format='pdf'))
+            finally:
+                grid.close()
+            count += 1
+
+    return count
+
+
+def _page_grid(page):
+    """
+    Build the grid for one ``export_pdf()`` page.
+
+    """
+
+    if isinstance(page, Grid):
+        return page
+
+    if isinstance(page, dict):
+        return build_grid(page)
+
+    if isinstance(page, tuple):
+        grid = build_grid(page[0])
+        try:
+            plot_kwargs = page[2] if len(page) > 2 else {}
+            plot_data(grid, page[1], **plot_kwargs)
+        except Exception:
+            grid.close()
+            raise
+        return grid
+
+    if callable(page):
+        return page()
+
+    raise TypeError('Cannot make a page from ' + repr(type(page)))
+
+
+def _warm_worker():
+    """
+    Load matplotlib, the Agg backend and the font cache in a new worker.
+
+    """
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(1, 1))
+    FigureCanvasAgg(fig)
+    fig.text(0.5, 0.5, 'trendvis')
+    fig.canvas.draw()
+
+
+def _render_chunk(jobs):
+    """
+    Render several specs in one worker call.
+
+    """
+
+    return [_render_spec(job) for job in jobs]
+
+
+def _render_spec(job):
+    """
+    Build, plot and save one spec.  Errors are caught and returned.
+
+    """
+
+    index, spec = job
+    filename = spec.get('filename')
+    start = time.perf_counter()
+    grid = None
+
+    try:
+        grid = build_grid(dict((key, val) for key, val in spec.items()
+                               if key not in _RENDER_KEYS))
+
+        if spec.get('plotdata') is not None:
+            plot_data(grid, spec['plotdata'], **spec.get('plot_kwargs', {}))
+
+        savefig_kwargs = dict(spec.get('savefig_kwargs', {}))
+        for key in ('format', 'dpi'):
+            if key in spec:
+                savefig_kwargs[key] = spec[key]
+
+        grid.savefig(filename, **savefig_kwargs)
+
+    except Exception:
+        error = traceback.format_exc()
+    else:
+        error = None
+    finally:
+        if grid is not None:
+            grid.close()
+
+    return RenderResult(index, filename, time.perf_counter() - start, error)
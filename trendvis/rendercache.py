@@ -0,0 +1,313 @@
+from __future__ import division, print_function, absolute_import
+import hashlib
+import importlib.metadata
+import io
+import json
+import os
+import tempfile
+import numpy as np
+from .dataprep import load_array
+from .spec import build_grid, spec_hash
+
+
+class RenderCache(object):
+    """
+    Disk cache of rendered figures, keyed by content.
+
+    The key of a figure is a hash of its grid spec, the bytes of its plot
+    data, its output format and dpi, and any plotting and saving options,
+    along with the matplotlib and trendvis versions and the current
+    rcParams, so upgrades and style changes never return stale figures.
+    A cache hit returns the stored file contents without building a grid.
+
+    Files are written to a temporary file and moved into place, so readers
+    never see partial files, and any number of processes can share a cache
+    directory.  When the cache grows past ``max_bytes``, the least recently
+    used files are deleted.
+
+    """
+
+    def __init__(self, directory, max_bytes=512 * 2**20):
+        """
+        Parameters
+        ----------
+        directory : string or path
+            Where to keep cached files.  Created if needed.
+        max_bytes : int
+            Default 512 MiB.  The size the cache is trimmed back to after
+            each write.
+
+        """
+
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+    def key(self, spec, plotdata=None, format='png', dpi=None,
+            plot_kwargs=None, savefig_kwargs=None):
+        """
+        The cache key of a figure.
+
+        Parameters are as for ``self.render()``.
+
+        Returns
+        -------
+        key : string
+            Hex SHA-256 digest.
+
+        """
+
+        hasher = hashlib.sha256()
+        hasher.update(spec_hash(spec).encode('utf-8'))
+
+        options = [format, dpi, plot_kwargs or {}, savefig_kwargs or {}]
+        hasher.update(json.dumps(options, sort_keys=True,
+                                 default=_json_default).encode('utf-8'))
+        hasher.update(_environment().encode('utf-8'))
+
+        if plotdata is not None:
+            _hash_plotdata(hasher, plotdata)
+
+        return hasher.hexdigest()
+
+    def get(self, key, format='png'):
+        """
+        The cached file contents for ``key``, or ``None`` on a miss.
+
+        """
+
+        path = self._path(key, format)
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+
+        # Mark as recently used; the file may be evicted meanwhile
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return data
+
+    def put(self, key, data, format='png'):
+        """
+        Store ``data`` under ``key``, then trim the cache to
+        ``self.max_bytes``.
+
+        """
+
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key, format))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self.evict()
+
+    def render(self, spec, plotdata=None, format='png', dpi=None,
+               plot_kwargs=None, savefig_kwargs=None):
+        """
+        Get a rendered figure, from the cache if possible.
+
+        Parameters
+        ----------
+        spec : dict
+            The grid spec, see ``trendvis.validate_spec()``.
+        plotdata : list of lists of tuples
+            Default ``None``.  Passed to ``plot_data()``.
+        format : string
+            Default 'png'.  The output format.
+        dpi : int
+            Default ``None``, the figure dpi.  The output dpi.
+        plot_kwargs : dict
+            Default ``None``.  Keyword arguments for ``plot_data()``.
+        savefig_kwargs : dict
+            Default ``None``.  Other keyword arguments for ``savefig()``.
+
+        Returns
+        -------
+        data : bytes
+            The file contents.
+
+        """
+
+        key = self.key(spec, plotdata, format, dpi, plot_kwargs,
+                       savefig_kwargs)
+
+        data = self.get(key, format)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+
+        # Imported here so cache hits never load the plotting code
+        from .gridwrapper import plot_data
+
+        grid = build_grid(spec)
+        try:
+            if plotdata is not None:
+                plot_data(grid, plotdata, **(plot_kwargs or {}))
+
+            buf = io.BytesIO()
+            grid.savefig(buf, format=format, dpi=dpi,
+                         **(savefig_kwargs or {}))
+        finally:
+            grid.close()
+
+        data = buf.getvalue()
+        self.put(key, data, format)
+
+        return data
+
+    def evict(self):
+        """
+        Delete least recently used files until the cache fits in
+        ``self.max_bytes``.
+
+        """
+
+        entries = []
+        total = 0
+
+        for name in os.listdir(self.directory):
+            if name.startswith('.tmp-'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Delete all cached files and reset the hit and miss counts.  Files
+        still being written by ``self.put()`` are kept.
+
+        """
+
+        for name in os.listdir(self.directory):
+            # Leave other processes' in-progress writes alone
+            if name.startswith('.tmp-'):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, format):
+        return os.path.join(self.directory, key + '.' + format)
+
+
+# rcParams that do not change saved figures
+_UI_PARAMS = ('backend', 'interactive', 'keymap.', 'macosx.',
+              'savefig.directory', 'tk.', 'toolbar', 'webagg.')
+
+
+def _environment():
+    """
+    The matplotlib and trendvis versions and a fingerprint of the current
+    rcParams, as a string.
+
+    """
+
+    import matplotlib
+    from . import __version__
+
+    try:
+        mpl_version = importlib.metadata.version('matplotlib')
+    except importlib.metadata.PackageNotFoundError:
+        mpl_version = matplotlib.__version__
+
+    rc = matplotlib.rcParams
+    params = [(key, repr(rc[key])) for key in sorted(rc)
+              if not key.startswith(_UI_PARAMS)]
+
+    return json.dumps([mpl_version, __version__, params])
+
+
+def _hash_plotdata(hasher, plotdata):
+    """
+    Add the arrays and settings of every dataset in ``plotdata`` to
+    ``hasher``.
+
+    """
+
+    for subgrid_data in plotdata:
+        hasher.update(b'[')
+        for dataset in subgrid_data:
+            for array in dataset[:2]:
+                array = np.ascontiguousarray(load_array(array))
+                hasher.update(json.dumps([array.dtype.str,
+                                          array.shape]).encode('utf-8'))
+                hasher.update(array.view(np.uint8).reshape(-1))
+
+            hasher.update(json.dumps(_plain_list(dataset[2:]),
+                                     sort_keys=True,
+                                     default=_json_default).encode('utf-8'))
+        hasher.update(b']')
+
+
+def _plain_list(items):
+    """
+    Colors and axis indices of a dataset as JSON-compatible values.
+
+    """
+
+    plain = []
+    for item in items:
+        if isinstance(item, (tuple, list, np.ndarray)):
+            item = np.asarray(item).tolist()
+        plain.append(item)
+
+    return plain
+
+
+def _json_default(obj):
+    """
+    JSON-compatible stand-in for an option value ``json`` cannot encode,
+    e.g. numpy arrays and scalars, or a ``Bbox`` for ``bbox_inches``.
+
+    Other objects fall back to their type and ``repr()``; a ``repr()`` that
+    differs between equal objects only causes cache misses.
+
+    """
+
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+
+    if hasattr(obj, 'get_points'):
+        # Bbox and other matplotlib bounding boxes
+        return [type(obj).__name__, np.asarray(obj.get_points()).tolist()]
+
+    return [type(obj).__name__, repr(obj)]
@@ -0,0 +1,117 @@
+from __future__ import division, print_function, absolute_import
+import pickle
+import threading
+from collections import OrderedDict
+import numpy as np
+from .gridwrapper import make_grid
+
+
+class GridCache(object):
+    """
+    Bounded LRU cache of formatted, empty grid skeletons.
+
+    Grids are keyed by their ``make_grid()`` layout arguments.  The first
+    request for a layout builds it with ``make_grid()`` and stores a pickled
+    copy; later requests unpickle a clone, skipping axes construction,
+    twinning, tick formatting, spine shifting and cleanup.
+
+    """
+
+    def __init__(self, maxsize=16):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            Default 16.  The maximum number of layouts kept.  The least
+            recently used layout is dropped when the cache is full.
+
+        """
+
+        if maxsize < 1:
+            raise ValueError('maxsize must be >= 1')
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._skeletons = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._skeletons)
+
+    def clear(self):
+        """
+        Drop all cached skeletons and reset the hit and miss counts.
+
+        """
+
+        with self._lock:
+            self._skeletons.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_grid(self, xratios, yratios, figsize, xticks, yticks, main_axis,
+                 xlim=None, ylim=None, to_twin=None, axis_shift=None,
+                 twinax_shift=None, tick_fontsize=10, use_pyplot=False):
+        """
+        Get a new formatted, empty grid for the given layout.
+
+        Parameters are the same as for ``make_grid()``, minus ``plotdata``
+        and plotting keyword arguments.  ``use_pyplot`` defaults to
+        ``False``.
+
+        Returns
+        -------
+        grid : ``XGrid`` or ``YGrid`` instance
+            A grid owned by the caller; changing it does not affect the
+            cache.
+
+        """
+
+        key = _freeze((xratios, yratios, figsize, xticks, yticks,
+                       main_axis.lower()[0], xlim, ylim, to_twin, axis_shift,
+                       twinax_shift, tick_fontsize, use_pyplot))
+
+        with self._lock:
+            skeleton = self._skeletons.get(key)
+            if skeleton is not None:
+                self._skeletons.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if skeleton is not None:
+            return pickle.loads(skeleton)
+
+        grid = make_grid(xratios, yratios, figsize, xticks, yticks, main_axis,
+                         xlim=xlim, ylim=ylim, to_twin=to_twin,
+                         axis_shift=axis_shift, twinax_shift=twinax_shift,
+                         tick_fontsize=tick_fontsize, use_pyplot=use_pyplot)
+        skeleton = pickle.dumps(grid, pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._skeletons[key] = skeleton
+            self._skeletons.move_to_end(key)
+            while len(self._skeletons) > self.maxsize:
+                self._skeletons.popitem(last=False)
+
+        return grid
+
+
+def _freeze(item):
+    """
+    Turn nested lists, tuples and arrays into nested tuples for hashing.
+
+    """
+
+    if isinstance(item, np.ndarray):
+        item = item.tolist()
+
+    if isinstance(item, (list, tuple)):
+        return tuple(_freeze(i) for i in item)
+
+    if isinstance(item, np.generic):
+        return item.item()
+
+    return item
@@ -0,0 +1,515 @@
+from __future__ import division, print_function, absolute_import
+import hashlib
+import json
+import numpy as np
+
+
+SPEC_VERSION = 1
+
+# Every spec key and its default.  ``None`` defaults leave the matplotlib or
+# ``XGrid``/``YGrid`` default in place.
+_DEFAULTS = {'version': SPEC_VERSION,
+             'main_axis': None,
+             'stack_ratios': None,
+             'main_ratios': [1],
+             'figsize': None,
+             'startside': None,
+             'alternate_sides': True,
+             'onespine_forboth': False,
+             'twins': [],
+             'spacing': None,
+             'main_ticks': None,
+             'stack_ticks': None,
+             'main_log': [],
+             'stack_log': [],
+             'tick_fontsize': 10,
+             'main_limits': None,
+             'stack_limits': None,
+             'axis_shift': None,
+             'twin_shift': None,
+             'spinewidth': None,
+             'cleanup': True,
+             'labels': None,
+             'label_fontsize': None,
+             'labelpad': 12,
+             'frames': [],
+             'cutouts': [],
+             'bars': [],
+             'bar_collections': []}
+
+_BAR_DEFAULTS = {'ll': None,
+                 'ur': None,
+                 'limits': None,
+                 'orientation': 'vertical',
+                 'zorder': -1,
+                 'kwargs': {}}
+
+_BAR_COLLECTION_DEFAULTS = {'ll': None,
+                            'ur': None,
+                            'limits': None,
+                            'events': None,
+                            'orientation': 'vertical',
+                            'zorder': -1,
+                            'event_kwargs': {},
+                            'kwargs': {}}
+
+
+def validate_spec(spec):
+    """
+    Check a grid spec and fill in its defaults.
+
+    A spec is a JSON-compatible dict describing a grid: its layout,
+    twins, spine shifts, ticks, limits, labels, frames, cutouts and bars.
+    Only ``main_axis`` and ``stack_ratios`` are required.
+
+    ``main_axis``
+        'x' for an ``XGrid``, 'y' for a ``YGrid``.
+    ``stack_ratios``, ``main_ratios``
+        Relative sizes of the stacked rows (columns) and of the main axis
+        columns (rows).
+    ``figsize``, ``startside``, ``alternate_sides``, ``onespine_forboth``
+        ``XGrid``/``YGrid`` arguments.
+    ``twins``
+        Indices of the stacked axes to twin, in order.
+    ``spacing``
+        ``hspace`` (``XGrid``) or ``wspace`` (``YGrid``).
+    ``main_ticks``, ``stack_ticks``
+        One [major, minor] multiple pair or ``None`` per main axis and per
+        stacked axis (twins included), see ``set_all_ticknums()``.
+    ``main_log``, ``stack_log``
+        Indices of log-scaled main and stacked axes.
+    ``tick_fontsize``
+        Tick label size.
+    ``main_limits``, ``stack_limits``
+        One [min, max] or ``None`` per main and stacked axis.
+    ``axis_shift``, ``twin_shift``
+        Relative spine shifts, see ``move_spines()``.
+    ``spinewidth``, ``cleanup``
+        Spine width, and whether to ``cleanup_grid()``.
+    ``labels``, ``label_fontsize``, ``labelpad``
+        One label or ``None`` per stacked axis, and their size and padding.
+    ``frames``, ``cutouts``
+        Lists of ``draw_frame()`` and ``draw_cutout()`` keyword arguments.
+    ``bars``
+        List of dicts with ``ll`` and ``ur``, the [stack index, main index]
+        of the axes holding each corner, ``limits``, and optionally
+        ``orientation``, ``zorder`` and ``kwargs`` for ``draw_bar()``.
+    ``bar_collections``
+        List of dicts for ``draw_bars()``, with ``ll`` and ``ur`` as for
+        ``bars``, ``limits`` (a list of [min, max]) and/or ``events`` (a
+        list of positions), and optionally ``orientation``, ``zorder``,
+        ``event_kwargs`` and ``kwargs``.
+
+    Parameters
+    ----------
+    spec : dict
+        The grid spec.
+
+    Returns
+    -------
+    spec : dict
+        A new, complete spec with lists in place of tuples.
+
+    """
+
+    unknown = set(spec) - set(_DEFAULTS)
+    if unknown:
+        raise ValueError('Unknown spec keys: ' + ', '.join(sorted(unknown)))
+
+    full = _plain(dict(_DEFAULTS, **spec))
+
+    if full['version'] != SPEC_VERSION:
+        raise ValueError('Unsupported spec version ' + repr(full['version']))
+
+    if full['main_axis'] not in ('x', 'y'):
+        raise ValueError("main_axis must be 'x' or 'y'")
+
+    for key in ('stack_ratios', 'main_ratios'):
+        if isinstance(full[key], (int, float)):
+            full[key] = [full[key]]
+        if not full[key]:
+            raise ValueError(key + ' must be given')
+
+    stack_dim = len(full['stack_ratios'])
+    main_dim = len(full['main_ratios'])
+
+    for ind in full['twins']:
+        _check_index('twins', ind, stack_dim)
+
+    total_dim = stack_dim + len(full['twins'])
+
+    for key, dim in (('main_ticks', main_dim), ('stack_ticks', total_dim),
+                     ('main_limits', main_dim), ('stack_limits', total_dim),
+                     ('labels', total_dim)):
+        if full[key] is not None and len(full[key]) != dim:
+            raise ValueError(key + ' needs ' + str(dim) + ' items, got ' +
+                             str(len(full[key])))
+
+    for key, dim in (('main_log', main_dim), ('stack_log', total_dim)):
+        for ind in full[key]:
+            _check_index(key, ind, dim)
+
+    bars = []
+    for bar in full['bars']:
+        bar = _fill_bar('bar', bar, _BAR_DEFAULTS, total_dim, main_dim)
+
+        if bar['limits'] is None or len(bar['limits']) != 2:
+            raise ValueError('bar limits must be [min, max]')
+
+        bars.append(bar)
+    full['bars'] = bars
+
+    collections = []
+    for bar_set in full['bar_collections']:
+        bar_set = _fill_bar('bar collection', bar_set,
+                            _BAR_COLLECTION_DEFAULTS, total_dim, main_dim)
+
+        if bar_set['limits'] is None and bar_set['events'] is None:
+            raise ValueError('bar collection needs limits or events')
+        limits = bar_set['limits']
+        if limits is not None and any(len(lim) != 2 for lim in limits):
+            raise ValueError('bar collection limits must be [min, max]')
+
+        collections.append(bar_set)
+    full['bar_collections'] = collections
+
+    return full
+
+
+def _fill_bar(kind, bar, defaults, total_dim, main_dim):
+    """
+    Check the keys and corner axes of a bar dict and fill in its defaults.
+
+    """
+
+    unknown = set(bar) - set(defaults)
+    if unknown:
+        raise ValueError('Unknown ' + kind + ' keys: ' +
+                         ', '.join(sorted(unknown)))
+    bar = dict(defaults, **bar)
+
+    for corner in ('ll', 'ur'):
+        if bar[corner] is None or len(bar[corner]) != 2:
+            raise ValueError(kind + ' ' + corner + ' must be '
+                             '[stack index, main index]')
+        _check_index(kind + ' ' + corner, bar[corner][0], total_dim)
+        _check_index(kind + ' ' + corner, bar[corner][1], main_dim)
+
+    return bar
+
+
+def spec_hash(spec):
+    """
+    Stable content hash of a grid spec.
+
+    Specs that build the same grid hash the same, regardless of key
+    order, tuples versus lists, omitted defaults, or ints versus equal
+    floats.
+
+    Parameters
+    ----------
+    spec : dict
+        The grid spec.
+
+    Returns
+    -------
+    digest : string
+        Hex SHA-256 digest.
+
+    """
+
+    text = json.dumps(_floats(validate_spec(spec)), sort_keys=True,
+                      separators=(',', ':'))
+
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def build_grid(spec, use_pyplot=False):
+    """
+    Build and format a grid from a spec.
+
+    Parameters
+    ----------
+    spec : dict
+        The grid spec, see ``validate_spec()``.
+    use_pyplot : Boolean
+        Default ``False``.  Whether to build the figure with pyplot.
+
+    Returns
+    -------
+    grid : ``XGrid`` or ``YGrid`` instance
+
+    """
+
+    spec = validate_spec(spec)
+    main_is_x = spec['main_axis'] == 'x'
+
+    kwargs = dict(figsize=spec['figsize'],
+                  alternate_sides=spec['alternate_sides'],
+                  onespine_forboth=spec['onespine_forboth'],
+                  use_pyplot=use_pyplot)
+    if spec['startside'] is not None:
+        kwargs['startside'] = spec['startside']
+
+    if main_is_x:
+        from .xgrid_ystack import XGrid
+        grid = XGrid(spec['stack_ratios'], xratios=spec['main_ratios'],
+                     **kwargs)
+    else:
+        from .ygrid_xstack import YGrid
+        grid = YGrid(spec['stack_ratios'], yratios=spec['main_ratios'],
+                     **kwargs)
+
+    if spec['twins']:
+        grid.make_twins(list(spec['twins']))
+
+    with grid.batch():
+        if spec['spacing'] is not None:
+            grid.adjust_spacing(spec['spacing'])
+
+        main_ticks = spec['main_ticks'] or [None] * grid.mainax_dim
+        stack_ticks = spec['stack_ticks'] or [None] * grid.total_stackdim
+        main_log = spec['main_log'] or 'none'
+        stack_log = spec['stack_log'] or 'none'
+
+        if main_is_x:
+            grid.set_all_ticknums(main_ticks, stack_ticks, main_log,
+                                  stack_log)
+        else:
+            grid.set_all_ticknums(stack_ticks, main_ticks, stack_log,
+                                  main_log)
+
+        grid.set_ticks(labelsize=spec['tick_fontsize'])
+
+        for key, xy in (('main_limits', grid.mainax_id),
+                        ('stack_limits', grid.stackax_id)):
+            if spec[key] is None:
+                continue
+            lims = [(i, lim[0], lim[1]) for i, lim in enumerate(spec[key])
+                    if lim is not None]
+            if lims:
+                getattr(grid, 'set_' + xy + 'lim')(lims)
+
+        if spec['axis_shift'] is not None or spec['twin_shift'] is not None:
+            grid.move_spines(axis_shift=spec['axis_shift'],
+                             twin_shift=spec['twin_shift'])
+
+        if spec['spinewidth'] is not None:
+            grid.set_spinewidth(spec['spinewidth'])
+
+        if spec['cleanup']:
+            grid.cleanup_grid()
+
+    if spec['labels'] is not None:
+        getattr(grid, 'set_' + grid.stackax_id + 'labels')(
+            spec['labels'], fontsize=spec['label_fontsize'],
+            labelpad=spec['labelpad'])
+
+    for frame in spec['frames']:
+        grid.draw_frame(**frame)
+
+    for cutout in spec['cutouts']:
+        grid.draw_cutout(**cutout)
+
+    for bar in spec['bars']:
+        grid.draw_bar(grid.axes[bar['ll'][0]][bar['ll'][1]],
+                      grid.axes[bar['ur'][0]][bar['ur'][1]], bar['limits'],
+                      orientation=bar['orientation'], zorder=bar['zorder'],
+                      **bar['kwargs'])
+
+    for bars in spec['bar_collections']:
+        grid.draw_bars(grid.axes[bars['ll'][0]][bars['ll'][1]],
+                       grid.axes[bars['ur'][0]][bars['ur'][1]],
+                       bar_limits=bars['limits'], event_lines=bars['events'],
+                       orientation=bars['orientation'],
+                       zorder=bars['zorder'],
+                       event_kwargs=bars['event_kwargs'], **bars['kwargs'])
+
+    return grid
+
+
+def export_spec(grid):
+    """
+    Describe an existing grid as a spec.
+
+    Captures what ``build_grid()`` can rebuild: layout, twins, spacing,
+    spine shifts and width, tick multiples, log scales, tick label size,
+    fixed limits (autoscaling axes get ``None``), cleanup, stacked axis
+    labels, and frames, cutouts and bars drawn with ``draw_frame()``,
+    ``draw_cutout()``, ``draw_bar()`` and ``draw_bars()``.  Plotted data
+    is not included.
+
+    Parameters
+    ----------
+    grid : ``XGrid`` or ``YGrid`` instance
+
+    Returns
+    -------
+    spec : dict
+        A complete, JSON-compatible spec.
+
+    """
+
+    main_is_x = grid.mainax_id == 'x'
+    main_xy = grid.mainax_id
+    stack_xy = grid.stackax_id
+
+    if main_is_x:
+        stack_ratios, main_ratios = grid.yratios, grid.xratios
+        spacing = grid.fig.subplotpars.hspace
+    else:
+        stack_ratios, main_ratios = grid.xratios, grid.yratios
+        spacing = grid.fig.subplotpars.wspace
+
+    datasides = grid.dataside_list
+    main_axes = grid.axes[0]
+    stack_axes = [subgrid[0] for subgrid in grid.axes]
+
+    spec = dict(_DEFAULTS)
+    spec.update(main_axis=main_xy,
+                stack_ratios=stack_ratios,
+                main_ratios=main_ratios,
+                figsize=grid.fig.get_size_inches(),
+                startside=datasides[0],
+                alternate_sides=(grid.stackdim == 1 or
+                                 datasides[1] != datasides[0]),
+                onespine_forboth=(grid.stackdim == 1 and
+                                  grid.stackpos_list[0] != 'both'),
+                twins=list(grid.twinds or []),
+                spacing=spacing,
+                main_ticks=_axes_ticks(grid, main_axes, main_xy),
+                stack_ticks=_axes_ticks(grid, stack_axes, stack_xy),
+                main_log=_log_inds(main_axes, main_xy),
+                stack_log=_log_inds(stack_axes, stack_xy),
+                tick_fontsize=getattr(stack_axes[0], stack_xy + 'axis')
+                .get_major_ticks()[0].label1.get_fontsize(),
+                main_limits=_axes_limits(main_axes, main_xy),
+                stack_limits=_axes_limits(stack_axes, stack_xy),
+                axis_shift=grid.relative_shifts,
+                twin_shift=grid.reltwin_shifts,
+                spinewidth=grid.spinewidth,
+                cleanup=grid.grid_isclean,
+                frames=[dict(frame) for frame in grid.frame_specs],
+                cutouts=[dict(cutout) for cutout in grid.cutout_specs])
+
+    labels = []
+    label_axis = None
+    for subgrid in grid.axes:
+        label = None
+        for ax in subgrid:
+            axis = getattr(ax, stack_xy + 'axis')
+            if axis.get_label_text():
+                label = axis.get_label_text()
+                label_axis = label_axis or axis
+                break
+        labels.append(label)
+
+    if label_axis is not None:
+        spec.update(labels=labels,
+                    label_fontsize=label_axis.label.get_fontsize(),
+                    labelpad=label_axis.labelpad)
+
+    positions = {}
+    for i, subgrid in enumerate(grid.axes):
+        for j, ax in enumerate(subgrid):
+            positions[id(ax)] = [i, j]
+
+    spec['bars'] = [dict(ll=positions[id(bar['ll_axis'])],
+                         ur=positions[id(bar['ur_axis'])],
+                         limits=bar['bar_limits'],
+                         orientation=bar['orientation'],
+                         zorder=bar['zorder'], kwargs=dict(bar['kwargs']))
+                    for bar in grid.bar_specs]
+
+    spec['bar_collections'] = [
+        dict(ll=positions[id(bars['ll_axis'])],
+             ur=positions[id(bars['ur_axis'])],
+             limits=bars['bar_limits'], events=bars['event_lines'],
+             orientation=bars['orientation'], zorder=bars['zorder'],
+             event_kwargs=dict(bars['event_kwargs']),
+             kwargs=dict(bars['kwargs']))
+        for bars in grid.bar_collection_specs]
+
+    return validate_spec(spec)
+
+
+def _axes_ticks(grid, axes, xy):
+    """
+    The recorded (major, minor) tick multiples of ``axes``, or ``None``
+    for the whole list if none were set.
+
+    """
+
+    ticks = [grid.tick_multiples.get((ax, xy)) for ax in axes]
+
+    if all(t is None for t in ticks):
+        return None
+
+    return ticks
+
+
+def _log_inds(axes, xy):
+    return [i for i, ax in enumerate(axes)
+            if getattr(ax, 'get_' + xy + 'scale')() == 'log']
+
+
+def _axes_limits(axes, xy):
+    """
+    The limits of each of ``axes``, ``None`` for autoscaling axes, or
+    ``None`` for the whole list if all autoscale.
+
+    """
+
+    limits = [None if getattr(ax, 'get_autoscale' + xy + '_on')()
+              else getattr(ax, 'get_' + xy + 'lim')() for ax in axes]
+
+    if all(lim is None for lim in limits):
+        return None
+
+    return limits
+
+
+def _check_index(key, ind, dim):
+    if not isinstance(ind, int) or not -dim <= ind < dim:
+        raise ValueError(key + ' index ' + repr(ind) + ' out of range')
+
+
+def _plain(item):
+    """
+    Convert tuples, arrays and numpy scalars in ``item`` to lists and
+    Python scalars.
+
+    """
+
+    if isinstance(item, dict):
+        return dict((key, _plain(val)) for key, val in item.items())
+
+    if isinstance(item, np.ndarray):
+        item = item.tolist()
+
+    if isinstance(item, (list, tuple)):
+        return [_plain(i) for i in item]
+
+    if isinstance(item, np.generic):
+        return item.item()
+
+    return item
+
+
+def _floats(item):
+    """
+    Turn ints (not Booleans) in ``item`` into floats so equal numbers hash
+    the same.
+
+    """
+
+    if isinstance(item, dict):
+        return dict((key, _floats(val)) for key, val in item.items())
+
+    if isinstance(item, list):
+        return [_floats(i) for i in item]
+
+    if isinstance(item, int) and not isinstance(item, bool):
+        return float(item)
+
+    return item
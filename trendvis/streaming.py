@@ -0,0 +1,299 @@
+from __future__ import division, print_function, absolute_import
+import numpy as np
+from matplotlib.lines import Line2D
+from .dataprep import window_slice
+
+
+class GridStream(object):
+    """
+    Stream data into the stacked rows (columns) of a grid and redraw only
+    the data lines.
+
+    Each row (column) of ``grid.axes``, twins included, gets one animated
+    line per main axis.  The grid itself (spines, ticks, labels, frames,
+    bars) is drawn once and cached as a background; ``self.update()``
+    restores that background and draws only the lines on top of it.
+
+    The main axis window only moves when the newest point runs off its end.
+    It then jumps forward by ``jump`` of its width, and the background is
+    redrawn and cached again.  Stacked axes that autoscale, i.e. whose
+    limits were never set, grow to fit new data that falls outside them,
+    which also redraws the grid.  Otherwise, updates never redraw the grid;
+    set the stacked axis limits up front to always blit.
+
+    """
+
+    def __init__(self, grid, window, start=0, capacity=10000, jump=0.25,
+                 colors=None, **kwargs):
+        """
+        Parameters
+        ----------
+        grid : ``XGrid`` or ``YGrid`` instance
+            The formatted grid to stream into.  Its canvas must support
+            blitting, i.e. be Agg-based.
+        window : int or float
+            The width of the main axis window shown across all main axes,
+            in data units.  The window is split among the main axes in
+            proportion to their ratios.
+
+        Keyword Arguments
+        -----------------
+        start : int or float
+            Default 0.  The main axis value at the start of the window.
+        capacity : int
+            Default 10000.  The number of most recent points kept per row.
+        jump : float
+            Default 0.25.  When new data runs past the window, the window
+            moves so the newest point is this fraction of the window width
+            from its end.
+        colors : list of colors
+            Default ``None``, the property cycle.  One per row (column) in
+            ``grid.axes``.
+
+        Other Parameters
+        ----------------
+        kwargs : passed to ``Line2D``
+
+        """
+
+        self.grid = grid
+        self.window = window
+        self.capacity = int(capacity)
+        self.jump = jump
+        self.main_is_x = grid.mainax_id == 'x'
+
+        if self.main_is_x:
+            ratios = np.asarray(grid.xratios, dtype=float)
+        else:
+            ratios = np.asarray(grid.yratios, dtype=float)
+        self._fractions = np.r_[0, np.cumsum(ratios)] / ratios.sum()
+
+        nrows = len(grid.axes)
+
+        # Each point is stored twice, at i and i + capacity, so the last
+        # ``size`` points are always one contiguous view
+        self._main = np.empty(2 * self.capacity)
+        self._stack = np.full((nrows, 2 * self.capacity), np.nan)
+        self._head = 0
+        self.size = 0
+        # Points appended since the stacked limits were last checked
+        self._unchecked = 0
+
+        if colors is None:
+            colors = ['C%d' % (i % 10) for i in range(nrows)]
+
+        self.lines = []
+        for subgrid, color in zip(grid.axes, colors):
+            row_lines = []
+            for ax in subgrid:
+                line = Line2D([], [], color=color, animated=True, **kwargs)
+                ax.add_line(line)
+                grid.register_axcolor(ax, color)
+                row_lines.append(line)
+            self.lines.append(row_lines)
+
+        self.background = None
+        self._canvas = grid.fig.canvas
+        self._cid = self._canvas.mpl_connect('draw_event', self._on_draw)
+
+        self.set_window(start)
+
+    def close(self):
+        """
+        Disconnect from the canvas and remove the streamed lines.
+
+        """
+
+        if self._cid is not None:
+            self._canvas.mpl_disconnect(self._cid)
+            self._cid = None
+
+        for row_lines in self.lines:
+            for line in row_lines:
+                line.remove()
+
+        self.lines = []
+        self.background = None
+
+    def append(self, main, values):
+        """
+        Add new points.  Nothing is drawn until ``self.update()``.
+
+        Parameters
+        ----------
+        main : int, float or 1D array
+            The main axis value(s) of the new points.  Must be increasing.
+        values : list
+            One item per row (column) in ``grid.axes``: a value or 1D array
+            the same length as ``main``, or ``None`` for no data.
+
+        """
+
+        main = np.atleast_1d(np.asarray(main, dtype=float))
+        count = main.size
+
+        if count > self.capacity:
+            main = main[-self.capacity:]
+            values = [None if v is None else np.atleast_1d(v)[-self.capacity:]
+                      for v in values]
+            count = self.capacity
+
+        inds = (self._head + np.arange(count)) % self.capacity
+
+        self._main[inds] = main
+        self._main[inds + self.capacity] = main
+
+        for row, value in enumerate(values):
+            if value is None:
+                value = np.nan
+            self._stack[row, inds] = value
+            self._stack[row, inds + self.capacity] = value
+
+        self._head = (self._head + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        self._unchecked = min(self._unchecked + count, self.capacity)
+
+    def update(self):
+        """
+        Draw the newest data.  Blits over the cached background unless the
+        window has to move or an autoscaling stacked axis has to grow, in
+        which case the whole figure is redrawn.
+
+        """
+
+        if self.size == 0:
+            return
+
+        newest = self._main[self._head + self.capacity - 1]
+
+        if newest > self.limits[-1]:
+            self.set_window(newest - (1 - self.jump) * self.window)
+
+        self._set_line_data()
+
+        if self._autoscale_stack():
+            self.background = None
+
+        if self.background is None:
+            self.grid.fig.canvas.draw()
+        else:
+            self._blit()
+
+    def set_window(self, start):
+        """
+        Move the main axis window to begin at ``start``.  The background is
+        redrawn on the next ``self.update()``.
+
+        Parameters
+        ----------
+        start : int or float
+            The main axis value at the start of the window.
+
+        """
+
+        self.start = start
+        self.limits = start + self.window * self._fractions
+
+        for main_ind in range(0, self.grid.mainax_dim):
+            lims = self.limits[main_ind:main_ind + 2]
+            ax = self.grid.axes[0][main_ind]
+            if self.main_is_x:
+                ax.set_xlim(lims)
+            else:
+                ax.set_ylim(lims)
+
+        self._set_line_data()
+        self.background = None
+
+    def _set_line_data(self):
+        """
+        Point each line at the buffered data inside its main axis' window.
+
+        """
+
+        start = self._head + self.capacity - self.size
+        main = self._main[start:start + self.size]
+
+        windows = [window_slice(main, self.limits[i], self.limits[i + 1])
+                   for i in range(0, self.grid.mainax_dim)]
+
+        for row, row_lines in enumerate(self.lines):
+            stack = self._stack[row, start:start + self.size]
+            for line, window in zip(row_lines, windows):
+                if self.main_is_x:
+                    line.set_data(main[window], stack[window])
+                else:
+                    line.set_data(stack[window], main[window])
+
+    def _autoscale_stack(self):
+        """
+        Rescale the autoscaling stacked axes whose limits do not cover the
+        points appended since the last check.  Returns ``True`` if any
+        limits changed.
+
+        """
+
+        end = self._head + self.capacity
+        new = self._stack[:, end - self._unchecked:end]
+        self._unchecked = 0
+
+        if new.shape[1] == 0:
+            return False
+
+        # NaN-skipping; rows without new values give NaN and never rescale
+        lows = np.fmin.reduce(new, axis=1)
+        highs = np.fmax.reduce(new, axis=1)
+
+        rescaled = False
+
+        for row_lines, low, high in zip(self.lines, lows, highs):
+            ax = row_lines[0].axes
+            if self.main_is_x:
+                autoscale, lims = ax.get_autoscaley_on(), ax.get_ylim()
+            else:
+                autoscale, lims = ax.get_autoscalex_on(), ax.get_xlim()
+
+            if not autoscale or (low >= min(lims) and high <= max(lims)):
+                continue
+
+            for line in row_lines:
+                line.axes.relim()
+            ax.autoscale_view(scalex=not self.main_is_x,
+                              scaley=self.main_is_x)
+            rescaled = True
+
+        return rescaled
+
+    def _draw_lines(self):
+        for row_lines in self.lines:
+            for line in row_lines:
+                line.axes.draw_artist(line)
+
+    def _blit(self):
+        canvas = self.grid.fig.canvas
+
+        canvas.restore_region(self.background)
+        self._draw_lines()
+        canvas.blit(self.grid.fig.bbox)
+
+    def _on_draw(self, event):
+        """
+        Cache the freshly drawn background (animated lines are skipped by
+        full draws), then draw the lines on top.
+
+        Draws made by ``savefig()`` are ignored: they may be on another
+        canvas (pdf, svg, ...) or at another dpi than the screen.
+
+        """
+
+        canvas = self.grid.fig.canvas
+
+        if (event.canvas is not self._canvas or
+                not hasattr(canvas, 'copy_from_bbox') or
+                canvas.is_saving() or
+                getattr(event.renderer, 'dpi', self.grid.fig.dpi) !=
+                self.grid.fig.dpi):
+            return
+
+        self.background = canvas.copy_from_bbox(self.grid.fig.bbox)
+        self._draw_lines()
@@ -4,6 +4,24 @@ from functools import partial
 image_comparison = partial(
     _ic,
     extensions=["png"],
-    tol=22,
+    # Baselines are rendered with the matplotlib version in use; keep the
+    # tolerance small so real changes to the output fail
+    tol=2,
     style=["classic", "_classic_test_patch", {"figure.figsize": (10, 10)}],
 )
+
+
+class DuckFrame(object):
+    """
+    Minimal stand-in for a ``pandas.DataFrame``: ``index``, ``columns``
+    and column access by name.
+
+    """
+
+    def __init__(self, index, data):
+        self.index = index
+        self.columns = list(data)
+        self._data = data
+
+    def __getitem__(self, name):
+        return self._data[name]
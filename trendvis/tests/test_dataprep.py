@@ -0,0 +1,143 @@
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+import pytest
+
+import trendvis
+from trendvis.dataprep import (minmax_indices, decimate_xy, is_monotonic,
+                                load_array, window_slice)
+
+
+def test_minmax_keeps_peaks():
+    x = np.linspace(0, 100, 100001)
+    y = np.sin(x)
+    y[5000] = 40
+    y[70001] = -40
+
+    keep = minmax_indices(x, y, 200)
+
+    assert keep.size <= 4 * 200
+    assert np.all(np.diff(keep) > 0)
+    assert 5000 in keep and 70001 in keep
+    assert keep[0] == 0 and keep[-1] == x.size - 1
+    assert y[keep].max() == y.max() and y[keep].min() == y.min()
+
+
+def test_minmax_descending_and_unsorted():
+    x = np.linspace(100, 0, 10000)
+    y = np.cos(x)
+    assert minmax_indices(x, y, 50).size <= 200
+
+    rng = np.random.RandomState(0)
+    x = rng.rand(10000)
+    assert minmax_indices(x, y, 50).size == x.size
+
+
+def test_minmax_all_nan():
+    x = np.arange(1000.0)
+    y = np.full(1000, np.nan)
+
+    keep = minmax_indices(x, y, 10)
+    assert keep[0] == 0 and keep[-1] == 999 and keep.size <= 40
+
+
+def test_plot_data_decimate_limits():
+    grid = trendvis.XGrid([1], use_pyplot=False)
+    grid.set_xlim([(0, 0, 10)])
+    x = np.linspace(0, 1000, 1000001)
+    y = np.sin(x * 10)
+
+    trendvis.plot_data(grid, [[(x, y, 'red')]], decimate=True, marker=None)
+
+    xdata = grid.axes[0][0].lines[0].get_xdata()
+    inside = np.count_nonzero((xdata >= 0) & (xdata <= 10))
+    assert inside > 2 * grid.mainax_pixels(0)
+    assert xdata.size <= 4 * grid.mainax_pixels(0) + 4
+
+    grid.set_xlim((0, 500, 1000))
+    xdata = grid.axes[0][0].lines[0].get_xdata()
+    assert xdata.min() < 501 and xdata.max() == 1000
+    grid.close()
+
+
+def test_plot_data_decimate():
+    grid = trendvis.YGrid([1, 1], yratios=[1, 1], use_pyplot=False)
+    y = np.arange(200000.0)
+    x = np.cos(y / 1000.0)
+
+    trendvis.plot_data(grid, [[(x, y, "red")], [(x, y, "blue", [1])]],
+                       decimate=True, auto_spinecolor=False)
+
+    line = grid.axes[0][0].lines[0]
+    assert len(line.get_xdata()) <= 4 * grid.mainax_pixels(0) + 4
+    assert len(grid.axes[1][0].lines) == 0
+
+    full_x, full_y = decimate_xy(x, y, 0, main_is_x=False)
+    assert full_x is x
+    grid.close()
+
+
+def test_window_slice():
+    x = np.arange(100.0)
+    assert window_slice(x, 10.5, 20) == slice(10, 22)
+    assert window_slice(x, 20, 10.5) == slice(10, 22)
+    assert window_slice(x, -50, 500) == slice(0, 100)
+
+    window = window_slice(x[::-1], 10.5, 20)
+    assert x[::-1][window].min() == 10 and x[::-1][window].max() == 21
+
+
+def test_plot_data_memmap(tmp_path):
+    path = str(tmp_path / 'x.npy')
+    np.save(path, np.arange(100000.0))
+    y = np.lib.format.open_memmap(str(tmp_path / 'y.npy'), mode='w+',
+                                  dtype=float, shape=(100000,))
+    y[:] = np.random.RandomState(0).rand(100000)
+
+    x = load_array(path)
+    assert isinstance(x, np.memmap)
+
+    grid = trendvis.XGrid([1], xratios=[1, 1], use_pyplot=False)
+    grid.set_xlim([(0, 100, 200), (1, 5000, 5100)])
+
+    trendvis.plot_data(grid, [[(path, y, 'red')]], auto_spinecolor=False)
+
+    for ax, lo in zip(grid.axes[0], [100, 5000]):
+        xdata = ax.lines[0].get_xdata()
+        assert xdata[0] == lo - 1 and xdata[-1] == lo + 101
+
+    grid.close()
+
+
+def test_is_monotonic():
+    x = np.arange(1000.0)
+    assert is_monotonic(x, chunksize=7)
+    assert is_monotonic(x[::-1], chunksize=7)
+    assert is_monotonic(np.ones(10))
+
+    x[500] = 2000
+    assert not is_monotonic(x, chunksize=7)
+
+
+@pytest.mark.parametrize('assume_sorted', [False, True])
+def test_plot_data_unsorted_memmap(tmp_path, assume_sorted):
+    path = str(tmp_path / 'x.npy')
+    x = np.random.RandomState(0).rand(1000) * 1000
+    np.save(path, x)
+
+    grid = trendvis.XGrid([1], use_pyplot=False)
+    grid.set_xlim([(0, 100, 300)])
+
+    trendvis.plot_data(grid, [[(path, x, 'red')]], auto_spinecolor=False,
+                       assume_sorted=assume_sorted)
+
+    xdata = grid.axes[0][0].lines[0].get_xdata()
+    inside = np.count_nonzero((x >= 100) & (x <= 300))
+    plotted = np.count_nonzero((xdata >= 100) & (xdata <= 300))
+
+    if assume_sorted:
+        assert plotted < inside
+    else:
+        assert plotted == inside and len(xdata) == 1000
+        assert grid.data_clips == []
+    grid.close()
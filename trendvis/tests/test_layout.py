@@ -0,0 +1,43 @@
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+import pytest
+
+import trendvis
+from trendvis.layout import GridLayout
+
+
+def test_spans():
+    layout = GridLayout([1, 2], [2, 3, 1])
+    spans = layout.spans()
+
+    assert spans.shape == (3, 2, 4)
+    assert layout.gridrows == 6
+    assert layout.gridcols == 3
+    assert spans[1, 1].tolist() == [2, 5, 1, 3]
+
+
+@pytest.mark.parametrize("gridclass", [trendvis.XGrid, trendvis.YGrid])
+def test_rects_match_axes(gridclass):
+    grid = gridclass([2, 3, 1], [1, 2], use_pyplot=False)
+    grid.fig.subplots_adjust(hspace=0.2, wspace=0.1)
+
+    rects = grid.layout.figure_rects(grid.fig)
+    if grid.mainax_id == "y":
+        rects = rects.transpose(1, 0, 2)
+
+    for subgrid, subgrid_rects in zip(grid.axes, rects):
+        for ax, rect in zip(subgrid, subgrid_rects):
+            np.testing.assert_allclose(ax.get_position().bounds, rect)
+
+    grid.close()
+
+
+def test_layout_validation():
+    assert GridLayout(2, [1, 1]) == GridLayout([2], (1, 1))
+    assert len(set([GridLayout(2, 1), GridLayout([2], [1])])) == 1
+
+    with pytest.raises(ValueError):
+        GridLayout([1, 0], 1)
+    with pytest.raises(ValueError):
+        GridLayout([1.5], 1)
@@ -0,0 +1,123 @@
+from __future__ import division, absolute_import, print_function
+
+import os
+import re
+
+import numpy as np
+import pytest
+
+import trendvis
+
+
+def _spec(filename, **kwargs):
+    x = np.linspace(0, 10, 50)
+    spec = dict(main_axis="x", stack_ratios=[1, 1], figsize=(4, 4),
+                main_ticks=[(2, 1)], stack_ticks=[(0.5, 0.1)] * 2,
+                plotdata=[[(x, np.sin(x), "red")], [(x, np.cos(x), "blue")]],
+                plot_kwargs=dict(marker=None), filename=str(filename))
+    spec.update(kwargs)
+    return spec
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_render_many(tmp_path, processes):
+    specs = [_spec(tmp_path / "a.png"),
+             _spec(tmp_path / "b.svg"),
+             _spec(tmp_path / "bad.pdf", stack_ticks=[(0.5, 0.1)]),
+             _spec(tmp_path / "c.pdf", dpi=50)]
+
+    results = trendvis.render_many(specs, processes=processes)
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.error is None for r in results] == [True, True, False, True]
+    assert "ValueError" in results[2].error
+    assert all(r.seconds > 0 for r in results)
+
+    assert (tmp_path / "a.png").read_bytes().startswith(b"\x89PNG")
+    assert b"<svg" in (tmp_path / "b.svg").read_bytes()
+    assert (tmp_path / "c.pdf").read_bytes().startswith(b"%PDF")
+    assert not (tmp_path / "bad.pdf").exists()
+
+
+def test_renderer_reuse(tmp_path):
+    with trendvis.Renderer(processes=1) as renderer:
+        first = renderer.render_many([_spec(tmp_path / "a.png")])
+        second = renderer.render_many([_spec(tmp_path / "b.png")])
+
+    assert first[0].error is None and second[0].error is None
+
+
+class _KillWorker(object):
+    """Exits the process that unpickles it, like an OOM kill."""
+
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+def test_renderer_worker_death(tmp_path):
+    specs = [_spec(tmp_path / "a.png"),
+             _spec(tmp_path / "dies.png", plot_kwargs=_KillWorker())]
+
+    with trendvis.Renderer(processes=1) as renderer:
+        results = renderer.render_many(specs)
+        assert "BrokenProcessPool" in results[1].error
+
+        after = renderer.render_many([_spec(tmp_path / "b.png")])
+
+    assert len(results) == 2
+    assert after[0].error is None
+
+
+def test_export_pdf(tmp_path):
+    spec = {'main_axis': 'x', 'stack_ratios': [1, 1], 'figsize': (3, 3)}
+    x = np.linspace(0, 10, 50)
+    built = []
+
+    def builder():
+        grid = trendvis.build_grid(dict(spec, main_axis='y'))
+        built.append(grid)
+        return grid
+
+    direct = trendvis.XGrid([1], use_pyplot=False)
+
+    def pages():
+        yield spec
+        yield (spec, [[(x, np.sin(x), 'red')], []], {'marker': None})
+        yield builder
+        yield direct
+
+    path = str(tmp_path / 'atlas.pdf')
+    assert trendvis.export_pdf(path, pages()) == 4
+
+    with open(path, 'rb') as f:
+        assert f.read().count(b'/Type /Page ') == 4
+    assert built[0].fig is None and built[0].axes == []
+    assert direct.fig is None
+
+    with pytest.raises(TypeError):
+        trendvis.export_pdf(str(tmp_path / 'bad.pdf'), [42])
+
+
+def test_export_pdf_page_dpi(tmp_path):
+    x = np.linspace(0, 1, 2000)
+
+    def page(policy):
+        def builder():
+            grid = trendvis.XGrid([1], figsize=(2, 2), use_pyplot=False)
+            line, = grid.axes[0][0].plot(x, x)
+            if policy:
+                grid.set_rasterization_policy(line_points=1000, dpi=30)
+            else:
+                line.set_rasterized(True)
+            return grid
+        return builder
+
+    path = tmp_path / 'dpi.pdf'
+    trendvis.export_pdf(str(path), [page(True), page(False)])
+
+    # The policy dpi applies to its own page only
+    widths = [int(w) for w in
+              re.findall(br'/Width (\d+)', path.read_bytes())]
+    # Each image is written with its soft mask
+    assert len(widths) == 4
+    assert widths[2] / widths[0] == pytest.approx(100 / 30, rel=0.1)
@@ -0,0 +1,84 @@
+from __future__ import division, absolute_import, print_function
+
+import os
+
+import matplotlib
+import numpy as np
+
+import trendvis
+import trendvis.rendercache
+
+
+SPEC = {'main_axis': 'x', 'stack_ratios': [1, 1], 'figsize': (3, 3),
+        'stack_ticks': [(0.5, 0.1)] * 2}
+
+
+def _plotdata(scale=1.0):
+    x = np.linspace(0, 10, 100)
+    return [[(x, scale * np.sin(x), 'red')], [(x, np.cos(x), 'blue')]]
+
+
+def test_render_cache_hits(tmp_path, monkeypatch):
+    cache = trendvis.RenderCache(tmp_path)
+
+    png = cache.render(SPEC, _plotdata(), dpi=40)
+    assert png.startswith(b'\x89PNG')
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    def fail(spec):
+        raise AssertionError('grid built on a cache hit')
+
+    monkeypatch.setattr(trendvis.rendercache, 'build_grid', fail)
+    assert cache.render(SPEC, _plotdata(), dpi=40) == png
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    key = cache.key(SPEC, _plotdata(), dpi=40)
+    assert key != cache.key(SPEC, _plotdata(2.0), dpi=40)
+    assert key != cache.key(SPEC, _plotdata(), dpi=41)
+    assert key != cache.key(SPEC, _plotdata(), format='svg', dpi=40)
+    assert key != cache.key(dict(SPEC, figsize=(3, 4)), _plotdata(), dpi=40)
+
+    # Style and version changes miss
+    with matplotlib.rc_context({'lines.linewidth': 3}):
+        assert key != cache.key(SPEC, _plotdata(), dpi=40)
+    with matplotlib.rc_context({'keymap.save': ['w']}):
+        assert key == cache.key(SPEC, _plotdata(), dpi=40)
+    monkeypatch.setattr(trendvis, '__version__', 'other')
+    assert key != cache.key(SPEC, _plotdata(), dpi=40)
+    monkeypatch.undo()
+
+    # Options json cannot encode are still keyed
+    from matplotlib.transforms import Bbox
+    bbox = dict(bbox_inches=Bbox([[0, 0], [2, 2]]))
+    colors = dict(color=np.array([1.0, 0, 0]))
+    assert cache.key(SPEC, _plotdata(), savefig_kwargs=bbox) == \
+        cache.key(SPEC, _plotdata(), savefig_kwargs=bbox)
+    assert cache.key(SPEC, _plotdata(), savefig_kwargs=bbox) != \
+        cache.key(SPEC, _plotdata(), savefig_kwargs=dict(
+            bbox_inches=Bbox([[0, 0], [1, 1]])))
+    assert cache.key(SPEC, _plotdata(), plot_kwargs=colors) != \
+        cache.key(SPEC, _plotdata(), plot_kwargs=dict(color='red'))
+
+    # Another worker evicting the file is just a miss
+    os.remove(cache._path(key, 'png'))
+    assert cache.get(key) is None
+
+
+def test_render_cache_evicts_lru(tmp_path):
+    cache = trendvis.RenderCache(tmp_path, max_bytes=2500)
+
+    for i, name in enumerate(['a', 'b', 'c']):
+        cache.put(name, b'x' * 1000)
+        os.utime(cache._path(name, 'png'), (i, i))
+
+    assert sorted(os.listdir(str(tmp_path))) == ['b.png', 'c.png']
+
+    cache.get('b')
+    cache.put('d', b'x' * 1000)
+    assert sorted(os.listdir(str(tmp_path))) == ['b.png', 'd.png']
+
+    # Another worker's write in progress survives clear()
+    with open(os.path.join(str(tmp_path), '.tmp-writing'), 'wb') as f:
+        f.write(b'x')
+    cache.clear()
+    assert os.listdir(str(tmp_path)) == ['.tmp-writing']
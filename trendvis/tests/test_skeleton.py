@@ -0,0 +1,56 @@
+from __future__ import division, absolute_import, print_function
+
+import io
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+import trendvis
+
+
+def _get(cache, xratios=(1, 1), main_axis="x"):
+    return cache.get_grid(list(xratios), [1, 2], (6, 6),
+                          [(2, 1)] * len(xratios), [(0.5, 0.1)] * 3,
+                          main_axis, to_twin=[1], axis_shift=0.1,
+                          xlim=[(i, 0, 10) for i in range(len(xratios))])
+
+
+def test_cache_clones_skeleton():
+    cache = trendvis.GridCache(maxsize=2)
+    fignums = plt.get_fignums()
+
+    first = _get(cache)
+    second = _get(cache)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert plt.get_fignums() == fignums
+    assert second is not first
+    assert second.fig is not first.fig
+    assert second.grid_isclean
+    assert second.total_stackdim == 3
+    assert second.axes[2][1].get_xlim() == (0, 10)
+    assert second.axes[0][0].spines["left"].get_position() == ("axes", -0.1)
+
+    # Clones are independent and render headless
+    second.axes[0][0].plot(np.arange(5), np.arange(5))
+    assert len(_get(cache).axes[0][0].lines) == 0
+    second.fig.savefig(io.BytesIO(), format="png")
+
+    for grid in (first, second):
+        grid.close()
+
+
+def test_cache_lru_eviction():
+    cache = trendvis.GridCache(maxsize=2)
+
+    _get(cache, xratios=(1,))
+    _get(cache, xratios=(1, 1))
+    _get(cache, xratios=(1,))
+    _get(cache, xratios=(1, 2))
+
+    assert len(cache) == 2
+    misses = cache.misses
+    _get(cache, xratios=(1,))
+    assert cache.misses == misses
+    _get(cache, xratios=(1, 1))
+    assert cache.misses == misses + 1
@@ -0,0 +1,112 @@
+from __future__ import division, absolute_import, print_function
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import trendvis
+
+
+def _spec(**kwargs):
+    spec = {'main_axis': 'x', 'stack_ratios': [1, 1, 1], 'main_ratios': [1, 2],
+            'figsize': (6, 8), 'twins': [1],
+            'main_ticks': [(10, 5), (10, 5)], 'stack_ticks': [(0.5, 0.1)] * 4,
+            'main_limits': [(0, 50), (60, 100)],
+            'stack_limits': [(0, 1), None, (-1, 1), None],
+            'axis_shift': 0.1, 'twin_shift': 0.2, 'spinewidth': 2,
+            'labels': ['a', None, 'c', 'twin'],
+            'frames': [{}], 'cutouts': [{}],
+            'bars': [{'ll': (2, 0), 'ur': (0, 0), 'limits': (10, 20),
+                      'kwargs': {'facecolor': 'red'}}]}
+    spec.update(kwargs)
+    return spec
+
+
+@pytest.mark.parametrize("main_axis", ["x", "y"])
+def test_build_export_roundtrip(main_axis):
+    grid = trendvis.build_grid(_spec(main_axis=main_axis))
+
+    assert len(grid.axes) == 4 and len(grid.axes[0]) == 2
+    assert len(grid.fig.patches) == 3
+
+    spec = trendvis.export_spec(grid)
+    assert spec['stack_limits'][1] is None
+    assert spec['bars'][0]['ll'] == [2, 0]
+
+    rebuilt = trendvis.build_grid(json.loads(json.dumps(spec)))
+    assert trendvis.export_spec(rebuilt) == spec
+    assert trendvis.spec_hash(spec) == trendvis.spec_hash(
+        trendvis.export_spec(rebuilt))
+
+    grid.close()
+    rebuilt.close()
+
+
+@pytest.mark.parametrize("main_axis", ["x", "y"])
+def test_export_tick_fontsize(main_axis):
+    grid = trendvis.build_grid(_spec(main_axis=main_axis, tick_fontsize=7))
+
+    # Only the stacked axes' tick labels are exported
+    grid.set_ticks(xy_axis=main_axis, labelsize=12)
+    assert trendvis.export_spec(grid)['tick_fontsize'] == 7
+    grid.close()
+
+
+def test_export_bar_collections():
+    grid = trendvis.XGrid([1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.draw_bars(grid.axes[1][0], grid.axes[0][1],
+                   bar_limits=np.array([(0.1, 0.2), (0.5, 0.6)]),
+                   event_lines=[0.3], facecolor='red',
+                   event_kwargs={'linewidths': 2})
+
+    spec = trendvis.export_spec(grid)
+    assert spec['bar_collections'] == [
+        {'ll': [1, 0], 'ur': [0, 1], 'limits': [[0.1, 0.2], [0.5, 0.6]],
+         'events': [0.3], 'orientation': 'vertical', 'zorder': -1,
+         'event_kwargs': {'linewidths': 2}, 'kwargs': {'facecolor': 'red'}}]
+
+    rebuilt = trendvis.build_grid(json.loads(json.dumps(spec)))
+    assert len(rebuilt.bar_collections) == 2
+    assert trendvis.export_spec(rebuilt) == spec
+
+    grid.clear_data()
+    assert trendvis.export_spec(grid)['bar_collections'] == []
+    grid.close()
+    rebuilt.close()
+
+
+def test_spec_hash_is_canonical():
+    spec = _spec()
+    same = json.loads(json.dumps(_spec(figsize=[6.0, 8.0])))
+    same['cleanup'] = True
+
+    assert trendvis.spec_hash(spec) == trendvis.spec_hash(same)
+    assert trendvis.spec_hash(spec) != trendvis.spec_hash(_spec(twins=[0]))
+
+
+@pytest.mark.parametrize("change", [{'main_axis': 'z'},
+                                    {'twins': [3]},
+                                    {'labels': ['a']},
+                                    {'colour': 'red'},
+                                    {'bars': [{'ll': (0, 5), 'ur': (0, 0),
+                                               'limits': (0, 1)}]},
+                                    {'bar_collections': [{'ll': (0, 0),
+                                                          'ur': (0, 0)}]}])
+def test_validate_spec_errors(change):
+    with pytest.raises(ValueError):
+        trendvis.validate_spec(_spec(**change))
+
+
+def test_spec_import_skips_matplotlib():
+    code = ("import sys, trendvis; trendvis.validate_spec("
+            "{'main_axis': 'x', 'stack_ratios': [1]}); "
+            "print('matplotlib' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(trendvis.__file__))
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=root,
+                                  universal_newlines=True)
+
+    assert out.strip() == 'False'
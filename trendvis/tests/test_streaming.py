@@ -0,0 +1,98 @@
+from __future__ import division, absolute_import, print_function
+
+import io
+
+import numpy as np
+import pytest
+
+import trendvis
+
+
+def test_stream_blits_between_jumps():
+    grid = trendvis.XGrid([1, 1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.make_twins([0])
+    grid.set_ylim([(row, 0, 5) for row in range(4)])
+    stream = trendvis.GridStream(grid, 10, capacity=50)
+
+    draws = []
+    grid.fig.canvas.mpl_connect('draw_event', lambda event: draws.append(1))
+
+    stream.append(0, [1, 2, 3, None])
+    stream.update()
+    background = stream.background
+    assert background is not None and len(draws) == 1
+
+    stream.append(np.arange(1, 8), [np.ones(7)] * 4)
+    stream.update()
+    assert stream.background is background and len(draws) == 1
+
+    xdata = stream.lines[0][0].get_xdata()
+    assert xdata[0] == 0 and xdata[-1] == 6
+    assert stream.lines[0][1].get_xdata()[0] == 4
+    assert np.isnan(stream.lines[3][0].get_ydata()[0])
+
+    # Past the window: jump and redraw once
+    stream.append(12, [0, 0, 0, 0])
+    stream.update()
+    assert len(draws) == 2
+    assert np.allclose(grid.axes[0][1].get_xlim(), (9.5, 14.5))
+
+    # Ring buffer keeps only the newest points
+    stream.append(np.arange(13, 113), [np.arange(100.0)] * 4)
+    assert stream.size == 50
+    stream.update()
+    assert stream.lines[0][1].get_xdata()[-1] == 112
+
+    stream.close()
+    assert len(grid.axes[0][0].lines) == 0
+    grid.close()
+
+
+def test_stream_autoscales_stack():
+    grid = trendvis.XGrid([1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.set_ylim([(1, 0, 1)])
+    stream = trendvis.GridStream(grid, 10)
+
+    draws = []
+    grid.fig.canvas.mpl_connect('draw_event', lambda event: draws.append(1))
+
+    stream.append(np.arange(3), [np.zeros(3), np.zeros(3)])
+    stream.update()
+    background = stream.background
+
+    # Inside the limits: blit
+    stream.append(3, [0, 0.5])
+    stream.update()
+    assert stream.background is background and len(draws) == 1
+
+    # Outside: autoscaling rows grow, on both main axes, and redraw
+    stream.append(7, [20, 20])
+    stream.update()
+    assert len(draws) == 2
+    assert grid.axes[0][0].get_ylim()[1] >= 20
+    assert grid.axes[0][1].get_ylim()[1] >= 20
+    assert grid.axes[1][0].get_ylim() == (0, 1)
+
+    stream.close()
+    grid.close()
+
+
+@pytest.mark.parametrize('savefig_kwargs', [dict(format='pdf'),
+                                            dict(format='svg'),
+                                            dict(format='png', dpi=200)])
+def test_stream_savefig(savefig_kwargs):
+    grid = trendvis.XGrid([1, 1], figsize=(4, 4), use_pyplot=False)
+    stream = trendvis.GridStream(grid, 10)
+
+    stream.append(np.arange(5), [np.arange(5.0)] * 2)
+    stream.update()
+    background = stream.background
+
+    grid.fig.savefig(io.BytesIO(), **savefig_kwargs)
+    assert stream.background is background
+
+    stream.append(5, [1, 1])
+    stream.update()
+    assert grid.fig.canvas.get_width_height() == (400, 400)
+    stream.close()
+    grid.close()
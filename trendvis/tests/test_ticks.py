@@ -0,0 +1,73 @@
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+from matplotlib.ticker import FixedLocator
+
+import trendvis
+from trendvis.ticks import CappedMultipleLocator, plan_ticks, tick_positions
+
+
+def test_tick_positions():
+    ticks = tick_positions([0, 5, 1, 0.25], [10, -5, 1.05, 0.3],
+                           [2, 2.5, 0.1, 1])
+    assert np.allclose(ticks[0], [0, 2, 4, 6, 8, 10])
+    assert np.allclose(ticks[1], [-5, -2.5, 0, 2.5, 5])
+    assert np.allclose(ticks[2], [1])
+    assert ticks[3].size == 0
+
+
+def test_plan_ticks_caps_density():
+    ticks = plan_ticks([0, 0], [100, 100], [0.001, 10], [200, 200], 0.1)
+
+    assert ticks[0].size <= 21
+    assert np.allclose(np.diff(ticks[0]), 5)
+    assert np.allclose(ticks[1], np.arange(0, 101, 10))
+
+
+def test_freeze_ticks():
+    grid = trendvis.make_grid([1, 1], [1, 1], (6, 6), [(10, 1e-4)] * 2,
+                              [(0.5, 0.1)] * 2, 'x',
+                              xlim=[(0, 0, 100), (1, 100, 200)],
+                              ylim=[(0, 0, 1), (1, 0, 2)], use_pyplot=False,
+                              freeze_ticks=0.2)
+
+    ax = grid.axes[1][1]
+    assert isinstance(ax.xaxis.get_major_locator(), FixedLocator)
+    assert np.allclose(ax.xaxis.get_major_locator().locs,
+                       np.arange(100, 201, 10))
+    assert ax.xaxis.get_minor_locator().locs.size <= 0.2 * 300
+    assert np.allclose(ax.yaxis.get_major_locator().locs,
+                       np.arange(0, 2.1, 0.5))
+
+    grid.fig.canvas.draw()
+
+    # Frozen ticks follow later limit changes
+    grid.set_xlim((1, 150, 160))
+    assert np.allclose(ax.xaxis.get_major_locator().locs, [150, 160])
+    assert grid.axes[0][1].xaxis.get_minor_locator().locs.min() >= 150
+
+    # New tick numbers unfreeze
+    grid.set_all_ticknums([(10, 1)] * 2, [(0.5, 0.1)] * 2)
+    assert isinstance(ax.xaxis.get_major_locator(), CappedMultipleLocator)
+    grid.set_xlim((1, 0, 50))
+    assert isinstance(ax.xaxis.get_major_locator(), CappedMultipleLocator)
+    grid.close()
+
+
+def test_default_ticks_capped():
+    grid = trendvis.make_grid([1], [1, 1], (6, 6), [(10, 1e-4)],
+                              [(0.5, 0.1)] * 2, 'x', xlim=[(0, 0, 100)],
+                              use_pyplot=False)
+    ax = grid.axes[0][0]
+    locator = ax.xaxis.get_minor_locator()
+    assert isinstance(locator, CappedMultipleLocator)
+
+    ticks = locator()
+    assert len(ticks) <= 0.2 * ax.bbox.width + 3
+    assert np.allclose(ax.xaxis.get_major_locator()(), np.arange(-10, 111,
+                                                                 10))
+
+    grid.set_xlim((0, 0, 0.005))
+    assert np.allclose(np.diff(locator()), 1e-4)
+    grid.fig.canvas.draw()
+    grid.close()
@@ -7,11 +7,21 @@ TrendVis testing
 
 """
 
+import io
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
 import trendvis
 
-from trendvis.testing import image_comparison
+from trendvis.testing import DuckFrame, image_comparison
 
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_hex
 
 # baseline images use the old default figsize of 10x10 inches.
 plt.rcParams["figure.figsize"] = "10, 10"
@@ -79,12 +89,63 @@ def test_get_axes_ygrid():
     assert testgrid.get_axis(0, is_twin=True) == testgrid.axes[2][0]
 
 
-#
-# def test_get_twin_rownum():
-
-
-#
-# def test_get_twin_colnum():
+def test_get_twin_rownum():
+    testgrid = trendvis.XGrid([2, 1, 1], use_pyplot=False)
+    testgrid.make_twins([0, 2])
+    testgrid.make_twins(0)
+
+    assert testgrid.get_twin_rownum(0) == [3, 5]
+    assert testgrid.get_twin_rownum(0, twinstance=1) == [5]
+    assert testgrid.get_twin_rownum(1) == []
+    assert testgrid.get_axis(0, is_twin=True, twinstance=-1) == \
+        testgrid.axes[5][0]
+
+    testgrid.remove_twins()
+    assert testgrid.get_twin_rownum(0) == []
+    assert len(testgrid.axis_index) == 3
+    testgrid.close()
+
+
+def test_get_twin_colnum():
+    testgrid = trendvis.YGrid([2, 1], yratios=[1, 1], use_pyplot=False)
+    testgrid.make_twins([1, 1])
+
+    assert testgrid.get_twin_colnum(1) == [2, 3]
+    assert testgrid.get_axis(1, 1, is_twin=True, twinstance=1) == \
+        testgrid.axes[3][1]
+    with pytest.raises(IndexError):
+        testgrid.get_axis(0, is_twin=True)
+    testgrid.close()
+
+
+@pytest.mark.parametrize('gridclass', [trendvis.XGrid, trendvis.YGrid])
+def test_select(gridclass):
+    testgrid = gridclass([1, 1, 1], [1, 1], use_pyplot=False)
+    testgrid.make_twins([2, 0])
+
+    def stored(storage_ind, main_ind):
+        return testgrid.axes[storage_ind][main_ind]
+
+    if gridclass is trendvis.XGrid:
+        select = testgrid.select
+    else:
+        def select(rows=None, cols=None, twins=False):
+            return testgrid.select(cols, rows, twins)
+
+    assert select() == [stored(s, m) for s in range(3) for m in range(2)]
+    assert select(rows=0, cols=-1, twins=True) == [stored(0, 1),
+                                                    stored(4, 1)]
+    assert select(rows=[2, 1], twins='only') == [stored(3, 0), stored(3, 1)]
+    assert len(select(twins=True)) == 10
+
+    # A twin of a twin row sits at the original row's position
+    testgrid.make_twins(4)
+    assert select(rows=0, cols=1, twins='only') == [stored(4, 1),
+                                                     stored(5, 1)]
+    assert len(select(twins=True)) == 12
+    with pytest.raises(IndexError):
+        select(rows=3)
+    testgrid.close()
 
 
 def test_reverse_axes_xgrid():
@@ -155,6 +216,450 @@ def test_ygrid_frame():
     testgrid.draw_frame()
 
 
+def test_headless_grid():
+    fignums = plt.get_fignums()
+
+    with trendvis.XGrid([1, 2], xratios=[1, 1], use_pyplot=False) as grid:
+        grid.cleanup_grid()
+        assert plt.get_fignums() == fignums
+        grid.fig.savefig(io.BytesIO(), format="png")
+
+    assert grid.fig is None
+    assert grid.axes == []
+
+
+def test_close_pyplot_grid():
+    grid = trendvis.YGrid([1, 2])
+    assert grid.fig.number in plt.get_fignums()
+
+    number = grid.fig.number
+    grid.close()
+
+    assert number not in plt.get_fignums()
+    grid.close()
+
+
+def test_plot_data_batch():
+    grid = trendvis.XGrid([1, 1], xratios=[1, 1], use_pyplot=False)
+    x = np.linspace(0, 10, 50)
+    plotdata = [[(x, np.sin(x), "red"), (x, np.cos(x), "blue", [1])],
+                [(x, x, "green", [0])]]
+
+    trendvis.plot_data(grid, plotdata, batch=True, auto_spinecolor=False)
+
+    assert [len(ax.collections) for ax in grid.axes[0]] == [1, 1]
+    assert len(grid.axes[0][1].collections[0].get_segments()) == 2
+    assert len(grid.axes[0][0].collections[0].get_segments()) == 1
+    assert [len(ax.collections) for ax in grid.axes[1]] == [1, 0]
+    assert not any(ax.lines for row in grid.axes for ax in row)
+
+    grid.close()
+
+
+def test_frame_follows_limits():
+    grid = trendvis.XGrid([1, 2, 1], xratios=[1, 1], use_pyplot=False)
+    grid.draw_frame()
+    grid.draw_bar(grid.axes[2][0], grid.axes[0][0], (0.2, 0.4))
+
+    # Change limits and spacing without realigning
+    grid.set_ylim([(0, 0, 0.5), (2, 0.5, 1)], adjust_bar_frame=False)
+    grid.adjust_spacing(0.3, adjust_bar_frame=False)
+    grid.axes[0][0].set_xlim(0.1, 0.9)
+
+    grid.fig.canvas.draw()
+    renderer = grid.fig.canvas.get_renderer()
+
+    frame = grid.fig.patches[grid.bf_patchinds[0]]
+    bar = grid.fig.patches[grid.bf_patchinds[2]]
+
+    top = grid.axes[0][0].transData.transform((0, 1))[1]
+    bottom = grid.axes[2][0].transData.transform((0, 0))[1]
+    left, right = grid.axes[0][0].transData.transform([(0, 0), (1, 0)])[:, 0]
+    bar_left = grid.axes[0][0].transData.transform((0.2, 0))[0]
+
+    frame_box = frame.get_window_extent(renderer)
+    np.testing.assert_allclose([frame_box.y0, frame_box.y1], [bottom, top])
+    np.testing.assert_allclose([frame_box.x0, frame_box.x1], [left, right])
+    np.testing.assert_allclose(bar.get_window_extent(renderer).x0, bar_left)
+
+    grid.close()
+
+
+def test_draw_bars():
+    grid = trendvis.XGrid([1, 2, 1], use_pyplot=False)
+    grid.set_xlim((0, 100))
+
+    limits = np.column_stack((np.arange(0, 100, 10), np.arange(5, 105, 10)))
+    bars, events = grid.draw_bars(grid.axes[2][0], grid.axes[0][0],
+                                  bar_limits=limits, event_lines=[33, 66],
+                                  facecolor="gray")
+
+    assert grid.bar_collections == [bars, events]
+    assert len(bars.get_paths()) == 10
+    assert len(events.get_segments()) == 2
+
+    grid.set_xlim((50, 100))
+    grid.fig.canvas.draw()
+
+    trans = bars.get_transform()
+    ll = trans.transform((60, 0))
+    ur = trans.transform((65, 1))
+    np.testing.assert_allclose(
+        ll, grid.axes[2][0].transData.transform((60, 0)))
+    np.testing.assert_allclose(
+        ur, grid.axes[0][0].transData.transform((65, 1)))
+
+    # Changing only the upper axes' limits still moves the bars
+    grid.axes[0][0].set_ylim(0, 20)
+    grid.fig.canvas.draw()
+
+    np.testing.assert_allclose(
+        trans.transform((65, 1)),
+        grid.axes[0][0].transData.transform((65, 1)))
+
+    grid.close()
+
+
+def test_batch_defers_formatting():
+    grid = trendvis.XGrid([1, 1, 1], xratios=[1, 1], use_pyplot=False)
+    ax = grid.axes[1][1]
+
+    with grid.batch():
+        grid.set_ylim([(1, 0, 5), (1, 0, 10)])
+        grid.reverse_yaxis([1])
+        grid.set_xlim([(0, 2, 4)])
+        grid.reverse_xaxis([1])
+        grid.reverse_xaxis([1])
+        grid.set_ticks(major_dim=(8, 2))
+        grid.set_ticks(xy_axis="y", major_dim=(9, 2))
+        grid.move_spines(axis_shift=0.1)
+        grid.cleanup_grid()
+
+        # Nothing is applied until the block exits
+        assert ax.get_ylim() == (0, 1)
+        assert not grid.grid_isclean
+        assert grid.axes[0][0].spines["left"].get_position() != ("axes", -0.1)
+
+    assert ax.get_ylim() == (10, 0)
+    assert ax.get_xlim() == (0, 1)
+    assert grid.axes[0][0].get_xlim() == (2, 4)
+    assert grid.grid_isclean
+    assert grid.axes[0][0].spines["left"].get_position() == ("axes", -0.1)
+    assert ax.yaxis.get_major_ticks()[0].tick1line.get_markersize() == 9
+    assert ax.xaxis.get_major_ticks()[0].tick1line.get_markersize() == 8
+
+    grid.close()
+
+
+def test_batch_discarded_on_error():
+    grid = trendvis.XGrid([1, 1], use_pyplot=False)
+
+    with pytest.raises(KeyError):
+        with grid.batch():
+            grid.set_ylim([(1, 0, 5)])
+            grid.cleanup_grid()
+            raise KeyError('failed')
+
+    assert grid.axes[1][0].get_ylim() == (0, 1)
+    assert not grid.grid_isclean
+    assert grid._pending == {} and grid._batch_depth == 0
+
+    with grid.batch():
+        grid.set_ylim([(1, 0, 5)])
+    assert grid.axes[1][0].get_ylim() == (0, 5)
+
+    # Order-dependent calls cannot run on the pre-batch state
+    with pytest.raises(RuntimeError):
+        with grid.batch():
+            grid.set_ylim([(1, 0, 10)])
+            grid.draw_frame()
+    assert grid.frame_specs == [] and grid._batch_depth == 0
+    grid.close()
+
+
+@pytest.mark.parametrize("main_axis", ["x", "y"])
+def test_make_grid(main_axis):
+    x = np.linspace(0, 10, 20)
+    if main_axis == "x":
+        xticks, yticks = [(2, 1), (2, 1)], [(0.5, 0.1)] * 3
+        plotdata = [[(x, np.sin(x), "red")], [(x, np.cos(x), "blue")], []]
+        lims = dict(xlim=[(0, 0, 5), (1, 5, 10)])
+    else:
+        xticks, yticks = [(0.5, 0.1)] * 3, [(2, 1), (2, 1)]
+        plotdata = [[(np.sin(x), x, "red")], [(np.cos(x), x, "blue")], []]
+        lims = dict(ylim=[(0, 0, 5), (1, 5, 10)])
+
+    grid = trendvis.make_grid([1, 1], [1, 1], (6, 6), xticks, yticks,
+                              main_axis, plotdata=plotdata, to_twin=[0],
+                              axis_shift=0.1, **lims)
+
+    assert grid.mainax_id == main_axis
+    assert grid.grid_isclean
+    assert grid.total_stackdim == 3
+    assert grid.spinewidth == 2
+
+    grid.close()
+
+
+def test_cleanup_hides_idle_axes():
+    grid = trendvis.XGrid([1, 1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.cleanup_grid()
+
+    visible = [[(ax.xaxis.get_visible(), ax.yaxis.get_visible())
+                for ax in row] for row in grid.axes]
+    assert visible == [[(True, True), (True, False)],
+                       [(False, False), (False, True)],
+                       [(True, True), (True, False)]]
+
+    grid.set_ax_visibility(grid.axes[1][0], 'left', True)
+    assert grid.axes[1][0].yaxis.get_visible()
+    assert grid.axes[1][0].yaxis.get_major_ticks()[0].label1.get_visible()
+
+    grid.set_ylabels([None, 'label', None])
+    assert grid.axes[1][-1].yaxis.get_visible()
+
+    grid.reveal_spines()
+    assert all(ax.xaxis.get_visible() and ax.yaxis.get_visible()
+               for row in grid.axes for ax in row)
+    grid.close()
+
+
+def test_cleanup_keeps_gridlines():
+    grid = trendvis.XGrid([1, 1, 1], use_pyplot=False)
+    for row in grid.axes:
+        row[0].grid(True)
+    grid.cleanup_grid()
+
+    assert all(ax.xaxis.get_visible() and ax.yaxis.get_visible()
+               for row in grid.axes for ax in row)
+    grid.close()
+
+
+def test_autocolor_registry():
+    grid = trendvis.XGrid([1, 1, 1], use_pyplot=False)
+    x = np.arange(10)
+
+    grid.axes[2][0].plot(x, x, color='green')
+    trendvis.plot_data(grid, [[(x, x, 'red'), (x, x, 'blue')],
+                              [(x, x, 'orange')]], batch=True)
+
+    assert grid.axcolors == {grid.axes[0][0]: 'red',
+                             grid.axes[1][0]: 'orange'}
+
+    colors = [ax.spines['left'].get_edgecolor() for row in grid.axes
+              for ax in row]
+    assert [to_hex(c) for c in colors] == \
+        ['#ff0000', '#ffa500', '#008000']
+    grid.close()
+
+
+def test_profiling():
+    grid = trendvis.XGrid([1, 1, 1], use_pyplot=False)
+    assert grid.profile_report() == []
+
+    calls = []
+    grid.enable_profiling(hook=lambda name, seconds: calls.append(name))
+    grid.set_ylim([(0, 0, 1), (2, 0, 5)])
+    grid.cleanup_grid()
+    grid.cleanup_grid()
+
+    report = dict((name, (n, sec)) for name, n, sec in grid.profile_report())
+    assert report['cleanup_grid'][0] == 2
+    assert report['set_ylim'][0] == 1
+    assert calls.count('cleanup_grid') == 2
+
+    clone = pickle.loads(pickle.dumps(grid))
+    assert clone.profile_report() == []
+    clone.close()
+
+    grid.disable_profiling()
+    assert 'cleanup_grid' not in grid.__dict__
+    assert grid.profile_report() == []
+    grid.close()
+
+
+def test_lazy_import():
+    code = ("import sys, trendvis; "
+            "print('matplotlib' in sys.modules); "
+            "trendvis.XGrid([1, 1], use_pyplot=False); "
+            "print('matplotlib.pyplot' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(trendvis.__file__))
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=root,
+                                  universal_newlines=True)
+
+    assert out.split() == ['False', 'False']
+    assert 'GridStream' in dir(trendvis)
+    with pytest.raises(AttributeError):
+        trendvis.NotAGrid
+
+
+def test_import_budget():
+    # Well under the cost of importing matplotlib.pyplot, 100s of ms
+    budget_us = 50000
+
+    root = os.path.dirname(os.path.dirname(trendvis.__file__))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                           'import trendvis'], cwd=root, check=True,
+                          stderr=subprocess.PIPE, universal_newlines=True)
+
+    cumulative = {}
+    # Lines after the header are 'import time: self | cumulative | name'
+    for line in proc.stderr.splitlines()[1:]:
+        _, total_us, name = line.split('|')
+        cumulative[name.strip()] = int(total_us)
+
+    assert not any(name.split('.')[0] in ('matplotlib', 'numpy')
+                   for name in cumulative)
+    assert cumulative['trendvis'] < budget_us
+
+
+def test_rasterization_policy():
+    grid = trendvis.XGrid([1, 1], xratios=[1, 1], use_pyplot=False)
+    x = np.linspace(0, 1, 10000)
+    trendvis.plot_data(grid, [[(x, np.sin(x), 'red')],
+                              [(x[:100], x[:100], 'blue')]], marker=None)
+    grid.draw_cutout()
+    grid.draw_frame()
+
+    grid.set_rasterization_policy(line_points=1000, dpi=50)
+    buf = io.BytesIO()
+    grid.savefig(buf, format='svg')
+    svg = buf.getvalue().decode()
+
+    dense = [grid.axes[0][0].lines[0], grid.axes[0][1].lines[0]]
+    assert grid.rasterized_artists == dense
+    assert svg.count('<image') == 2
+    assert not any(line.get_rasterized() for line in grid.cutout_lines)
+    assert not grid.fig.patches[0].get_rasterized()
+
+    # Raster formats keep the figure dpi
+    buf = io.BytesIO()
+    grid.savefig(buf, format='png')
+    width = int.from_bytes(buf.getvalue()[16:20], 'big')
+    assert width == grid.fig.get_size_inches()[0] * grid.fig.dpi
+    assert grid._prepare_savefig('png', {}) == {}
+    assert grid._prepare_savefig('PDF', {}) == {'dpi': 50}
+    assert grid._prepare_savefig('eps', {'dpi': 10}) == {'dpi': 10}
+
+    grid.clear_rasterization_policy()
+    assert not any(line.get_rasterized() for line in dense)
+    grid.close()
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_plot_data_column_clipping(batch):
+    grid = trendvis.XGrid([1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.set_xlim([(0, 0, 30), (1, 60, 100)])
+    x = np.arange(101.0)
+    rng = np.random.RandomState(0)
+
+    trendvis.plot_data(grid, [[(x, x, 'red'), (rng.rand(101), x, 'blue')],
+                              [(x[::-1], x, 'green')]],
+                       marker=None, batch=batch)
+
+    def extent(ax, ind=0):
+        if batch:
+            data = ax.collections[0].get_segments()[ind][:, 0]
+        else:
+            data = ax.lines[ind].get_xdata()
+        return data.min(), data.max(), len(data)
+
+    assert extent(grid.axes[0][0]) == (0, 31, 32)
+    assert extent(grid.axes[0][1]) == (59, 100, 42)
+    assert extent(grid.axes[1][1]) == (59, 100, 42)
+    assert extent(grid.axes[0][1], 1)[2] == 101
+
+    grid.set_xlim((1, 10, 20))
+    assert extent(grid.axes[0][1]) == (9, 21, 13)
+    assert extent(grid.axes[1][1]) == (9, 21, 13)
+    assert extent(grid.axes[0][0]) == (0, 31, 32)
+    grid.close()
+
+
+def test_clear_data():
+    grid = trendvis.XGrid([1, 1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.make_twins([1])
+    grid.cleanup_grid()
+    grid.draw_cutout()
+    grid.draw_bar(grid.axes[2][0], grid.axes[0][0], (0.2, 0.4))
+    grid.draw_frame()
+    grid.draw_bars(grid.axes[2][1], grid.axes[0][1], bar_limits=[(0.1, 0.2)])
+
+    x = np.linspace(0, 10, 100)
+    plotdata = [[(x, np.sin(x), 'red')], [], [(x, x, 'blue')],
+                [(x, -x, 'green')]]
+    trendvis.plot_data(grid, plotdata, batch=True)
+    grid.axes[0][0].plot(x, x)
+
+    grid.clear_data()
+
+    assert all(len(ax.collections) == 0 for row in grid.axes for ax in row)
+    assert sum(len(ax.lines) for row in grid.axes
+               for ax in row) == len(grid.cutout_lines)
+    assert grid.bar_collections == [] and grid.axcolors == {}
+    assert len(grid.fig.patches) == 2 and grid.bf_patchinds == [0, 1]
+    assert grid.grid_isclean
+    assert grid.axes[2][1].get_shared_x_axes().joined(grid.axes[0][1],
+                                                      grid.axes[2][1])
+
+    trendvis.plot_data(grid, plotdata, marker=None)
+    grid.set_xlim((0, 2, 5))
+    grid.adjust_bar_frame()
+    grid.fig.canvas.draw()
+    assert grid.axcolors[grid.axes[3][0]] == 'green'
+    grid.close()
+
+
+def _check_plot_frame(frame, main):
+    grid = trendvis.XGrid([1, 1], xratios=[1, 1], use_pyplot=False)
+    grid.make_twins([1])
+    grid.set_xlim([(0, 0, 30), (1, 60, 100)])
+
+    trendvis.plot_frame(grid, frame, rows={'a': 0, 'b': 1},
+                        twins={'c': (1, 0)}, columns={'b': [1]},
+                        colors={'a': 'red'}, marker=None)
+
+    assert all(np.shares_memory(clip.datasets[0][0], main)
+               for clip in grid.data_clips)
+    line = grid.axes[0][0].lines[0]
+    assert (line.get_xdata().min(), line.get_xdata().max()) == (0, 31)
+    assert len(grid.axes[1][0].lines) == 0
+    assert len(grid.axes[1][1].lines[0].get_xdata()) == 42
+    assert (grid.axes[2][1].lines[0].get_ydata() ==
+            -grid.axes[2][1].lines[0].get_xdata()).all()
+    assert grid.axcolors[grid.axes[0][0]] == 'red'
+
+    grid.set_xlim((1, 10, 20))
+    assert len(grid.axes[2][1].lines[0].get_xdata()) == 13
+    grid.close()
+
+
+def test_plot_frame():
+    main = np.arange(101.0)
+    data = {'a': main * 2, 'b': main, 'c': -main}
+    _check_plot_frame(DuckFrame(main, data), main)
+
+
+def test_plot_frame_pandas():
+    pd = pytest.importorskip('pandas')
+    main = np.arange(101.0)
+    frame = pd.DataFrame({'a': main * 2, 'b': main, 'c': -main},
+                         index=pd.Index(main, name='depth'))
+    _check_plot_frame(frame, np.asarray(frame.index))
+
+
+def test_plot_frame_descending():
+    grid = trendvis.YGrid([1, 1], yratios=[1, 1], use_pyplot=False)
+    grid.set_ylim([(0, 0, 30), (1, 60, 100)])
+    main = np.arange(100.0, -1, -1)
+    trendvis.plot_frame(grid, DuckFrame(main, {'a': main, 'b': main}),
+                        marker=None)
+
+    ydata = grid.axes[1][1].lines[0].get_ydata()
+    assert (ydata.max(), ydata.min(), len(ydata)) == (100, 59, 42)
+    grid.close()
+
+
 if __name__ == "__main__":
     import nose
     import sys
@@ -0,0 +1,166 @@
+from __future__ import division, print_function, absolute_import
+import numpy as np
+from matplotlib.ticker import MultipleLocator
+
+
+def capped_multiples(vmin, vmax, multiples, pixels, max_density):
+    """
+    Widen tick multiples so no axis gets more than ``max_density`` ticks
+    per pixel.
+
+    Multiples are only ever scaled by whole numbers, so the widened ticks
+    are a subset of the requested ones.
+
+    Parameters
+    ----------
+    vmin, vmax : 1D arrays
+        The axis limits, in either order.
+    multiples : 1D array
+        The requested tick multiples.
+    pixels : 1D array
+        The axis lengths in pixels.
+    max_density : float
+        The maximum number of ticks per pixel.
+
+    Returns
+    -------
+    multiples : 1D array of floats
+
+    """
+
+    span = np.abs(np.asarray(vmax, dtype=float) -
+                  np.asarray(vmin, dtype=float))
+    multiples = np.asarray(multiples, dtype=float)
+
+    max_ticks = np.maximum(np.floor(np.asarray(pixels) * max_density), 1)
+    factor = np.maximum(np.ceil(span / multiples / max_ticks), 1)
+
+    return multiples * factor
+
+
+def tick_positions(vmin, vmax, multiples):
+    """
+    Tick positions at each multiple inside each [``vmin``, ``vmax``], for
+    all axes in one pass.
+
+    Parameters
+    ----------
+    vmin, vmax : 1D arrays
+        The axis limits, in either order.
+    multiples : 1D array
+        The tick multiple of each axis.
+
+    Returns
+    -------
+    positions : list of 1D arrays
+        One array of tick positions per axis.
+
+    """
+
+    vmin = np.asarray(vmin, dtype=float)
+    vmax = np.asarray(vmax, dtype=float)
+    lo = np.minimum(vmin, vmax)
+    hi = np.maximum(vmin, vmax)
+    multiples = np.asarray(multiples, dtype=float)
+
+    # Small tolerance so limits that sit on a multiple keep their tick
+    eps = 1e-10
+    first = np.ceil(lo / multiples - eps)
+    last = np.floor(hi / multiples + eps)
+    counts = np.maximum(last - first + 1, 0).astype(int)
+
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,
+                                                  counts)
+    positions = (np.repeat(first, counts) + offsets) * np.repeat(multiples,
+                                                                 counts)
+
+    return np.split(positions, np.cumsum(counts)[:-1])
+
+
+def plan_ticks(vmin, vmax, multiples, pixels, max_density):
+    """
+    Tick positions for many axes at once, with no axis getting more than
+    ``max_density`` ticks per pixel.
+
+    Parameters
+    ----------
+    vmin, vmax : 1D arrays
+        The axis limits, in either order.
+    multiples : 1D array
+        The requested tick multiples.
+    pixels : 1D array
+        The axis lengths in pixels.
+    max_density : float
+        The maximum number of ticks per pixel.
+
+    Returns
+    -------
+    positions : list of 1D arrays
+        One array of tick positions per axis.
+
+    """
+
+    steps = capped_multiples(vmin, vmax, multiples, pixels, max_density)
+
+    return tick_positions(vmin, vmax, steps)
+
+
+class CappedMultipleLocator(MultipleLocator):
+    """
+    ``MultipleLocator`` that never puts more than ``max_density`` ticks per
+    pixel on its axis.
+
+    If the multiple is too fine for the current limits and axis length, it
+    is widened by a whole number with ``capped_multiples()``, so the ticks
+    shown are a subset of the requested ones.  As ticks are located on
+    every draw, the cap follows limit and figure size changes.
+
+    """
+
+    def __init__(self, base=1.0, max_density=0.2):
+        """
+        Parameters
+        ----------
+        base : float
+            Default 1.0.  The requested tick multiple.
+        max_density : float
+            Default 0.2, i.e. at most one tick every 5 pixels.  The maximum
+            number of ticks per pixel.
+
+        """
+
+        MultipleLocator.__init__(self, base)
+        self.multiple = base
+        self.max_density = max_density
+
+    def set_params(self, base=None, max_density=None, **kwargs):
+        MultipleLocator.set_params(self, base=base, **kwargs)
+        if base is not None:
+            self.multiple = base
+        if max_density is not None:
+            self.max_density = max_density
+
+    def tick_values(self, vmin, vmax):
+        pixels = self._pixels()
+
+        if pixels is not None:
+            step = capped_multiples([vmin], [vmax], [self.multiple],
+                                    [pixels], self.max_density)[0]
+            if step != self.multiple:
+                return MultipleLocator(step).tick_values(vmin, vmax)
+
+        return MultipleLocator.tick_values(self, vmin, vmax)
+
+    def _pixels(self):
+        """
+        Length of the axis in pixels, or ``None`` if not on an axis.
+
+        """
+
+        if self.axis is None or self.axis.axes is None:
+            return None
+
+        bbox = self.axis.axes.bbox
+        if self.axis.axis_name == 'x':
+            return bbox.width
+        return bbox.height
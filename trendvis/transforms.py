@@ -0,0 +1,55 @@
+from __future__ import division, print_function, absolute_import
+import numpy as np
+from matplotlib.transforms import Affine2DBase
+
+
+class DataCornerTransform(Affine2DBase):
+    """
+    Map the unit square onto the display box between a lower left corner
+    given in the data coordinates of one axes and an upper right corner
+    given in the data coordinates of another.
+
+    The corners are transformed every time the matrix is requested, i.e. at
+    draw time, so patches using this transform stay anchored to the data
+    through limit changes, spacing changes and interactive zooming.
+
+    """
+
+    def __init__(self, ll_axis, ll_corner, ur_axis, ur_corner):
+        """
+        Parameters
+        ----------
+        ll_axis : ``matplotlib Axes`` instance
+            The axes whose data coordinates ``ll_corner`` is in
+        ll_corner : tuple of floats
+            The (x, y) data coordinates of the lower left corner
+        ur_axis : ``matplotlib Axes`` instance
+            The axes whose data coordinates ``ur_corner`` is in
+        ur_corner : tuple of floats
+            The (x, y) data coordinates of the upper right corner
+
+        """
+
+        Affine2DBase.__init__(self)
+
+        self.ll_axis = ll_axis
+        self.ll_corner = ll_corner
+        self.ur_axis = ur_axis
+        self.ur_corner = ur_corner
+
+        # Invalidate with either axes' data transform, so transforms built
+        # on this one do not keep a stale cached matrix
+        self.set_children(ll_axis.transData, ur_axis.transData)
+
+        self._mtx = np.identity(3)
+
+    def get_matrix(self):
+        x0, y0 = self.ll_axis.transData.transform(self.ll_corner)
+        x1, y1 = self.ur_axis.transData.transform(self.ur_corner)
+
+        self._mtx = np.array([[x1 - x0, 0.0, x0],
+                              [0.0, y1 - y0, y0],
+                              [0.0, 0.0, 1.0]])
+        self._invalid = 0
+
+        return self._mtx
@@ -1,5 +1,4 @@
 from __future__ import division, print_function, absolute_import
-import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
 from .gridclass import Grid
 
@@ -12,7 +11,7 @@ class XGrid(Grid):
 
     def __init__(self, ystack_ratios, xratios=1, figsize=None,
                  startside='left', alternate_sides=True,
-                 onespine_forboth=False, **kwargs):
+                 onespine_forboth=False, use_pyplot=True, **kwargs):
         """
         Initialize X_Grid
 
@@ -37,6 +36,11 @@ class XGrid(Grid):
             Default ``False``.  [True|False].  If the plot stack is only 1 row,
             then both main axis spines can be visible (``False``),
             or only the bottom spine (``True``).
+        use_pyplot : Boolean
+            Default ``True``.  If ``False``, build the grid on a bare
+            ``matplotlib.figure.Figure`` with an Agg canvas that pyplot
+            does not track.  Release it with ``self.close()`` or use the
+            grid as a context manager.
         **kwargs
             Any plt.figure arguments.  Passed to Grid.__init__(),
             plt.figure()
@@ -45,43 +49,10 @@ class XGrid(Grid):
 
         # Initialize parent class
         # Last arg is True because mainax_x
-        Grid.__init__(self, xratios, ystack_ratios, True, figsize, **kwargs)
+        Grid.__init__(self, xratios, ystack_ratios, True, figsize,
+                      use_pyplot=use_pyplot, **kwargs)
 
-        # Set initial x and y grid positions (top left)
-        xpos = 0
-        ypos = 0
-
-        # Create axes row by row
-        for rowspan in self.yratios:
-            row = []
-
-            for c, colspan in enumerate(self.xratios):
-                sharex = None
-                sharey = None
-
-                # All axes in a row share y axis with first axis in row
-                if xpos > 0:
-                    sharey = row[0]
-
-                # All axes in a column share x axis with first axis in column
-                if ypos > 0:
-                    sharex = self.axes[0][c]
-
-                ax = plt.subplot2grid((self.gridrows, self.gridcols),
-                                      (ypos, xpos), rowspan=rowspan,
-                                      colspan=colspan, sharey=sharey,
-                                      sharex=sharex)
-
-                ax.patch.set_visible(False)
-
-                row.append(ax)
-                xpos += colspan
-
-            self.axes.append(row)
-
-            # Reset x position to left side, move to next y position
-            xpos = 0
-            ypos += rowspan
+        self._build_axes()
 
         for ax in self.axes[0]:
             ax.xaxis.set_label_position('top')
@@ -129,10 +100,11 @@ class XGrid(Grid):
             self.stackpos_list.append('none')
 
             # Make the y-axes shared
-            if len(twin_row) > 1:
-                twin_row[0].get_shared_y_axes().join(*twin_row)
+            for twin in twin_row[1:]:
+                twin.sharey(twin_row[0])
 
             self.axes.append(twin_row)
+            self._index_subgrid(len(self.axes) - 1)
 
         self.grid_isclean = False
 
@@ -150,17 +122,22 @@ class XGrid(Grid):
 
         """
 
-        self.fig.subplots_adjust(hspace=hspace)
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._adjust_spacing(adjust_bar_frame, hspace=hspace)
 
     def cleanup_grid(self):
         """
         Remove unnecessary spines from grid
 
+        Axes left with no tick marks, tick labels or axis label to show are
+        hidden entirely, so their ticks are not computed at draw time.
+        ``self.reveal_spines()`` and ``self.set_ax_visibility()`` show
+        them again.
+
         """
 
+        if self._defer('cleanup'):
+            return
+
         if not self.grid_isclean:
 
             for row, dataside, stackpos in zip(self.axes, self.dataside_list,
@@ -186,7 +163,7 @@ class XGrid(Grid):
                 for ax in row:
                     # Remove tick marks, tick labels
                     ax.yaxis.set_ticks_position('none')
-                    ax.yaxis.set_tick_params(labelright='off', labelleft='off')
+                    ax.yaxis.set_tick_params(labelright=False, labelleft=False)
 
                     # Remove spines
                     for sp in self.spine_begone[stackpos]['none']:
@@ -194,6 +171,8 @@ class XGrid(Grid):
 
                 self._replace_data_ax(row, data_ind, data_ax)
 
+            self._hide_idle_axes()
+
         self.grid_isclean = True
 
     def get_axis(self, ypos, xpos=0, is_twin=False, twinstance=0):
@@ -234,15 +213,7 @@ class XGrid(Grid):
         """
 
         if is_twin:
-            # ypos corresponds to twind(s), which are in a particular order
-            # Get indices of where ypos appears in the list of twins
-            twindices = [i for i, tw in enumerate(self.twinds) if tw == ypos]
-
-            # Get position of desired instance of ypos
-            which_twin = twindices[twinstance]
-
-            # New ypos is the original axis count, plus the location of twin
-            ypos = self.stackdim + which_twin
+            return self._lookup(ypos, xpos, twinstance)
 
         # Subgrid (row, y), ax (col, x)
         ax = self.axes[ypos][xpos]
@@ -255,33 +226,31 @@ class XGrid(Grid):
         If there are multiple twins, finding those in ``self.axes`` may be
         difficult, esp. if twins were created haphazardly.
 
-        This prints the index required by ``self.axes`` to fetch the
-        twin row.
+        This gives the indices required by ``self.axes`` to fetch the
+        twin row(s).
 
         Parameters
         ----------
         ypos : int
             The row that was twinned
         twinstance : int
-            Default ``None``, print all twin row indices at ``ypos``.
-            Indicates which twin row index to print
+            Default ``None``, all twin row indices at ``ypos``.
+            Indicates which twin row index to get
+
+        Returns
+        -------
+        storage_inds : list of ints
+            Indices in ``self.axes`` of the twin row(s), in order of
+            creation.
 
         """
 
-        twindices = [i for i, tw in enumerate(self.twinds) if tw == ypos]
+        storage = self.twin_storage.get(ypos, [])
 
-        if twinstance is None and len(twindices) > 1:
-            newypos = [i + self.stackdim for i in twindices]
-        elif twinstance is None:
-            newypos = [self.stackdim + twindices[0]]
-        else:
-            newypos = [self.stackdim + twindices[twinstance]]
+        if twinstance is None:
+            return list(storage)
 
-        print('The twin(s) of row ' + str(ypos) + ' are stored in ' +
-              '`self.axes` as row(s):')
-
-        for ny in newypos:
-            print(ny)
+        return [storage[twinstance]]
 
     def set_all_ticknums(self, xticks, yticks, logxscale='none',
                          logyscale='none'):
@@ -318,6 +287,9 @@ class XGrid(Grid):
             raise ValueError('yticks provided for ' + str(len(yticks)) + '/' +
                              str(self.total_stackdim) + ' y-axes')
 
+        if self._defer('ticknums', (xticks, yticks, logxscale, logyscale)):
+            return
+
         xscale = self._make_lists(self.mainax_dim, logxscale, 'linear', 'log')
         yscale = self._make_lists(self.total_stackdim, logyscale,
                                   'linear', 'log')
@@ -399,12 +371,7 @@ class XGrid(Grid):
         if reverse_y == 'all':
             reverse_y = range(0, self.total_stackdim)
 
-        # Invert yaxis of first axis in each row
-        for r in reverse_y:
-            self.axes[r][0].invert_yaxis()
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._reverse_axes('y', reverse_y, adjust_bar_frame)
 
     def reverse_xaxis(self, reverse_x='all', adjust_bar_frame=True):
         """
@@ -425,12 +392,7 @@ class XGrid(Grid):
         if reverse_x == 'all':
             reverse_x = range(0, self.mainax_dim)
 
-        # Invert x axis of each axis in first row
-        for r in reverse_x:
-            self.axes[0][r].invert_xaxis()
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._reverse_axes('x', reverse_x, adjust_bar_frame)
 
     def set_ylim(self, ylim, adjust_bar_frame=True):
         """
@@ -449,30 +411,7 @@ class XGrid(Grid):
 
         """
 
-        if self.total_stackdim == 1:
-            try:
-                ylim.extend([])
-            except AttributeError:
-                pass
-            else:
-                ylim = ylim[0]
-
-            for row in self.axes:
-                for ax in row:
-                    ax.set_ylim(ylim[-2], ylim[-1])
-
-        else:
-            try:
-                ylim.extend([])
-            except AttributeError:
-                ylim = [ylim]
-
-            for yl in ylim:
-                for ax in self.axes[yl[0]]:
-                    ax.set_ylim(yl[1], yl[2])
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._set_limits('y', ylim, self.total_stackdim, adjust_bar_frame)
 
     def set_xlim(self, xlim, adjust_bar_frame=True):
         """
@@ -489,30 +428,7 @@ class XGrid(Grid):
 
         """
 
-        if self.mainax_dim == 1:
-            try:
-                xlim.extend([])
-            except AttributeError:
-                pass
-            else:
-                xlim = xlim[0]
-
-            for row in self.axes:
-                for ax in row:
-                    ax.set_xlim(xlim[-2], xlim[-1])
-
-        else:
-            try:
-                xlim.extend([])
-            except AttributeError:
-                xlim = [xlim]
-
-            for xl in xlim:
-                for row in self.axes:
-                    row[xl[0]].set_xlim(xl[1], xl[2])
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._set_limits('x', xlim, self.mainax_dim, adjust_bar_frame)
 
     def set_ticks(self, row='all', column='all', xy_axis='both', which='both',
                   major_dim=(6, 2), minor_dim=(4, 1), labelsize=10, pad=10,
@@ -583,6 +499,8 @@ class XGrid(Grid):
 
         """
 
+        self.cutout_specs.append(dict(di=di, lw=lw, **kwargs))
+
         if self.mainax_dim > 1:
 
             # Adjust di so that cutouts will look exactly the same
@@ -610,10 +528,10 @@ class XGrid(Grid):
             # first axes in rows, right only
             kwargs = dict(transform=top_ax.transAxes, clip_on=False,
                           color='black', lw=lw, **kwargs)
-            top_ax.plot(right, upper_y, **kwargs)
+            self.cutout_lines.extend(top_ax.plot(right, upper_y, **kwargs))
 
             kwargs.update(transform=low_ax.transAxes)
-            low_ax.plot(right, lower_y, **kwargs)
+            self.cutout_lines.extend(low_ax.plot(right, lower_y, **kwargs))
 
             # Middle axes
             for i in range(1, self.mainax_dim - 1):
@@ -623,12 +541,12 @@ class XGrid(Grid):
                 right = (1 - x[i], 1 + x[i])
 
                 kwargs.update(transform=top_ax.transAxes)
-                top_ax.plot(left, upper_y, **kwargs)
-                top_ax.plot(right, upper_y, **kwargs)
+                self.cutout_lines.extend(top_ax.plot(left, upper_y, **kwargs))
+                self.cutout_lines.extend(top_ax.plot(right, upper_y, **kwargs))
 
                 kwargs.update(transform=low_ax.transAxes)
-                low_ax.plot(left, lower_y, **kwargs)
-                low_ax.plot(right, lower_y, **kwargs)
+                self.cutout_lines.extend(low_ax.plot(left, lower_y, **kwargs))
+                self.cutout_lines.extend(low_ax.plot(right, lower_y, **kwargs))
 
             # Last axes in rows, left only
             top_ax = self.axes[0][-1]
@@ -636,10 +554,10 @@ class XGrid(Grid):
             left = (-x[-1], x[-1])
 
             kwargs.update(transform=top_ax.transAxes)
-            top_ax.plot(left, upper_y, **kwargs)
+            self.cutout_lines.extend(top_ax.plot(left, upper_y, **kwargs))
 
             kwargs.update(transform=low_ax.transAxes)
-            low_ax.plot(left, lower_y, **kwargs)
+            self.cutout_lines.extend(low_ax.plot(left, lower_y, **kwargs))
 
     def set_ylabels(self, ylabels, fontsize=None, labelpad=12, **kwargs):
         """
@@ -674,7 +592,9 @@ class XGrid(Grid):
                     row[-1].set_ylabel(yl, fontsize=fontsize,
                                        labelpad=labelpad, rotation=270,
                                        verticalalignment='bottom', **kwargs)
+                    row[-1].yaxis.set_visible(True)
                 else:
                     row[0].yaxis.set_label_position('left')
                     row[0].set_ylabel(yl, fontsize=fontsize, labelpad=labelpad,
                                       **kwargs)
+                    row[0].yaxis.set_visible(True)
@@ -1,5 +1,4 @@
 from __future__ import division, print_function, absolute_import
-import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
 from .gridclass import Grid
 
@@ -12,7 +11,7 @@ class YGrid(Grid):
 
     def __init__(self, xstack_ratios, yratios=1, figsize=None,
                  startside='top', alternate_sides=True,
-                 onespine_forboth=False, **kwargs):
+                 onespine_forboth=False, use_pyplot=True, **kwargs):
         """
         Initialize Y_Grid
 
@@ -37,6 +36,11 @@ class YGrid(Grid):
             Default ``False``.  [True|False].  If the plot stack is only 1
             column, then both main axis spines can be visible (``False``),
             or only the left spine is visible (``True``).
+        use_pyplot : Boolean
+            Default ``True``.  If ``False``, build the grid on a bare
+            ``matplotlib.figure.Figure`` with an Agg canvas that pyplot
+            does not track.  Release it with ``self.close()`` or use the
+            grid as a context manager.
         **kwargs
             Any plt.figure arguments.  Passed to Grid.__init__(),
             plt.figure().
@@ -45,43 +49,10 @@ class YGrid(Grid):
 
         # Initialize parent class
         # Last arg is False because mainax_x
-        Grid.__init__(self, xstack_ratios, yratios, False, figsize, **kwargs)
+        Grid.__init__(self, xstack_ratios, yratios, False, figsize,
+                      use_pyplot=use_pyplot, **kwargs)
 
-        # Set initial x and y grid positions (top left)
-        xpos = 0
-        ypos = 0
-
-        # Create axes column by column
-        for colspan in self.xratios:
-            col = []
-
-            for r, rowspan in enumerate(self.yratios):
-                sharex = None
-                sharey = None
-
-                # All axes in column share x axis with first in column
-                if ypos > 0:
-                    sharex = col[0]
-
-                # All axes in row share y axis with first in row
-                if xpos > 0:
-                    sharey = self.axes[0][r]
-
-                ax = plt.subplot2grid((self.gridrows, self.gridcols),
-                                      (ypos, xpos), rowspan=rowspan,
-                                      colspan=colspan, sharex=sharex,
-                                      sharey=sharey)
-
-                ax.patch.set_visible(False)
-
-                col.append(ax)
-                ypos += rowspan
-
-            self.axes.append(col)
-
-            # Reset y position to top, move to next x position
-            ypos = 0
-            xpos += colspan
+        self._build_axes()
 
         for ax in self.axes[-1]:
             ax.yaxis.set_label_position('right')
@@ -129,10 +100,11 @@ class YGrid(Grid):
             self.stackpos_list.append('none')
 
             # Make the x axes shared
-            if len(twin_col) > 1:
-                twin_col[0].get_shared_x_axes().join(*twin_col)
+            for twin in twin_col[1:]:
+                twin.sharex(twin_col[0])
 
             self.axes.append(twin_col)
+            self._index_subgrid(len(self.axes) - 1)
 
         self.grid_isclean = False
 
@@ -150,17 +122,22 @@ class YGrid(Grid):
 
         """
 
-        self.fig.subplots_adjust(wspace=wspace)
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._adjust_spacing(adjust_bar_frame, wspace=wspace)
 
     def cleanup_grid(self):
         """
         Remove unnecessary spines from grid
 
+        Axes left with no tick marks, tick labels or axis label to show are
+        hidden entirely, so their ticks are not computed at draw time.
+        ``self.reveal_spines()`` and ``self.set_ax_visibility()`` show
+        them again.
+
         """
 
+        if self._defer('cleanup'):
+            return
+
         if not self.grid_isclean:
 
             for col, dataside, stackpos in zip(self.axes, self.dataside_list,
@@ -186,7 +163,7 @@ class YGrid(Grid):
                 for ax in col:
                     # Remove tick marks, tick labels
                     ax.xaxis.set_ticks_position('none')
-                    ax.xaxis.set_tick_params(labeltop='off', labelbottom='off')
+                    ax.xaxis.set_tick_params(labeltop=False, labelbottom=False)
 
                     # Remove spines
                     for sp in self.spine_begone[stackpos]['none']:
@@ -194,6 +171,8 @@ class YGrid(Grid):
 
                 self._replace_data_ax(col, data_ind, data_ax)
 
+            self._hide_idle_axes()
+
         self.grid_isclean = True
 
     def get_axis(self, xpos, ypos=0, is_twin=False, twinstance=0):
@@ -234,15 +213,7 @@ class YGrid(Grid):
         """
 
         if is_twin:
-            # xpos corresponds to twind(s), which are in a particular order
-            # Get indices of where xpos appears in the list of twins
-            twindices = [i for i, tw in enumerate(self.twinds) if tw == xpos]
-
-            # Get position of desired instance of xpos
-            which_twin = twindices[twinstance]
-
-            # New xpos is the original axis count, plus the location of twin
-            xpos = self.stackdim + which_twin
+            return self._lookup(xpos, ypos, twinstance)
 
         # Subgrid (col, x), ax (row, y)
         ax = self.axes[xpos][ypos]
@@ -255,33 +226,31 @@ class YGrid(Grid):
         If there are are multiple twins, finding those in ``self.axes``
         may be difficult, esp. if twins were created haphazardly
 
-        This prints the index required by ``self.axes`` to fetch the
-        twin column.
+        This gives the indices required by ``self.axes`` to fetch the
+        twin column(s).
 
         Parameters
         ----------
         xpos : int
             The column that was twinned
         twinstance : int
-            Default ``None``, print all twin column indices at ``xpos``.
-            Indicates which twin column index to print
+            Default ``None``, all twin column indices at ``xpos``.
+            Indicates which twin column index to get
+
+        Returns
+        -------
+        storage_inds : list of ints
+            Indices in ``self.axes`` of the twin column(s), in order of
+            creation.
 
         """
 
-        twindices = [i for i, tw in enumerate(self.twinds) if tw == xpos]
+        storage = self.twin_storage.get(xpos, [])
 
-        if twinstance is None and len(twindices) > 1:
-            newxpos = [i + self.stackdim for i in twindices]
-        elif twinstance is None:
-            newxpos = [self.stackdim + twindices[0]]
-        else:
-            newxpos = [self.stackdim + twindices[twinstance]]
+        if twinstance is None:
+            return list(storage)
 
-        print('The twin(s) of column ' + str(xpos) + ' are stored in ' +
-              '`self.axes` as column(s):')
-
-        for nx in newxpos:
-            print(nx)
+        return [storage[twinstance]]
 
     def set_all_ticknums(self, xticks, yticks, logxscale='none',
                          logyscale='none'):
@@ -318,6 +287,9 @@ class YGrid(Grid):
             raise ValueError('yticks provided for ' + str(len(yticks)) + '/' +
                              str(self.mainax_dim) + ' y-axes')
 
+        if self._defer('ticknums', (xticks, yticks, logxscale, logyscale)):
+            return
+
         xscale = self._make_lists(self.total_stackdim, logxscale,
                                   'linear', 'log')
         yscale = self._make_lists(self.mainax_dim, logyscale, 'linear', 'log')
@@ -399,12 +371,7 @@ class YGrid(Grid):
         if reverse_y == 'all':
             reverse_y = range(0, self.mainax_dim)
 
-        # Invert y axis of each axis in the first column
-        for r in reverse_y:
-            self.axes[0][r].invert_yaxis()
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._reverse_axes('y', reverse_y, adjust_bar_frame)
 
     def reverse_xaxis(self, reverse_x='all', adjust_bar_frame=True):
         """
@@ -425,12 +392,7 @@ class YGrid(Grid):
         if reverse_x == 'all':
             reverse_x = range(0, self.total_stackdim)
 
-        # Invert x axis of first axis in each column
-        for r in reverse_x:
-            self.axes[r][0].invert_xaxis()
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._reverse_axes('x', reverse_x, adjust_bar_frame)
 
     def set_xlim(self, xlim, adjust_bar_frame=True):
         """
@@ -449,30 +411,7 @@ class YGrid(Grid):
 
         """
 
-        if self.total_stackdim == 1:
-            try:
-                xlim.extend([])
-            except AttributeError:
-                pass
-            else:
-                xlim = xlim[0]
-
-            for col in self.axes:
-                for ax in col:
-                    ax.set_xlim(xlim[-2], xlim[-1])
-
-        else:
-            try:
-                xlim.extend([])
-            except AttributeError:
-                xlim = [xlim]
-
-            for xl in xlim:
-                for ax in self.axes[xl[0]]:
-                    ax.set_xlim(xl[1], xl[2])
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._set_limits('x', xlim, self.total_stackdim, adjust_bar_frame)
 
     def set_ylim(self, ylim, adjust_bar_frame=True):
         """
@@ -489,30 +428,7 @@ class YGrid(Grid):
 
         """
 
-        if self.mainax_dim == 1:
-            try:
-                ylim.extend([])
-            except AttributeError:
-                pass
-            else:
-                ylim = ylim[0]
-
-            for col in self.axes:
-                for ax in col:
-                    ax.set_ylim(ylim[-2], ylim[-1])
-
-        else:
-            try:
-                ylim.extend([])
-            except AttributeError:
-                ylim = [ylim]
-
-            for yl in ylim:
-                for col in self.axes:
-                    col[yl[0]].set_ylim(yl[1], yl[2])
-
-        if adjust_bar_frame:
-            self.adjust_bar_frame()
+        self._set_limits('y', ylim, self.mainax_dim, adjust_bar_frame)
 
     def set_ticks(self, row='all', column='all', xy_axis='both', which='both',
                   major_dim=(6, 2), minor_dim=(4, 1), labelsize=10, pad=10,
@@ -583,6 +499,8 @@ class YGrid(Grid):
 
         """
 
+        self.cutout_specs.append(dict(di=di, lw=lw, **kwargs))
+
         if self.mainax_dim > 1:
 
             # Adjust di so that cutouts will look exactly the same
@@ -610,10 +528,10 @@ class YGrid(Grid):
             # first axes in columns, lower only
             kwargs = dict(transform=l_ax.transAxes, clip_on=False,
                           color='black', lw=lw, **kwargs)
-            l_ax.plot(left_x, lower, **kwargs)
+            self.cutout_lines.extend(l_ax.plot(left_x, lower, **kwargs))
 
             kwargs.update(transform=r_ax.transAxes)
-            r_ax.plot(right_x, lower, **kwargs)
+            self.cutout_lines.extend(r_ax.plot(right_x, lower, **kwargs))
 
             # Middle axes
             for i in range(1, self.mainax_dim - 1):
@@ -623,12 +541,12 @@ class YGrid(Grid):
                 lower = (-y[i], y[i])
 
                 kwargs.update(transform=l_ax.transAxes)
-                l_ax.plot(left_x, upper, **kwargs)
-                l_ax.plot(left_x, lower, **kwargs)
+                self.cutout_lines.extend(l_ax.plot(left_x, upper, **kwargs))
+                self.cutout_lines.extend(l_ax.plot(left_x, lower, **kwargs))
 
                 kwargs.update(transform=r_ax.transAxes)
-                r_ax.plot(right_x, upper, **kwargs)
-                r_ax.plot(right_x, lower, **kwargs)
+                self.cutout_lines.extend(r_ax.plot(right_x, upper, **kwargs))
+                self.cutout_lines.extend(r_ax.plot(right_x, lower, **kwargs))
 
             # Last axes in columns, upper only
             l_ax = self.axes[0][-1]
@@ -636,10 +554,10 @@ class YGrid(Grid):
             upper = (1 - y[-1], 1 + y[-1])
 
             kwargs.update(transform=l_ax.transAxes)
-            l_ax.plot(left_x, upper, **kwargs)
+            self.cutout_lines.extend(l_ax.plot(left_x, upper, **kwargs))
 
             kwargs.update(transform=r_ax.transAxes)
-            r_ax.plot(right_x, upper, **kwargs)
+            self.cutout_lines.extend(r_ax.plot(right_x, upper, **kwargs))
 
     def set_xlabels(self, xlabels, fontsize=None, labelpad=12, **kwargs):
         """
@@ -678,3 +596,4 @@ class YGrid(Grid):
                 col[ind].xaxis.set_label_position(side)
                 col[ind].set_xlabel(xl, fontsize=fontsize,
                                     labelpad=labelpad, **kwargs)
+                col[ind].xaxis.set_visible(True)